@@ -0,0 +1,37 @@
+"""add xtrack indexes
+
+Revision ID: 8f2d4b6a1c3e
+Revises: 5886c70609dc
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d4b6a1c3e'
+down_revision: Union[str, None] = '5886c70609dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+	('ix_objects_location_id_active', 'objects', ['location_id', 'active']),
+	('ix_movements_to_location_id_created_at', 'movements', ['to_location_id', 'created_at']),
+	('ix_movements_from_location_id_created_at', 'movements', ['from_location_id', 'created_at']),
+	('ix_movements_object_idcode_created_at', 'movements', ['object_idcode', 'created_at']),
+]
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# Bancos criados pelo create_tables depois desta versão já têm os índices
+	for name, table, columns in INDEXES:
+		op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	for name, table, _columns in reversed(INDEXES):
+		op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,46 @@
+"""add movement rollups
+
+Revision ID: b7e1c9d3f5a2
+Revises: 8f2d4b6a1c3e
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c9d3f5a2'
+down_revision: Union[str, None] = '8f2d4b6a1c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	op.create_table(
+		'movement_rollups',
+		sa.Column('id', sa.Integer(), nullable=False),
+		sa.Column('period', sa.String(length=8), nullable=False),
+		sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+		sa.Column('location_id', sa.Integer(), nullable=True),
+		sa.Column('entries', sa.Integer(), nullable=False),
+		sa.Column('exits', sa.Integer(), nullable=False),
+		sa.PrimaryKeyConstraint('id'),
+		if_not_exists=True,
+	)
+	op.create_index(
+		'ix_movement_rollups_period_bucket',
+		'movement_rollups',
+		['period', 'bucket_start', 'location_id'],
+		unique=False,
+		if_not_exists=True,
+	)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	op.drop_index('ix_movement_rollups_period_bucket', table_name='movement_rollups')
+	op.drop_table('movement_rollups')
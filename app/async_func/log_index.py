@@ -0,0 +1,18 @@
+import asyncio
+import logging
+
+from app.core import settings
+from app.services.logs import get_log_index
+
+
+async def log_index_refresh():
+	if not settings.LOG_INDEX_ENABLED:
+		return
+	while True:
+		try:
+			# Primeiro uso cria o SQLite do índice, fora do event loop
+			log_index = await asyncio.to_thread(get_log_index)
+			await asyncio.to_thread(log_index.refresh)
+		except Exception as e:
+			logging.error(f'Error refreshing log index: {e}')
+		await asyncio.sleep(settings.LOG_INDEX_INTERVAL)
@@ -0,0 +1,18 @@
+import asyncio
+import logging
+
+from app.core import settings
+from app.services.xtrack import xtrack_manager
+
+
+async def movements_retention():
+	while True:
+		if settings.MOVEMENTS_RETENTION_DAYS > 0:
+			logging.info('Applying movements retention...')
+			success, message = await xtrack_manager.writer.run(
+				xtrack_manager.apply_retention,
+				settings.MOVEMENTS_RETENTION_DAYS,
+				settings.MOVEMENTS_ARCHIVE_PATH,
+			)
+			logging.info(f'Movements retention finished (success={success}): {message}')
+		await asyncio.sleep(settings.MOVEMENTS_ROLLUP_INTERVAL)
@@ -0,0 +1,19 @@
+import asyncio
+import logging
+
+from app.core import settings
+from app.db import optimize_sqlite
+from app.services.xtrack import xtrack_manager
+
+
+async def sqlite_maintenance():
+	if xtrack_manager.dialect != 'sqlite':
+		return
+	while True:
+		await asyncio.sleep(settings.SQLITE_MAINTENANCE_INTERVAL)
+		try:
+			# Na thread de escrita: o checkpoint não compete com o sync
+			result = await xtrack_manager.writer.run(optimize_sqlite, xtrack_manager.db_manager)
+			logging.info(f'SQLite optimize/checkpoint finished: {result}')
+		except Exception as e:
+			logging.error(f'Error running SQLite maintenance: {e}')
@@ -1,10 +1,15 @@
 from .config import Settings
 from smartx_rfid.utils.logger_manager import LoggerManager
+import atexit
 import os
 from .build_templates import TemplateManager
+from .static_assets import StaticAssets
 from .indicator import Indicator
 from smartx_rfid.utils.path import get_frozen_path
-from smartx_rfid.utils import AlertsManager
+from .events import EventBus
+from .log_stream import LogStreamHandler
+from .log_pipeline import LogPipeline
+from .alerts import AlertsManager
 
 # DEFAULT VARS
 FILES_PATH = get_frozen_path('config')
@@ -12,6 +17,7 @@ DOCS_PATH = get_frozen_path('docs')
 SWAGGER_PATH = f'{DOCS_PATH}/SWAGGER.md'
 CONFIG_PATH = f'{FILES_PATH}/config.json'
 TEMPLATES_PATH = get_frozen_path('app/templates')
+STATIC_PATH = get_frozen_path('app/static')
 DEVICES_PATH = f'{FILES_PATH}/devices'
 ICON_PATH = get_frozen_path('app/static/icons/logo.ico')
 EXAMPLE_PATH = get_frozen_path('examples')
@@ -27,8 +33,34 @@ logger = LoggerManager(
 	base_filename=os.path.basename(os.getcwd()),
 )
 
+# live log stream (ring buffer + per-client queues)
+log_stream_handler = LogStreamHandler(settings.LOG_STREAM_BUFFER, settings.LOG_STREAM_QUEUE_SIZE)
+
+# non-blocking pipeline: console, file and log stream run in the listener thread
+# (started in the app lifespan; stop() is a no-op if it never started)
+logging_pipeline = LogPipeline(
+	log_path=logger.log_path,
+	base_filename=logger.base_filename,
+	storage_days=settings.STORAGE_DAYS,
+	handlers=[log_stream_handler],
+	queue_size=settings.LOG_QUEUE_SIZE,
+	batch_size=settings.LOG_BATCH_SIZE,
+	json_lines=settings.LOG_JSON_LINES,
+	sample_limit=settings.LOG_SAMPLE_LIMIT,
+	sample_window=settings.LOG_SAMPLE_WINDOW,
+)
+atexit.register(logging_pipeline.stop)
+
+# static assets (hashed + precompressed, built on startup)
+static_manifest = StaticAssets(STATIC_PATH)
+
 # templates
-templates = TemplateManager(TEMPLATES_PATH).templates
+template_manager = TemplateManager(TEMPLATES_PATH)
+template_manager.add_global('static_url', static_manifest.url)
+templates = template_manager.templates
+
+# events (server push)
+event_bus = EventBus()
 
 # alerts
-alerts_manager = AlertsManager()
+alerts_manager = AlertsManager(event_bus)
@@ -0,0 +1,18 @@
+from smartx_rfid.utils import AlertsManager as BaseAlertsManager
+
+from .events import EventBus
+
+
+class AlertsManager(BaseAlertsManager):
+	"""AlertsManager que também publica cada alerta no canal de eventos."""
+
+	def __init__(self, event_bus: EventBus, max_alerts: int = 100):
+		super().__init__()
+		self.event_bus = event_bus
+		self.max_alerts = max_alerts
+
+	def add_alert(self, message: str, level: str = 'info'):
+		super().add_alert(message, level)
+		# Sem polling os alertas não são mais consumidos; mantém só os mais recentes
+		del self.alerts[: -self.max_alerts]
+		self.event_bus.publish('alert', {'message': message, 'level': level})
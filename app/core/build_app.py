@@ -1,7 +1,6 @@
 from contextlib import asynccontextmanager
 from typing import List
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 import asyncio
 import logging
 import os
@@ -10,6 +9,8 @@ from smartx_rfid.utils.path import get_frozen_path, load_file, include_all_route
 from app.async_func import create_async_tasks
 from .exeption_handlers import setup_exeptions
 from .middleware import setup_middlewares
+from .static_assets import PrecompressedStaticFiles
+from app.core import settings, static_manifest, logging_pipeline
 
 
 # Lifecicle
@@ -19,7 +20,7 @@ async def lifespan(app: FastAPI):
 	Manage the asynchronous lifecycle of the application.
 
 	This context manager handles startup and shutdown processes:
-	- On startup: Creates and starts background tasks
+	- On startup: Moves logging to the queue pipeline, creates and starts background tasks
 	- On shutdown: Cancels all running background tasks
 
 	Args:
@@ -28,6 +29,9 @@ async def lifespan(app: FastAPI):
 	tasks: List[asyncio.Task] = []
 
 	try:
+		# Console, arquivo e log stream passam para a thread do listener
+		logging_pipeline.start()
+
 		# Initialize background tasks
 		tasks = await create_async_tasks(get_frozen_path('app/async_func'))
 		logging.info(f'Started {len(tasks)} background tasks')
@@ -68,9 +72,17 @@ def create_application(title: str, swagger_path: str) -> FastAPI:
 	setup_middlewares(app)
 
 	# Mount static files directory
-	static_dir = get_frozen_path('app/static')
+	static_dir = static_manifest.static_dir
 	if os.path.exists(static_dir):
-		app.mount('/static', StaticFiles(directory=static_dir), name='static')
+		# Cópias com hash e pré-comprimidas em app/static/dist (só o que mudou é refeito)
+		try:
+			if settings.STATIC_PRECOMPRESS:
+				static_manifest.build()
+			else:
+				static_manifest.load()
+		except OSError as e:
+			logging.warning(f'Static assets build failed, serving plain files: {e}')
+		app.mount('/static', PrecompressedStaticFiles(static_manifest), name='static')
 	else:
 		logging.warning(f'Static files directory not found: {static_dir}')
 
@@ -38,10 +38,58 @@ class Settings:
 		self.TITLE: str = data.get('TITLE', 'SMARTX')
 		self.LOG_PATH: str = data.get('LOG_PATH', 'Logs')
 		self.STORAGE_DAYS: int = data.get('STORAGE_DAYS', 7)
+		self.LOG_INDEX_ENABLED: bool = data.get('LOG_INDEX_ENABLED', True)
+		self.LOG_INDEX_INTERVAL: int = data.get('LOG_INDEX_INTERVAL', 60)
+		self.LOG_STREAM_BUFFER: int = data.get('LOG_STREAM_BUFFER', 1000)
+		self.LOG_STREAM_QUEUE_SIZE: int = data.get('LOG_STREAM_QUEUE_SIZE', 500)
+		self.LOG_QUEUE_SIZE: int = data.get('LOG_QUEUE_SIZE', 10000)
+		self.LOG_BATCH_SIZE: int = data.get('LOG_BATCH_SIZE', 500)
+		self.LOG_JSON_LINES: bool = data.get('LOG_JSON_LINES', False)
+		self.LOG_SAMPLE_LIMIT: int = data.get('LOG_SAMPLE_LIMIT', 20)
+		self.LOG_SAMPLE_WINDOW: int = data.get('LOG_SAMPLE_WINDOW', 60)
 		self.OPEN_BROWSER: bool = data.get('OPEN_BROWSER', True)
+		self.STATIC_PRECOMPRESS: bool = data.get('STATIC_PRECOMPRESS', True)
 		self.DATABASE_URL: str | None = data.get('DATABASE_URL', None)
+		self.DATABASE_ECHO: bool = data.get('DATABASE_ECHO', False)
+		self.SLOW_QUERY_THRESHOLD_MS: int | None = data.get('SLOW_QUERY_THRESHOLD_MS', None)
+		self.SLOW_QUERY_TOP_N: int = data.get('SLOW_QUERY_TOP_N', 20)
 		self.XTRACK_URL: str | None = data.get('XTRACK_URL', None)
 		self.PORT: int = data.get('PORT', 5000)
+		self.XTRACK_INFO_CACHE_TTL: int = data.get('XTRACK_INFO_CACHE_TTL', 30)
+		self.XTRACK_DELTA_SYNC: bool = data.get('XTRACK_DELTA_SYNC', True)
+		self.XTRACK_FULL_SYNC_INTERVAL: int = data.get('XTRACK_FULL_SYNC_INTERVAL', 3600)
+		self.XTRACK_STREAMING: bool = data.get('XTRACK_STREAMING', False)
+		self.XTRACK_BATCH_SIZE: int = data.get('XTRACK_BATCH_SIZE', 5000)
+		# GetObject por fatias (uma por local). Objetos sem local conhecido só entram
+		# no GetObject sem filtro, feito a cada XTRACK_FULL_SYNC_INTERVAL
+		self.XTRACK_OBJECT_FILTER_TAG: str | None = data.get('XTRACK_OBJECT_FILTER_TAG', None)
+		self.XTRACK_FETCH_CONCURRENCY: int = data.get('XTRACK_FETCH_CONCURRENCY', 4)
+		self.XTRACK_FETCH_RETRIES: int = data.get('XTRACK_FETCH_RETRIES', 3)
+		self.XTRACK_SYNC_INTERVAL: int = data.get('XTRACK_SYNC_INTERVAL', 300)
+		self.XTRACK_SYNC_MIN_INTERVAL: int = data.get('XTRACK_SYNC_MIN_INTERVAL', 60)
+		self.XTRACK_SYNC_MAX_INTERVAL: int = data.get('XTRACK_SYNC_MAX_INTERVAL', 900)
+		self.XTRACK_SYNC_JITTER: float = data.get('XTRACK_SYNC_JITTER', 0.1)
+		self.XTRACK_SYNC_BUSY_CHANGES: int = data.get('XTRACK_SYNC_BUSY_CHANGES', 100)
+		self.XTRACK_STAGE_TIMEOUT: int = data.get('XTRACK_STAGE_TIMEOUT', 600)
+		self.DB_CHUNK_SIZE: int = data.get('DB_CHUNK_SIZE', 500)
+		self.DB_WRITE_QUEUE_SIZE: int = data.get('DB_WRITE_QUEUE_SIZE', 8)
+		self.DATABASE_POOL_SIZE: int = data.get('DATABASE_POOL_SIZE', 5)
+		self.DATABASE_POOL_TIMEOUT: int = data.get('DATABASE_POOL_TIMEOUT', 30)
+		self.DATABASE_READ_POOL_SIZE: int = data.get('DATABASE_READ_POOL_SIZE', 5)
+		self.DATABASE_ASYNC_READS: bool = data.get('DATABASE_ASYNC_READS', True)
+		self.SQLITE_JOURNAL_MODE: str | None = data.get('SQLITE_JOURNAL_MODE', 'WAL')
+		self.SQLITE_SYNCHRONOUS: str | None = data.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+		self.SQLITE_BUSY_TIMEOUT: int | None = data.get('SQLITE_BUSY_TIMEOUT', 5000)
+		self.SQLITE_CACHE_SIZE: int | None = data.get('SQLITE_CACHE_SIZE', -65536)
+		self.SQLITE_MMAP_SIZE: int | None = data.get('SQLITE_MMAP_SIZE', 268_435_456)
+		self.SQLITE_TEMP_STORE: str | None = data.get('SQLITE_TEMP_STORE', 'MEMORY')
+		self.SQLITE_MAINTENANCE_INTERVAL: int = data.get('SQLITE_MAINTENANCE_INTERVAL', 3600)
+		self.XTRACK_UPSERT: bool = data.get('XTRACK_UPSERT', False)
+		self.XTRACK_HASH_INDEX_SIZE: int = data.get('XTRACK_HASH_INDEX_SIZE', 500_000)
+		self.XTRACK_DIFF_ENGINE: str = data.get('XTRACK_DIFF_ENGINE', 'python')
+		self.MOVEMENTS_RETENTION_DAYS: int = data.get('MOVEMENTS_RETENTION_DAYS', 0)
+		self.MOVEMENTS_ROLLUP_INTERVAL: int = data.get('MOVEMENTS_ROLLUP_INTERVAL', 3600)
+		self.MOVEMENTS_ARCHIVE_PATH: str | None = data.get('MOVEMENTS_ARCHIVE_PATH', None)
 
 	def get_current_settings(self):
 		return {
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+
+def format_event(event: str, data: Any) -> str:
+	"""Mensagem Server-Sent Events. `bytes` já são JSON serializado."""
+	if isinstance(data, bytes):
+		payload = data.decode('utf-8')
+	else:
+		payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+	return f'event: {event}\ndata: {payload}\n\n'
+
+
+class Subscriber:
+	"""Fila limitada de um cliente conectado. Quando cheia, descarta o evento mais antigo."""
+
+	def __init__(self, maxsize: int = 100):
+		self.queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize=maxsize)
+		self.dropped: int = 0
+
+	def put(self, event: str, data: Any) -> None:
+		if self.queue.full():
+			try:
+				self.queue.get_nowait()
+			except asyncio.QueueEmpty:
+				pass
+			self.dropped += 1
+		self.queue.put_nowait((event, data))
+
+
+class EventBus:
+	"""
+	Canal de eventos compartilhado por todos os clientes conectados.
+
+	Eventos são publicados uma vez e distribuídos para a fila de cada
+	assinante. Tópicos com produtor registrado (ex.: `xtrack_info`) são
+	calculados uma única vez por notificação, independente do número de telas.
+	"""
+
+	def __init__(self, queue_size: int = 100):
+		self.queue_size = queue_size
+		self._subscribers: set[Subscriber] = set()
+		self._producers: dict[str, Callable[[], Awaitable[Any]]] = {}
+		self._pending: set[str] = set()
+		self._loop: asyncio.AbstractEventLoop | None = None
+
+	@property
+	def subscribers_count(self) -> int:
+		return len(self._subscribers)
+
+	def subscribe(self) -> Subscriber:
+		self._loop = asyncio.get_running_loop()
+		subscriber = Subscriber(self.queue_size)
+		self._subscribers.add(subscriber)
+		return subscriber
+
+	def unsubscribe(self, subscriber: Subscriber) -> None:
+		self._subscribers.discard(subscriber)
+
+	def register_producer(self, event: str, producer: Callable[[], Awaitable[Any]]) -> None:
+		"""Registra a coroutine que gera o payload atual de `event`."""
+		self._producers[event] = producer
+
+	async def produce(self, event: str) -> Any:
+		return await self._producers[event]()
+
+	def _call_in_loop(self, callback: Callable, *args) -> None:
+		"""Executa `callback` no event loop, mesmo quando chamado de outra thread."""
+		if self._loop is None or self._loop.is_closed():
+			return
+		try:
+			running = asyncio.get_running_loop()
+		except RuntimeError:
+			running = None
+		if running is self._loop:
+			callback(*args)
+		else:
+			self._loop.call_soon_threadsafe(callback, *args)
+
+	def publish(self, event: str, data: Any) -> None:
+		"""Envia `data` para todos os assinantes. Seguro para chamar de qualquer thread."""
+		if self._subscribers:
+			self._call_in_loop(self._dispatch, event, data)
+
+	def notify(self, event: str) -> None:
+		"""Recalcula o payload de um tópico com produtor e o distribui. Thread-safe."""
+		if self._subscribers:
+			self._call_in_loop(self._schedule, event)
+
+	def _dispatch(self, event: str, data: Any) -> None:
+		for subscriber in list(self._subscribers):
+			subscriber.put(event, data)
+
+	def _schedule(self, event: str) -> None:
+		# Notificações repetidas enquanto há uma pendente são agrupadas
+		if event in self._pending:
+			return
+		self._pending.add(event)
+		asyncio.create_task(self._run_producer(event))
+
+	async def _run_producer(self, event: str) -> None:
+		try:
+			await asyncio.sleep(0)
+			self._pending.discard(event)
+			data = await self.produce(event)
+			self._dispatch(event, data)
+		except Exception as e:
+			self._pending.discard(event)
+			logging.error(f'Error producing event {event}: {e}')
@@ -0,0 +1,268 @@
+"""
+Pipeline de logging sem bloqueio.
+
+Quem loga (event loop, threads do asyncio.to_thread, DbWriter) só passa pelo
+filtro de amostragem e coloca o registro numa fila limitada: formatação,
+console, arquivo e stream de logs rodam na thread do QueueListener. Com a
+fila cheia o registro é descartado e contado, nunca espera o disco.
+
+O arquivo diário mantém o nome e o formato do LoggerManager
+(`YYYY-MM-DD_<base>.log`), lido pela tela de logs e pelo índice de busca.
+As gravações são agrupadas: um write por rajada de registros. Opcionalmente
+grava também `YYYY-MM-DD_<base>.jsonl` com um JSON compacto por registro.
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+LINE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+	"""Uma linha JSON compacta por registro."""
+
+	def format(self, record: logging.LogRecord) -> str:
+		entry = {
+			'ts': self.formatTime(record),
+			'level': record.levelname,
+			'logger': record.name,
+			'message': record.getMessage(),
+		}
+		if record.exc_text:
+			entry['exc'] = record.exc_text
+		return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+class SampleFilter(logging.Filter):
+	"""
+	Limita mensagens repetitivas (uma por linha/objeto) a `limit` por janela
+	de `window` segundos, por chave. Só age em registros marcados com
+	`extra={'sample': '<chave>'}`; ao reabrir a janela, o primeiro registro
+	informa quantos foram suprimidos.
+	"""
+
+	def __init__(self, limit: int = 20, window: float = 60.0):
+		super().__init__()
+		self.limit = limit
+		self.window = window
+		self.suppressed = 0
+		self._lock = threading.Lock()
+		self._windows: dict[str, list] = {}  # chave -> [início, emitidos, suprimidos]
+
+	def filter(self, record: logging.LogRecord) -> bool:
+		key = getattr(record, 'sample', None)
+		if key is None or self.limit <= 0:
+			return True
+		now = time.monotonic()
+		with self._lock:
+			state = self._windows.get(key)
+			if state is None or now - state[0] >= self.window:
+				skipped = state[2] if state else 0
+				state = self._windows[key] = [now, 0, 0]
+				if skipped:
+					record.msg = f'{record.msg} ({skipped} similar messages suppressed)'
+			if state[1] >= self.limit:
+				state[2] += 1
+				self.suppressed += 1
+				return False
+			state[1] += 1
+			return True
+
+
+class DropCountingQueueHandler(logging.handlers.QueueHandler):
+	"""QueueHandler que descarta (e conta) quando a fila está cheia, em vez de falhar."""
+
+	def __init__(self, log_queue: queue.Queue):
+		super().__init__(log_queue)
+		self.dropped = 0
+
+	def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+		# Resolve a mensagem e o traceback aqui, mas a linha final é montada no listener
+		record = copy.copy(record)
+		record.msg = record.message = record.getMessage()
+		record.args = None
+		if record.exc_info and not record.exc_text:
+			record.exc_text = logging.Formatter().formatException(record.exc_info)
+		record.exc_info = None
+		return record
+
+	def enqueue(self, record: logging.LogRecord) -> None:
+		try:
+			self.queue.put_nowait(record)
+		except queue.Full:
+			self.dropped += 1
+
+
+class DailyFileHandler(logging.Handler):
+	"""
+	Arquivo diário `YYYY-MM-DD_<base><suffix>` com escrita agrupada: `emit`
+	só acumula, `flush` grava tudo de uma vez. Troca de arquivo na virada do
+	dia e mantém os `storage_days` mais recentes.
+	"""
+
+	def __init__(self, log_path: str, base_filename: str, suffix: str, storage_days: int = 7):
+		super().__init__()
+		self.log_path = log_path
+		self.base_filename = base_filename
+		self.suffix = suffix
+		self.storage_days = storage_days
+		self.current_date = None
+		self._pending: list[str] = []
+
+	def filename_for(self, date) -> str:
+		return os.path.join(self.log_path, f'{date:%Y-%m-%d}_{self.base_filename}{self.suffix}')
+
+	def emit(self, record: logging.LogRecord) -> None:
+		try:
+			self._pending.append(self.format(record) + '\n')
+		except Exception:
+			self.handleError(record)
+
+	def flush(self) -> None:
+		# Troca e escrita sob o mesmo lock: flush de outra thread não grava
+		# lotes fora de ordem nem lê o arquivo com um lote ainda em memória
+		with self.lock:
+			if not self._pending:
+				return
+			data, self._pending = ''.join(self._pending), []
+			today = datetime.now().date()
+			if today != self.current_date:
+				self.current_date = today
+				self._cleanup()
+			try:
+				with open(self.filename_for(today), 'a', encoding='utf-8', errors='replace') as f:
+					f.write(data)
+			except OSError:
+				pass
+
+	def _cleanup(self) -> None:
+		files = []
+		for name in os.listdir(self.log_path):
+			if not name.endswith(self.suffix) or name.startswith(f'{self.current_date:%Y-%m-%d}'):
+				continue
+			try:
+				files.append((datetime.strptime(name.split('_')[0], '%Y-%m-%d').date(), name))
+			except ValueError:
+				continue
+		files.sort()
+		for _, name in files[: -self.storage_days]:
+			try:
+				os.remove(os.path.join(self.log_path, name))
+			except OSError:
+				pass
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+	"""QueueListener que chama `flush` dos handlers quando a fila esvazia ou a cada lote."""
+
+	def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 500):
+		super().__init__(log_queue, *handlers, respect_handler_level=True)
+		self.batch_size = batch_size
+		self.batches = 0
+		self._count = 0
+		# Um registro passa por todos os handlers sob este lock (ver LogPipeline.paused)
+		self.lock = threading.RLock()
+
+	def handle(self, record: logging.LogRecord) -> None:
+		with self.lock:
+			super().handle(record)
+			self._count += 1
+			if self._count >= self.batch_size or self.queue.empty():
+				self.flush()
+
+	def flush(self) -> None:
+		self._count = 0
+		self.batches += 1
+		for handler in self.handlers:
+			try:
+				handler.flush()
+			except Exception:
+				pass
+
+	def stop(self) -> None:
+		super().stop()
+		self.flush()
+
+
+class LogPipeline:
+	"""
+	Substitui os handlers do logger raiz (LoggerManager) por um QueueHandler
+	e move console, arquivo e demais handlers para a thread do listener.
+	"""
+
+	def __init__(
+		self,
+		log_path: str,
+		base_filename: str,
+		storage_days: int = 7,
+		handlers: list[logging.Handler] | None = None,
+		queue_size: int = 10000,
+		batch_size: int = 500,
+		json_lines: bool = False,
+		sample_limit: int = 20,
+		sample_window: float = 60.0,
+	):
+		formatter = logging.Formatter(LINE_FORMAT)
+		console = logging.StreamHandler()
+		console.setFormatter(formatter)
+		self.file_handler = DailyFileHandler(log_path, base_filename, '.log', storage_days)
+		self.file_handler.setFormatter(formatter)
+		outputs = [console, self.file_handler]
+		if json_lines:
+			json_handler = DailyFileHandler(log_path, base_filename, '.jsonl', storage_days)
+			json_handler.setFormatter(JsonFormatter())
+			outputs.append(json_handler)
+
+		self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+		self.queue_handler = DropCountingQueueHandler(self.queue)
+		self.sampler = SampleFilter(sample_limit, sample_window)
+		self.queue_handler.addFilter(self.sampler)
+		self.listener = BatchingQueueListener(
+			self.queue, *outputs, *(handlers or []), batch_size=batch_size
+		)
+		self._started = False
+
+	def start(self, root: logging.Logger | None = None) -> None:
+		"""Move os handlers de `root` (padrão: logger raiz) para o listener. Idempotente."""
+		if self._started:
+			return
+		root = root or logging.getLogger()
+		for handler in root.handlers[:]:
+			root.removeHandler(handler)
+		root.addHandler(self.queue_handler)
+		self.listener.start()
+		self._started = True
+
+	def stop(self) -> None:
+		"""Grava o que está na fila. Chamar antes de encerrar o processo."""
+		if self._started:
+			self._started = False
+			self.listener.stop()
+
+	@contextmanager
+	def paused(self):
+		"""
+		Segura o listener entre dois registros, com o arquivo já gravado: dentro
+		do bloco, arquivo e demais handlers (ex.: log stream) viram o mesmo
+		conjunto de registros. Registros novos esperam na fila.
+		"""
+		with self.listener.lock:
+			self.file_handler.flush()
+			yield
+
+	def metrics(self) -> dict:
+		return {
+			'queued': self.queue.qsize(),
+			'queue_size': self.queue.maxsize,
+			'dropped': self.queue_handler.dropped,
+			'sampled_out': self.sampler.suppressed,
+			'batches': self.listener.batches,
+		}
@@ -0,0 +1,153 @@
+import asyncio
+import html
+import logging
+import re
+from collections import deque
+from typing import Any
+
+from .events import Subscriber
+
+LINE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class LogSubscriber(Subscriber):
+	"""Cliente do stream de logs com filtro por nível, logger e regex aplicado no servidor."""
+
+	def __init__(
+		self,
+		maxsize: int = 500,
+		level: int = logging.NOTSET,
+		logger: str | None = None,
+		pattern: re.Pattern | None = None,
+	):
+		super().__init__(maxsize)
+		self.level = level
+		self.logger = logger
+		self.pattern = pattern
+
+	def matches(self, entry: dict[str, Any]) -> bool:
+		if entry['levelno'] < self.level:
+			return False
+		if self.logger and not (
+			entry['logger'] == self.logger or entry['logger'].startswith(f'{self.logger}.')
+		):
+			return False
+		return self.pattern is None or self.pattern.search(entry['message']) is not None
+
+
+class LogStreamHandler(logging.Handler):
+	"""
+	Handler que guarda os últimos registros em memória e os repassa aos
+	clientes conectados ao stream de logs.
+
+	O `emit` só formata e adiciona ao ring buffer: a entrega roda no event
+	loop, agrupada (uma chamada por rajada de registros), e cada cliente tem
+	fila limitada que descarta o mais antigo. Navegador lento nunca segura
+	quem está logando.
+	"""
+
+	def __init__(self, capacity: int = 1000, queue_size: int = 500):
+		super().__init__()
+		self.setFormatter(logging.Formatter(LINE_FORMAT))
+		self.queue_size = queue_size
+		self.buffer: deque[dict[str, Any]] = deque(maxlen=capacity)
+		self._seq = 0
+		self._dispatched = 0
+		self._scheduled = False
+		self._subscribers: set[LogSubscriber] = set()
+		self._loop: asyncio.AbstractEventLoop | None = None
+
+	@property
+	def subscribers_count(self) -> int:
+		return len(self._subscribers)
+
+	@property
+	def seq(self) -> int:
+		"""Sequência do último registro recebido."""
+		return self._seq
+
+	def emit(self, record: logging.LogRecord) -> None:
+		try:
+			line = self.format(record)
+			self._seq += 1
+			self.buffer.append(
+				{
+					'seq': self._seq,
+					'levelno': record.levelno,
+					'level': record.levelname,
+					'logger': record.name,
+					'message': record.getMessage(),
+					'line': html.escape(line),
+				}
+			)
+			if self._subscribers and not self._scheduled:
+				self._scheduled = True
+				self._loop.call_soon_threadsafe(self._flush)
+		except RuntimeError:
+			# Loop encerrado: o registro fica só no buffer
+			self._scheduled = False
+		except Exception:
+			self.handleError(record)
+
+	def _since(self, seq: int) -> list[dict[str, Any]]:
+		"""Registros com `seq` maior que o informado, em ordem."""
+		with self.lock:
+			entries = []
+			for entry in reversed(self.buffer):
+				if entry['seq'] <= seq:
+					break
+				entries.append(entry)
+		entries.reverse()
+		return entries
+
+	def _flush(self) -> None:
+		# Roda no event loop
+		self._scheduled = False
+		entries = self._since(self._dispatched)
+		if not entries:
+			return
+		self._dispatched = entries[-1]['seq']
+		for subscriber in list(self._subscribers):
+			for entry in entries:
+				if subscriber.matches(entry):
+					subscriber.put('log', entry)
+
+	def subscribe(
+		self,
+		level: int = logging.NOTSET,
+		logger: str | None = None,
+		pattern: re.Pattern | None = None,
+		backlog: int = 0,
+		since: int | None = None,
+	) -> LogSubscriber:
+		"""
+		Registra um cliente. As últimas `backlog` entradas do buffer que
+		passam no filtro já entram na fila; com `since`, todas as entradas
+		ainda no buffer com `seq` maior (retomada sem perder registros).
+		"""
+		self._loop = asyncio.get_running_loop()
+		# Entrega o pendente aos clientes já conectados; o novo começa daqui
+		self._flush()
+		subscriber = LogSubscriber(self.queue_size, level, logger, pattern)
+		if since is not None:
+			recent = [entry for entry in self._since(since) if entry['seq'] <= self._dispatched]
+			for entry in recent:
+				if subscriber.matches(entry):
+					subscriber.put('log', entry)
+		elif backlog > 0:
+			with self.lock:
+				recent = [entry for entry in self.buffer if entry['seq'] <= self._dispatched]
+			for entry in [entry for entry in recent if subscriber.matches(entry)][-backlog:]:
+				subscriber.put('log', entry)
+		self._subscribers.add(subscriber)
+		return subscriber
+
+	def unsubscribe(self, subscriber: LogSubscriber) -> None:
+		self._subscribers.discard(subscriber)
+
+	def metrics(self) -> dict[str, Any]:
+		return {
+			'buffered': len(self.buffer),
+			'subscribers': len(self._subscribers),
+			'dropped': sum(subscriber.dropped for subscriber in self._subscribers),
+		}
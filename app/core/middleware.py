@@ -5,7 +5,7 @@ import sys
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.middleware.gzip import GZipMiddleware
 
 # =====================
@@ -14,7 +14,7 @@ from starlette.middleware.gzip import GZipMiddleware
 
 
 def setup_middlewares(app):
-	"""Automatically register all BaseHTTPMiddleware subclasses defined in this module"""
+	"""Automatically register all RequestMiddleware subclasses defined in this module"""
 
 	# CORS middleware
 	app.add_middleware(
@@ -28,34 +28,80 @@ def setup_middlewares(app):
 	# Auto-register custom middlewares
 	current_module = sys.modules[__name__]
 	for name, obj in inspect.getmembers(current_module, inspect.isclass):
-		if issubclass(obj, BaseHTTPMiddleware) and obj is not BaseHTTPMiddleware:
+		if issubclass(obj, RequestMiddleware) and obj is not RequestMiddleware:
 			app.add_middleware(obj)
 			print(f'[Middleware] Registered: {name}')
 
-	app.add_middleware(GZipMiddleware, minimum_size=1000)
+	app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1000)
 	Instrumentator().instrument(app).expose(app, include_in_schema=False)
 
 
-class SafeRequestMiddleware(BaseHTTPMiddleware):
+class RequestMiddleware:
+	"""
+	Base for the pure ASGI middlewares of this module.
+	Unlike BaseHTTPMiddleware, the response is passed through as it is sent:
+	no extra task or memory stream per request, and streaming responses are
+	not buffered.
+	"""
+
+	def __init__(self, app):
+		self.app = app
+
+	async def __call__(self, scope, receive, send):
+		await self.app(scope, receive, send)
+
+
+class SafeRequestMiddleware(RequestMiddleware):
 	"""
 	Middleware that wraps every request in a try/except block.
 	Returns a JSON error response if any unhandled exception occurs.
 	"""
 
-	async def dispatch(self, request, call_next):
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+
+		response_started = False
+
+		async def send_wrapper(message):
+			nonlocal response_started
+			if message['type'] == 'http.response.start':
+				response_started = True
+			await send(message)
+
 		try:
-			response = await call_next(request)
-			return response
+			await self.app(scope, receive, send_wrapper)
 		except Exception as e:
 			# Log the error with traceback
 			logging.error(f'[Middleware Error] {type(e).__name__}: {e}', exc_info=True)
 
+			# Headers already sent (e.g. streaming): the server closes the connection
+			if response_started:
+				raise
+
 			# Return JSON error response with safe serialization
-			return JSONResponse(
+			response = JSONResponse(
 				status_code=500,
 				content={
 					'message': str(e),
 					'error_type': type(e).__name__,
-					'path': request.url.path,
+					'path': scope.get('path', ''),
 				},
 			)
+			await response(scope, receive, send)
+
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+	"""
+	GZipMiddleware that leaves Server-Sent Events untouched.
+	Compressing an event stream buffers the events inside the gzip writer.
+	"""
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] == 'http' and 'text/event-stream' in Headers(scope=scope).get(
+			'accept', ''
+		):
+			await self.app(scope, receive, send)
+			return
+		await super().__call__(scope, receive, send)
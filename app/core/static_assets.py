@@ -0,0 +1,184 @@
+"""
+Arquivos estáticos pré-comprimidos e com hash no nome.
+
+`StaticAssets.build()` copia cada arquivo de `app/static` para `dist/` com o
+hash do conteúdo no nome (`js/alpine.js` -> `js/alpine.3f2a9c1b0d4e.js`) e
+grava `.gz` (e `.br`, se o pacote brotli estiver instalado) ao lado dos
+textos. Só arquivos novos são comprimidos: o nome muda junto com o conteúdo.
+
+`PrecompressedStaticFiles` serve os nomes com hash escolhendo a versão pelo
+Accept-Encoding, com `Cache-Control: immutable`. Caminhos sem hash continuam
+servidos do diretório original, com revalidação.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+BUILD_DIRNAME = 'dist'
+MANIFEST_FILENAME = 'manifest.json'
+COMPRESSIBLE = {'.js', '.css', '.html', '.svg', '.json', '.map', '.txt', '.xml', '.ico'}
+MIN_COMPRESS_SIZE = 1024
+HASH_LENGTH = 12
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def hashed_name(path: str, digest: str) -> str:
+	root, ext = os.path.splitext(path)
+	return f'{root}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+	"""Codificações aceitas pelo cliente (ignora as com q=0)."""
+	accepted = set()
+	for part in accept_encoding.lower().split(','):
+		name, _, params = part.strip().partition(';')
+		if name and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+			accepted.add(name)
+	return accepted
+
+
+class StaticAssets:
+	"""Manifesto `caminho original -> caminho com hash` e o build de `dist/`."""
+
+	def __init__(self, static_dir: str, build_dir: str | None = None):
+		self.static_dir = static_dir
+		self.build_dir = build_dir or os.path.join(static_dir, BUILD_DIRNAME)
+		self.manifest: dict[str, str] = {}
+		# Caminho com hash -> sufixos pré-comprimidos disponíveis ('.br', '.gz')
+		self.encodings: dict[str, list[str]] = {}
+		self._lock = threading.Lock()
+
+	def build(self) -> dict[str, str]:
+		"""Gera `dist/` e o manifesto. Retorna o manifesto."""
+		with self._lock:
+			manifest, encodings, created = {}, {}, 0
+			for relative in self._sources():
+				source = os.path.join(self.static_dir, relative)
+				with open(source, 'rb') as f:
+					data = f.read()
+				target = hashed_name(relative, hashlib.sha256(data).hexdigest())
+				created += self._write(target, data)
+				manifest[relative] = target
+				encodings[target] = self._suffixes(target)
+
+			self._remove_stale(encodings)
+			with open(os.path.join(self.build_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+				json.dump(manifest, f, indent=2, sort_keys=True)
+			self.manifest, self.encodings = manifest, encodings
+			logging.info(f'Static assets: {len(manifest)} files, {created} rebuilt')
+			return manifest
+
+	def load(self) -> dict[str, str]:
+		"""Usa um `dist/` já gerado (ex.: por scripts/build_static.py), sem reescrever."""
+		try:
+			with open(os.path.join(self.build_dir, MANIFEST_FILENAME), encoding='utf-8') as f:
+				manifest = json.load(f)
+		except FileNotFoundError:
+			return {}
+		manifest = {
+			relative: target
+			for relative, target in manifest.items()
+			if os.path.exists(os.path.join(self.build_dir, target))
+		}
+		self.encodings = {target: self._suffixes(target) for target in manifest.values()}
+		self.manifest = manifest
+		return manifest
+
+	def _suffixes(self, target: str) -> list[str]:
+		return [
+			suffix
+			for suffix in ('.br', '.gz')
+			if os.path.exists(os.path.join(self.build_dir, target + suffix))
+		]
+
+	def _sources(self) -> list[str]:
+		sources = []
+		for root, dirs, files in os.walk(self.static_dir):
+			dirs[:] = [
+				d
+				for d in dirs
+				if os.path.abspath(os.path.join(root, d)) != os.path.abspath(self.build_dir)
+			]
+			for name in files:
+				path = os.path.join(root, name)
+				sources.append(os.path.relpath(path, self.static_dir).replace(os.sep, '/'))
+		return sorted(sources)
+
+	def _write(self, target: str, data: bytes) -> int:
+		path = os.path.join(self.build_dir, target)
+		if os.path.exists(path):
+			return 0
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		# Comprimidos antes do arquivo principal: ele marca o build como completo
+		if os.path.splitext(target)[1] in COMPRESSIBLE and len(data) >= MIN_COMPRESS_SIZE:
+			self._write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+			if brotli is not None:
+				self._write_atomic(path + '.br', brotli.compress(data, quality=11))
+		self._write_atomic(path, data)
+		return 1
+
+	@staticmethod
+	def _write_atomic(path: str, data: bytes) -> None:
+		tmp = f'{path}.tmp'
+		with open(tmp, 'wb') as f:
+			f.write(data)
+		os.replace(tmp, path)
+
+	def _remove_stale(self, encodings: dict[str, list[str]]) -> None:
+		keep = {MANIFEST_FILENAME}
+		for target, suffixes in encodings.items():
+			keep.add(target)
+			keep.update(target + suffix for suffix in suffixes)
+		for root, _, files in os.walk(self.build_dir):
+			for name in files:
+				path = os.path.join(root, name)
+				if os.path.relpath(path, self.build_dir).replace(os.sep, '/') not in keep:
+					os.remove(path)
+
+	def url(self, path: str) -> str:
+		"""URL do arquivo em `/static`: com hash se estiver no manifesto."""
+		path = path.lstrip('/')
+		return f'/static/{self.manifest.get(path, path)}'
+
+
+class PrecompressedStaticFiles(StaticFiles):
+	"""StaticFiles que serve `dist/` pré-comprimido e imutável."""
+
+	def __init__(self, assets: StaticAssets, **kwargs):
+		super().__init__(directory=assets.static_dir, **kwargs)
+		self.assets = assets
+
+	async def get_response(self, path: str, scope) -> Response:
+		target = path.replace(os.sep, '/')
+		suffixes = self.assets.encodings.get(target)
+		if suffixes is None or scope['method'] not in ('GET', 'HEAD'):
+			response = await super().get_response(path, scope)
+			if response.status_code == 200 and self.assets.manifest:
+				response.headers['Cache-Control'] = 'no-cache'
+			return response
+
+		file_path = os.path.join(self.assets.build_dir, target)
+		headers = {'Cache-Control': IMMUTABLE}
+		if suffixes:
+			headers['Vary'] = 'Accept-Encoding'
+		accepted = accepted_encodings(Headers(scope=scope).get('accept-encoding', ''))
+		media_type = mimetypes.guess_type(target)[0] or 'application/octet-stream'
+		for suffix, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+			if suffix in suffixes and encoding in accepted:
+				headers['Content-Encoding'] = encoding
+				return FileResponse(file_path + suffix, headers=headers, media_type=media_type)
+		return FileResponse(file_path, headers=headers, media_type=media_type)
@@ -1,15 +1,81 @@
 from smartx_rfid.db import DatabaseManager
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
 import logging
+import os
+from pathlib import Path
+from app.core import settings
 from app.models import get_all_models
+from ._async import AsyncDatabase, async_driver
+from ._slow_queries import SlowQueryLog, fingerprint, normalize_statement  # noqa: F401
+
+# Consultas lentas de todos os pools (desligado sem SLOW_QUERY_THRESHOLD_MS)
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_THRESHOLD_MS, top_n=settings.SLOW_QUERY_TOP_N)
+
+# Pragmas que só valem para a conexão de escrita (alteram o arquivo)
+SQLITE_WRITE_PRAGMAS = ('journal_mode',)
+
+
+def sqlite_pragmas() -> dict:
+	"""Perfil de desempenho do SQLite configurado no Settings."""
+	pragmas = {
+		'journal_mode': settings.SQLITE_JOURNAL_MODE,
+		'synchronous': settings.SQLITE_SYNCHRONOUS,
+		'busy_timeout': settings.SQLITE_BUSY_TIMEOUT,
+		'cache_size': settings.SQLITE_CACHE_SIZE,
+		'mmap_size': settings.SQLITE_MMAP_SIZE,
+		'temp_store': settings.SQLITE_TEMP_STORE,
+	}
+	return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_sqlite_pragmas(engine: Engine | None, read_only: bool = False) -> None:
+	"""Aplica o perfil em cada nova conexão do pool (evento `connect`)."""
+	if engine is None or engine.dialect.name != 'sqlite':
+		return
+
+	pragmas = sqlite_pragmas()
+	if read_only:
+		pragmas = {k: v for k, v in pragmas.items() if k not in SQLITE_WRITE_PRAGMAS}
+	if not pragmas:
+		return
+
+	@event.listens_for(engine, 'connect')
+	def set_pragmas(dbapi_connection, connection_record):
+		cursor = dbapi_connection.cursor()
+		try:
+			for name, value in pragmas.items():
+				cursor.execute(f'PRAGMA {name}={value}')
+		finally:
+			cursor.close()
+
+	logging.info(f'SQLite pragmas ({"read" if read_only else "write"}): {pragmas}')
+
+
+def optimize_sqlite(db_manager: DatabaseManager) -> dict:
+	"""PRAGMA optimize e checkpoint do WAL. Deve rodar na thread de escrita."""
+	with db_manager.get_session() as session:
+		session.execute(text('PRAGMA optimize'))
+		busy, log_frames, checkpointed = session.execute(
+			text('PRAGMA wal_checkpoint(TRUNCATE)')
+		).one()
+	return {'busy': busy, 'log_frames': log_frames, 'checkpointed': checkpointed}
 
 
 def setup_database(database_url: str = None) -> DatabaseManager:
 	logging.info(f"{'='*60}")
 	logging.info('Initializing DatabaseManager')
-	db_manager = DatabaseManager(database_url=database_url, echo=True, pool_size=5, pool_timeout=30)
+	db_manager = DatabaseManager(
+		database_url=database_url,
+		echo=settings.DATABASE_ECHO,
+		pool_size=settings.DATABASE_POOL_SIZE,
+		pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+	)
 
 	logging.info('Initializing database...')
 	db_manager.initialize()
+	apply_sqlite_pragmas(db_manager._engine)
+	slow_query_log.attach(db_manager._engine)
 
 	logging.info('Registering models...')
 	models = get_all_models()
@@ -23,3 +89,82 @@ def setup_database(database_url: str = None) -> DatabaseManager:
 	logging.info('DatabaseManager setup complete.')
 
 	return db_manager
+
+
+def read_only_url(database_url: str, drivername: str | None = None) -> tuple[str, dict] | None:
+	"""
+	(URL, connect_args) de uma conexão somente leitura ao mesmo banco.
+	`drivername` troca o driver (ex.: sqlite+aiosqlite). None quando o banco
+	não permite uma segunda conexão (SQLite em memória).
+	"""
+	url = make_url(database_url)
+	backend = url.get_backend_name()
+	drivername = drivername or url.drivername
+
+	if backend == 'sqlite':
+		if not url.database or url.database == ':memory:':
+			return None
+		# URI file:///... com o caminho codificado (espaço, #, ?; C:/ no Windows)
+		path = Path(os.path.abspath(url.database)).as_uri()
+		return f'{drivername}:///{path}?mode=ro&uri=true', {}
+
+	url = url.set(drivername=drivername).render_as_string(hide_password=False)
+	if drivername == 'postgresql+asyncpg':
+		return url, {'server_settings': {'default_transaction_read_only': 'on'}}
+	if backend == 'postgresql':
+		return url, {'options': '-c default_transaction_read_only=on'}
+	if backend == 'mysql':
+		return url, {'init_command': 'SET SESSION TRANSACTION READ ONLY'}
+	return url, {}
+
+
+def setup_read_database(database_url: str, pool_size: int = 5) -> DatabaseManager | None:
+	"""
+	Pool de conexões somente leitura, separado do pool de escrita.
+	Retorna None quando o banco não permite (ex.: SQLite em memória).
+	"""
+	read_only = read_only_url(database_url)
+	if read_only is None:
+		return None
+	database_url, connect_args = read_only
+
+	logging.info(f'Initializing read-only DatabaseManager (pool_size={pool_size})')
+	db_manager = DatabaseManager(
+		database_url=database_url,
+		echo=settings.DATABASE_ECHO,
+		pool_size=pool_size,
+		pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+		**({'connect_args': connect_args} if connect_args else {}),
+	)
+	db_manager.initialize()
+	apply_sqlite_pragmas(db_manager._engine, read_only=True)
+	slow_query_log.attach(db_manager._engine)
+	return db_manager
+
+
+def setup_async_database(database_url: str, pool_size: int = 5) -> AsyncDatabase | None:
+	"""
+	AsyncEngine somente leitura para as rotas de consulta.
+	None quando o driver assíncrono (aiosqlite/asyncpg/aiomysql) não está instalado.
+	"""
+	drivername = async_driver(database_url)
+	read_only = drivername and read_only_url(database_url, drivername)
+	if not read_only:
+		return None
+	database_url, connect_args = read_only
+
+	logging.info(f'Initializing async read engine ({drivername}, pool_size={pool_size})')
+	async_db = AsyncDatabase(
+		database_url,
+		pool_size=pool_size,
+		pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+		echo=settings.DATABASE_ECHO,
+		connect_args=connect_args,
+		on_engine=_setup_async_engine,
+	)
+	return async_db
+
+
+def _setup_async_engine(engine: Engine) -> None:
+	apply_sqlite_pragmas(engine, read_only=True)
+	slow_query_log.attach(engine)
@@ -0,0 +1,87 @@
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+	AsyncEngine,
+	AsyncSession,
+	async_sessionmaker,
+	create_async_engine,
+)
+
+# Driver assíncrono de cada banco: (drivername, módulo a importar)
+ASYNC_DRIVERS = {
+	'sqlite': ('sqlite+aiosqlite', 'aiosqlite'),
+	'postgresql': ('postgresql+asyncpg', 'asyncpg'),
+	'mysql': ('mysql+aiomysql', 'aiomysql'),
+}
+
+
+def async_driver(database_url: str) -> str | None:
+	"""Drivername assíncrono do banco, ou None se o driver não estiver instalado."""
+	backend = make_url(database_url).get_backend_name()
+	driver = ASYNC_DRIVERS.get(backend)
+	if driver is None:
+		return None
+	drivername, module = driver
+	if importlib.util.find_spec(module) is None:
+		logging.warning(f'Async reads disabled: {module} is not installed')
+		return None
+	return drivername
+
+
+class AsyncDatabase:
+	"""
+	AsyncEngine de leitura: as consultas rodam no event loop, sem thread.
+
+	As conexões ficam presas ao event loop que as abriu, então o engine é
+	recriado se o loop mudar (ex.: testes com um asyncio.run por caso).
+	"""
+
+	def __init__(
+		self,
+		database_url: str,
+		pool_size: int = 5,
+		pool_timeout: int = 30,
+		echo: bool = False,
+		connect_args: dict | None = None,
+		on_engine: Callable[[Engine], None] | None = None,
+	):
+		self.database_url = database_url
+		self._engine_kwargs = {
+			'echo': echo,
+			'pool_size': pool_size,
+			'pool_timeout': pool_timeout,
+			'pool_pre_ping': True,
+			'connect_args': connect_args or {},
+		}
+		self._on_engine = on_engine
+		self.engine: AsyncEngine | None = None
+		self._loop: asyncio.AbstractEventLoop | None = None
+		self._session_factory: async_sessionmaker | None = None
+
+	def _engine_for_loop(self) -> async_sessionmaker:
+		loop = asyncio.get_running_loop()
+		if self.engine is None or self._loop is not loop:
+			if self.engine is not None:
+				# O loop antigo já terminou: só descarta as referências
+				self.engine.sync_engine.dispose(close=False)
+			self.engine = create_async_engine(self.database_url, **self._engine_kwargs)
+			if self._on_engine:
+				self._on_engine(self.engine.sync_engine)
+			self._loop = loop
+			self._session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+		return self._session_factory
+
+	@asynccontextmanager
+	async def session(self) -> AsyncIterator[AsyncSession]:
+		async with self._engine_for_loop()() as session:
+			yield session
+
+	async def close(self) -> None:
+		if self.engine is not None:
+			await self.engine.dispose()
+			self.engine = None
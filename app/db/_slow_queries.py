@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAMS = re.compile(r'(?:\?|%s|:\w+|\$\d+)')
+_LISTS = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+_ROWS = re.compile(r'(\(\?(?:, \?)*\))(?:\s*,\s*\(\?(?:, \?)*\))+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_statement(statement: str) -> str:
+	"""SQL sem literais e parâmetros: IN (?, ?, ?) e VALUES (...), (...) viram um só."""
+	sql = _STRINGS.sub('?', statement)
+	sql = _PARAMS.sub('?', sql)
+	sql = _NUMBERS.sub('?', sql)
+	sql = _SPACES.sub(' ', sql).strip()
+	sql = _ROWS.sub(r'\1...', sql)
+	return _LISTS.sub('(?...)', sql)
+
+
+def fingerprint(statement: str) -> str:
+	return hashlib.blake2b(
+		normalize_statement(statement).encode('utf-8'), digest_size=6
+	).hexdigest()
+
+
+def _caller(depth: int = 2) -> str:
+	"""Funções do app (fora de app/db) que originaram a consulta, da mais interna à externa."""
+	frames = []
+	frame = sys._getframe(2)
+	while frame is not None and len(frames) < depth:
+		filename = os.path.abspath(frame.f_code.co_filename)
+		if filename.startswith(_APP_DIR) and not filename.startswith(_DB_DIR):
+			module = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+			frames.append(f'{module}:{frame.f_lineno} {frame.f_code.co_name}')
+		frame = frame.f_back
+	return ' <- '.join(frames) or 'unknown'
+
+
+class SlowQueryLog:
+	"""
+	Registra as consultas acima de `threshold_ms`, agrupadas pelo fingerprint
+	do SQL, com duração, linhas afetadas e a função que as originou.
+
+	Mantém no máximo `max_entries` fingerprints: quando cheio, descarta o de
+	menor tempo total. `top()` retorna os `top_n` mais custosos.
+	"""
+
+	def __init__(self, threshold_ms: float | None = None, top_n: int = 20):
+		self.threshold_ms = threshold_ms
+		self.top_n = top_n
+		self.max_entries = max(top_n * 5, 50)
+		self._entries: dict[str, dict] = {}
+		self._lock = threading.Lock()
+
+	@property
+	def enabled(self) -> bool:
+		return self.threshold_ms is not None and self.threshold_ms >= 0
+
+	def attach(self, engine: Engine) -> None:
+		if not self.enabled:
+			return
+		event.listen(engine, 'before_cursor_execute', self._before)
+		event.listen(engine, 'after_cursor_execute', self._after)
+		event.listen(engine, 'handle_error', self._discard)
+		logging.info(f'Slow query log enabled on {engine.url.database}: >= {self.threshold_ms}ms')
+
+	def _before(self, conn, cursor, statement, parameters, context, executemany):
+		conn.info.setdefault('slow_query_started', []).append(time.perf_counter())
+
+	def _discard(self, context):
+		# Consulta com erro: o after_cursor_execute não é chamado
+		if context.connection is not None:
+			started = context.connection.info.get('slow_query_started')
+			if started:
+				started.pop()
+
+	def _after(self, conn, cursor, statement, parameters, context, executemany):
+		started = conn.info['slow_query_started'].pop()
+		duration_ms = (time.perf_counter() - started) * 1000
+		if duration_ms < self.threshold_ms:
+			return
+		self.record(statement, duration_ms, cursor.rowcount, _caller(), executemany)
+
+	def record(
+		self,
+		statement: str,
+		duration_ms: float,
+		rowcount: int = -1,
+		caller: str = 'unknown',
+		executemany: bool = False,
+	) -> None:
+		key = fingerprint(statement)
+		logging.warning(
+			f'Slow query fingerprint={key} duration_ms={duration_ms:.1f} rows={rowcount} '
+			f'executemany={executemany} caller="{caller}" sql="{normalize_statement(statement)[:200]}"'
+		)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				if len(self._entries) >= self.max_entries:
+					smallest = min(self._entries.values(), key=lambda e: e['total_ms'])
+					if smallest['total_ms'] >= duration_ms:
+						return
+					del self._entries[smallest['fingerprint']]
+				entry = self._entries[key] = {
+					'fingerprint': key,
+					'statement': normalize_statement(statement)[:1000],
+					'count': 0,
+					'total_ms': 0.0,
+					'max_ms': 0.0,
+				}
+			entry['count'] += 1
+			entry['total_ms'] += duration_ms
+			entry['max_ms'] = max(entry['max_ms'], duration_ms)
+			entry.update(
+				last_ms=round(duration_ms, 3),
+				last_rows=rowcount,
+				last_caller=caller,
+				last_at=time.time(),
+			)
+
+	def top(self, limit: int | None = None) -> list[dict]:
+		with self._lock:
+			entries = sorted(self._entries.values(), key=lambda e: e['total_ms'], reverse=True)
+			return [
+				{
+					**entry,
+					'total_ms': round(entry['total_ms'], 3),
+					'max_ms': round(entry['max_ms'], 3),
+					'avg_ms': round(entry['total_ms'] / entry['count'], 3),
+				}
+				for entry in entries[: limit or self.top_n]
+			]
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
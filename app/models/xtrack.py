@@ -5,7 +5,7 @@ Defines the Tag and Event models for storing RFID reader data
 with proper indexing and relationships.
 """
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index
 
 try:
 	from sqlalchemy import Column, Integer, String, Boolean
@@ -48,6 +48,7 @@ class Locations(Base, BaseMixin):
 
 class Objects(Base, BaseMixin):
 	__tablename__ = 'objects'
+	__table_args__ = (Index('ix_objects_location_id_active', 'location_id', 'active'),)
 
 	# Primary key
 	idcode = Column(String(50), primary_key=True, nullable=False)
@@ -79,6 +80,11 @@ class Objects(Base, BaseMixin):
 
 class Movements(Base, BaseMixin):
 	__tablename__ = 'movements'
+	__table_args__ = (
+		Index('ix_movements_to_location_id_created_at', 'to_location_id', 'created_at'),
+		Index('ix_movements_from_location_id_created_at', 'from_location_id', 'created_at'),
+		Index('ix_movements_object_idcode_created_at', 'object_idcode', 'created_at'),
+	)
 
 	# Primary key
 	id = Column(Integer, primary_key=True, index=True)
@@ -104,3 +110,20 @@ class Movements(Base, BaseMixin):
 		nullable=False,
 		index=True,
 	)
+
+
+class MovementRollups(Base, BaseMixin):
+	"""Entradas/saídas agregadas por local, por hora e por dia, das movimentações expurgadas."""
+
+	__tablename__ = 'movement_rollups'
+	__table_args__ = (
+		Index('ix_movement_rollups_period_bucket', 'period', 'bucket_start', 'location_id'),
+	)
+
+	# Primary key
+	id = Column(Integer, primary_key=True)
+	period = Column(String(8), nullable=False)  # 'hour' | 'day'
+	bucket_start = Column(DateTime(timezone=True), nullable=False)
+	location_id = Column(Integer, nullable=True)
+	entries = Column(Integer, nullable=False, default=0)
+	exits = Column(Integer, nullable=False, default=0)
@@ -10,7 +10,8 @@ from app.schemas.application import SettingsSchema
 from app.core import settings
 from smartx_rfid.utils import delayed_function
 from app.services.tray import tray_manager
-from app.core import alerts_manager
+from app.core import alerts_manager, logging_pipeline, log_stream_handler
+from app.db import slow_query_log
 
 router_prefix = get_prefix_from_path(__file__)
 router = APIRouter(prefix=router_prefix, tags=[router_prefix])
@@ -95,3 +96,23 @@ async def get_version():
 @router.get('/get_alerts', summary='Get current alerts')
 async def get_alerts():
 	return JSONResponse(content=alerts_manager.get_alerts())
+
+
+@router.get('/get_slow_queries', summary='Get the slowest database queries by total time')
+async def get_slow_queries(limit: int | None = None):
+	return JSONResponse(
+		content={
+			'enabled': slow_query_log.enabled,
+			'threshold_ms': slow_query_log.threshold_ms,
+			'queries': slow_query_log.top(limit),
+		}
+	)
+
+
+@router.get(
+	'/get_log_metrics', summary='Get the logging pipeline queue, drop and sampling counters'
+)
+async def get_log_metrics():
+	return JSONResponse(
+		content={**logging_pipeline.metrics(), 'stream': log_stream_handler.metrics()}
+	)
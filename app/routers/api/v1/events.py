@@ -0,0 +1,47 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from smartx_rfid.utils.path import get_prefix_from_path
+
+from app.core import event_bus
+from app.core.events import format_event
+from app.services.settings_service import settings_service
+from app.services.xtrack import xtrack_info_cache  # noqa: F401 - registra o produtor xtrack_info
+
+router_prefix = get_prefix_from_path(__file__)
+router = APIRouter(prefix=router_prefix, tags=[router_prefix])
+
+KEEPALIVE_SECONDS = 15
+
+
+@router.get(
+	'/stream', summary='Server-Sent Events stream with dashboard, alerts and settings updates'
+)
+async def event_stream():
+	async def stream():
+		subscriber = event_bus.subscribe()
+		try:
+			# Estado inicial para a tela não depender do próximo evento
+			yield format_event('has_changes', {'has_changes': settings_service.has_changes})
+			try:
+				yield format_event('xtrack_info', await event_bus.produce('xtrack_info'))
+			except Exception:
+				pass
+
+			while True:
+				try:
+					event, data = await asyncio.wait_for(
+						subscriber.queue.get(), timeout=KEEPALIVE_SECONDS
+					)
+					yield format_event(event, data)
+				except asyncio.TimeoutError:
+					yield ': keepalive\n\n'
+		finally:
+			event_bus.unsubscribe(subscriber)
+
+	return StreamingResponse(
+		stream(),
+		media_type='text/event-stream',
+		headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+	)
@@ -1,24 +1,116 @@
-import asyncio
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from smartx_rfid.utils.path import get_prefix_from_path
 from app.async_func.xtrack import update_tables
-from app.services.xtrack import xtrack_manager
+from app.services.xtrack import (
+	InvalidCursor,
+	decode_cursor,
+	export_movements,
+	xtrack_info_cache,
+	xtrack_manager,
+	xtrack_scheduler,
+)
 
 router_prefix = get_prefix_from_path(__file__)
 router = APIRouter(prefix=router_prefix, tags=[router_prefix])
 
 
 @router.get('/xtrack_info', summary='Get Xtrack integration info')
-async def get_xtrack_info():
-	success, info = await asyncio.to_thread(xtrack_manager.get_info)
-	if success:
-		return JSONResponse(info)
-	else:
-		return JSONResponse(content={'status': 'error', 'message': info}, status_code=500)
+async def get_xtrack_info(request: Request):
+	success, body, etag = await xtrack_info_cache.get()
+	if not success:
+		return JSONResponse(content={'status': 'error', 'message': body}, status_code=500)
+
+	headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+	if_none_match = request.headers.get('if-none-match', '')
+	if etag in [tag.strip() for tag in if_none_match.split(',')]:
+		return Response(status_code=304, headers=headers)
+	return Response(content=body, media_type='application/json', headers=headers)
 
 
 @router.post('/xtrack_update', summary='Trigger Xtrack data update')
 async def trigger_xtrack_update():
 	update_tables()
 	return JSONResponse(content={'status': 'update triggered'})
+
+
+@router.get('/sync_metrics', summary='Get metrics of the last Xtrack sync')
+async def get_sync_metrics():
+	return JSONResponse(content=xtrack_manager.sync_metrics)
+
+
+@router.get('/sync_status', summary='Get the Xtrack sync scheduler status')
+async def get_sync_status():
+	return JSONResponse(content=xtrack_scheduler.metrics())
+
+
+async def _movements_response(filters: dict, cursor: str | None, limit: int, format: str):
+	try:
+		after = decode_cursor(cursor) if cursor else None
+	except InvalidCursor as e:
+		return JSONResponse(content={'status': 'error', 'message': str(e)}, status_code=400)
+
+	if format == 'ndjson':
+		return StreamingResponse(
+			export_movements(xtrack_manager, filters, after), media_type='application/x-ndjson'
+		)
+
+	success, page = await xtrack_manager.get_movements_async(after=after, limit=limit, **filters)
+	if not success:
+		return JSONResponse(content={'status': 'error', 'message': page}, status_code=500)
+	return JSONResponse(content=page)
+
+
+@router.get(
+	'/movements',
+	summary='Movement history',
+	description=(
+		'Movements ordered by (created_at, id), paginated by cursor: pass the returned '
+		'next_cursor to get the next page. format=ndjson streams every matching movement. '
+		'Movements older than the retention window are only available in /movements/rollups.'
+	),
+)
+async def get_movements(
+	start: datetime | None = None,
+	end: datetime | None = None,
+	location_id: int | None = None,
+	idcode: str | None = None,
+	cursor: str | None = None,
+	limit: int = Query(100, ge=1, le=1000),
+	format: Literal['json', 'ndjson'] = 'json',
+):
+	filters = {'start': start, 'end': end, 'location_id': location_id, 'idcode': idcode}
+	return await _movements_response(filters, cursor, limit, format)
+
+
+@router.get(
+	'/movements/rollups',
+	summary='Hourly/daily entries and exits per location',
+	description='Aggregates of the movements older than the retention window.',
+)
+async def get_movement_rollups(
+	period: Literal['hour', 'day'] = 'day',
+	start: datetime | None = None,
+	end: datetime | None = None,
+	location_id: int | None = None,
+):
+	success, rows = await xtrack_manager.get_rollups_async(period, start, end, location_id)
+	if not success:
+		return JSONResponse(content={'status': 'error', 'message': rows}, status_code=500)
+	return JSONResponse(content=rows)
+
+
+@router.get('/objects/{idcode}/history', summary='Movement history of an object')
+async def get_object_history(
+	idcode: str,
+	start: datetime | None = None,
+	end: datetime | None = None,
+	cursor: str | None = None,
+	limit: int = Query(100, ge=1, le=1000),
+	format: Literal['json', 'ndjson'] = 'json',
+):
+	filters = {'start': start, 'end': end, 'location_id': None, 'idcode': idcode}
+	return await _movements_response(filters, cursor, limit, format)
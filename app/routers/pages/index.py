@@ -2,7 +2,7 @@ from fastapi import APIRouter, Request
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import HTMLResponse
 
-from app.core import settings, templates
+from app.core import settings, static_manifest, templates
 
 router = APIRouter(prefix='', tags=['Pages'])
 
@@ -29,9 +29,9 @@ async def docs():
 	return get_swagger_ui_html(
 		openapi_url='/openapi.json',
 		title=settings.TITLE + ' - Docs',
-		swagger_js_url='/static/docs/swagger-ui-bundle.js',
-		swagger_css_url='/static/docs/swagger-ui.css',
-		swagger_favicon_url='/static/images/logo.png',
+		swagger_js_url=static_manifest.url('docs/swagger-ui-bundle.js'),
+		swagger_css_url=static_manifest.url('docs/swagger-ui.css'),
+		swagger_favicon_url=static_manifest.url('images/logo.png'),
 	)
 
 
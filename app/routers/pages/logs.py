@@ -1,53 +1,71 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-import html
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+import asyncio
+import logging
 import os
+import re
 from datetime import datetime
 from typing import Dict, Any
 
 from app.core import templates
-from app.core import logger
+from app.core import logger, log_stream_handler, logging_pipeline, settings
+from app.core.events import format_event
+from app.services.logs import LogChunk, get_log_index, read_since, read_tail
 
 router = APIRouter(prefix='', tags=['Logs'])
 
+KEEPALIVE_SECONDS = 15
 
-async def get_log_content() -> Dict[str, Any]:
+
+def get_log_content(
+	since_offset: int | None = None, inode: int | None = None, tail: int = 1000
+) -> Dict[str, Any]:
 	"""
 	Function to fetch log content and file information.
 
+	Without `since_offset` returns the last `tail` lines. With it, only the
+	lines appended after that offset; if the file was rotated (different
+	`inode`) or truncated, falls back to the tail and sets `reset`.
+
 	Returns:
 		Dict containing log content and file metadata
 	"""
 	# Get today's log file
 	file_path = logger._get_filename_for_date(logger._now().date())
 
-	# Read file content safely
-	try:
-		with open(file_path, 'r', encoding='utf-8') as f:
-			log_lines = f.readlines()
-
-		# Remove empty lines but DON'T reverse order (frontend handles this)
-		log_lines = [line.strip() for line in log_lines if line.strip()]
-
-		# Escape special characters for HTML
-		log_content = [html.escape(line) for line in log_lines]
-
-	except FileNotFoundError:
-		log_content = ['Log file not found.']
-	except Exception as e:
-		log_content = [f'Error reading log file: {str(e)}']
+	chunk = LogChunk()
+	# Listener parado entre dois registros: o arquivo tem exatamente os
+	# registros até `seq`, e o stream retoma do seguinte (`since`)
+	with logging_pipeline.paused():
+		seq = log_stream_handler.seq
+		try:
+			if since_offset is None:
+				chunk = read_tail(file_path, tail)
+			else:
+				chunk = read_since(file_path, since_offset, inode, tail_lines=tail)
+			log_content = chunk.lines
+		except FileNotFoundError:
+			log_content = ['Log file not found.']
+			chunk.reset = True
+		except Exception as e:
+			log_content = [f'Error reading log file: {str(e)}']
 
 	# Additional information about the log file
 	log_info = {
 		'file_path': file_path,
 		'file_exists': os.path.exists(file_path),
-		'file_size': os.path.getsize(file_path) if os.path.exists(file_path) else 0,
+		'file_size': chunk.size,
 		'last_modified': datetime.fromtimestamp(os.path.getmtime(file_path)).strftime(
 			'%Y-%m-%d %H:%M:%S'
 		)
 		if os.path.exists(file_path)
 		else 'N/A',
 		'total_lines': len(log_content),
+		'offset': chunk.offset,
+		'inode': chunk.inode,
+		'reset': chunk.reset,
+		'more': chunk.more,
+		'seq': seq,
 		'timestamp': datetime.now().isoformat(),
 	}
 
@@ -68,8 +86,95 @@ async def logs(request: Request):
 
 
 @router.get('/logs/get_content')
-async def get_logs_content():
-	log_data = await get_log_content()
+async def get_logs_content(
+	since_offset: int | None = Query(None, ge=0),
+	inode: int | None = None,
+	tail: int = Query(1000, ge=0, le=20000),
+):
+	log_data = await asyncio.to_thread(get_log_content, since_offset, inode, tail)
 	return JSONResponse(
 		content=log_data, headers={'Cache-Control': 'no-cache, no-store, must-revalidate'}
 	)
+
+
+@router.get('/logs/search')
+async def search_logs(
+	q: str | None = None,
+	level: str | None = None,
+	date_from: datetime | None = Query(None, alias='from'),
+	date_to: datetime | None = Query(None, alias='to'),
+	cursor: int | None = Query(None, ge=1),
+	limit: int = Query(100, ge=1, le=1000),
+):
+	"""Busca em todos os arquivos de log mantidos (STORAGE_DAYS), mais recentes primeiro."""
+	if not settings.LOG_INDEX_ENABLED:
+		return JSONResponse(
+			content={'status': 'error', 'message': 'Log index disabled'}, status_code=404
+		)
+
+	def search():
+		# Indexa o que foi escrito desde o último refresh antes de buscar
+		log_index = get_log_index()
+		log_index.refresh()
+		return log_index.search(q, level, date_from, date_to, cursor, limit)
+
+	try:
+		result = await asyncio.to_thread(search)
+	except Exception as e:
+		return JSONResponse(content={'status': 'error', 'message': str(e)}, status_code=500)
+	return JSONResponse(content=result, headers={'Cache-Control': 'no-cache'})
+
+
+@router.get('/logs/stream')
+async def stream_logs(
+	level: str | None = None,
+	logger_name: str | None = Query(None, alias='logger'),
+	pattern: str | None = None,
+	backlog: int = Query(200, ge=0, le=5000),
+	since: int | None = Query(None, ge=0),
+):
+	"""
+	Server-Sent Events com os registros de log em tempo real, filtrados no
+	servidor por nível mínimo, logger (e filhos) e regex na mensagem. Cada
+	evento `log` traz `seq`, `level`, `logger`, `message` e `line` (já
+	escapada); `dropped` informa quantos registros o cliente perdeu por
+	estar lento. `since` (o `info.seq` de /logs/get_content) começa logo
+	depois do conteúdo já lido do arquivo, no lugar de `backlog`.
+	"""
+	levelno = logging.NOTSET
+	if level:
+		levelno = logging.getLevelName(level.upper())
+		if not isinstance(levelno, int):
+			return JSONResponse(
+				content={'status': 'error', 'message': f'Invalid level: {level}'}, status_code=400
+			)
+	try:
+		regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+	except re.error as e:
+		return JSONResponse(
+			content={'status': 'error', 'message': f'Invalid pattern: {e}'}, status_code=400
+		)
+
+	async def stream():
+		subscriber = log_stream_handler.subscribe(levelno, logger_name, regex, backlog, since)
+		dropped = 0
+		try:
+			while True:
+				try:
+					event, data = await asyncio.wait_for(
+						subscriber.queue.get(), timeout=KEEPALIVE_SECONDS
+					)
+					if subscriber.dropped != dropped:
+						dropped = subscriber.dropped
+						yield format_event('dropped', {'dropped': dropped})
+					yield format_event(event, data)
+				except asyncio.TimeoutError:
+					yield ': keepalive\n\n'
+		finally:
+			log_stream_handler.unsubscribe(subscriber)
+
+	return StreamingResponse(
+		stream(),
+		media_type='text/event-stream',
+		headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+	)
@@ -0,0 +1,19 @@
+import threading
+
+from ._reader import LogChunk, read_since, read_tail
+from ._search import LogIndex
+from app.core import logger, settings
+
+_log_index: LogIndex | None = None
+_log_index_lock = threading.Lock()
+
+
+def get_log_index() -> LogIndex | None:
+	"""Índice de busca dos logs, criado no primeiro uso. None se LOG_INDEX_ENABLED=False."""
+	global _log_index
+	if not settings.LOG_INDEX_ENABLED:
+		return None
+	with _log_index_lock:
+		if _log_index is None:
+			_log_index = LogIndex(logger.log_path)
+		return _log_index
@@ -0,0 +1,91 @@
+import html
+import os
+from dataclasses import dataclass, field
+
+BLOCK_SIZE = 64 * 1024
+
+
+@dataclass
+class LogChunk:
+	"""
+	Trecho lido do arquivo de log.
+
+	`offset` é a posição logo após a última linha completa devolvida: o cliente
+	envia de volta em `since_offset` junto com o `inode`. `reset` indica que o
+	arquivo foi trocado (rotação/novo dia) ou truncado e o cliente deve
+	descartar as linhas que já tem.
+	"""
+
+	lines: list[str] = field(default_factory=list)
+	offset: int = 0
+	inode: int | None = None
+	size: int = 0
+	reset: bool = False
+	more: bool = False
+
+
+def _clean(raw: list[bytes]) -> list[str]:
+	lines = (line.decode('utf-8', errors='replace').strip() for line in raw)
+	return [html.escape(line) for line in lines if line]
+
+
+def read_tail(path: str, lines: int) -> LogChunk:
+	"""Últimas `lines` linhas completas, lendo o arquivo de trás para frente em blocos."""
+	with open(path, 'rb') as f:
+		stat = os.fstat(f.fileno())
+		end = stat.st_size
+		data = b''
+		position = end
+		# Uma quebra a mais para garantir que a primeira linha do trecho está completa
+		while position > 0 and data.count(b'\n') <= lines:
+			step = min(BLOCK_SIZE, position)
+			position -= step
+			f.seek(position)
+			data = f.read(step) + data
+
+	# Linha parcial no fim do arquivo fica para a próxima leitura
+	complete = data[: data.rfind(b'\n') + 1]
+	offset = end - (len(data) - len(complete))
+	raw = complete.split(b'\n')[:-1]
+	if position > 0:
+		raw = raw[1:]  # primeira linha do bloco pode estar cortada
+	return LogChunk(
+		lines=_clean(raw[-lines:] if lines > 0 else []),
+		offset=offset,
+		inode=stat.st_ino,
+		size=end,
+		reset=True,
+	)
+
+
+def read_since(
+	path: str,
+	since_offset: int,
+	inode: int | None = None,
+	max_bytes: int = 1024 * 1024,
+	tail_lines: int = 1000,
+) -> LogChunk:
+	"""
+	Linhas completas acrescentadas depois de `since_offset`, até `max_bytes`.
+	Se o arquivo não é mais o mesmo (`inode`) ou encolheu, volta ao `read_tail`.
+	"""
+	with open(path, 'rb') as f:
+		stat = os.fstat(f.fileno())
+		if (inode is not None and inode != stat.st_ino) or since_offset > stat.st_size:
+			return read_tail(path, tail_lines)
+
+		f.seek(since_offset)
+		data = f.read(max_bytes)
+
+	complete = data[: data.rfind(b'\n') + 1]
+	if not complete and len(data) == max_bytes:
+		# Linha maior que max_bytes: devolve cortada para o cursor avançar
+		complete = data
+	offset = since_offset + len(complete)
+	return LogChunk(
+		lines=_clean(complete.split(b'\n')),
+		offset=offset,
+		inode=stat.st_ino,
+		size=stat.st_size,
+		more=offset < stat.st_size and len(data) == max_bytes,
+	)
@@ -0,0 +1,265 @@
+"""
+Busca textual nos arquivos do LoggerManager (todos os dias mantidos em LOG_PATH).
+
+Índice incremental em um SQLite à parte (`.log_index.sqlite` na pasta dos
+logs): cada arquivo guarda inode e offset já indexados, e a cada refresh só
+as linhas acrescentadas depois do offset são lidas. Arquivo trocado (inode
+diferente) ou truncado é reindexado; arquivo removido pela limpeza do
+LoggerManager sai do índice.
+
+As mensagens vão para uma tabela FTS5 (external content). Sem FTS5 no
+SQLite do Python, a busca cai para LIKE na mesma tabela.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+INDEX_FILENAME = '.log_index.sqlite'
+LOG_FILE = re.compile(r'^\d{4}-\d{2}-\d{2}_.*\.log$')
+# "2026-01-01 08:00:00,123 - INFO - mensagem"
+LINE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+ - (\w+) - (.*)$')
+READ_BLOCK = 4 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+	id INTEGER PRIMARY KEY,
+	name TEXT UNIQUE NOT NULL,
+	inode INTEGER,
+	offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+	id INTEGER PRIMARY KEY,
+	file_id INTEGER NOT NULL,
+	ts TEXT,
+	level TEXT,
+	message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS ix_entries_file_id ON entries (file_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+	message, content='entries', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+
+def fts_query(q: str) -> str:
+	"""Texto livre -> consulta FTS5: cada termo vira uma frase (sem operadores)."""
+	return ' '.join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def parse_lines(raw: list[bytes], last: tuple[str | None, str | None]) -> list[tuple]:
+	"""
+	Linhas -> (ts, level, message). Linhas sem cabeçalho (ex.: traceback)
+	herdam data e nível da linha anterior.
+	"""
+	rows = []
+	ts, level = last
+	for line in raw:
+		text = line.decode('utf-8', errors='replace').rstrip('\r')
+		if not text.strip():
+			continue
+		match = LINE.match(text)
+		if match:
+			ts, level, text = match.groups()
+		rows.append((ts, level, text))
+	return rows
+
+
+class LogIndex:
+	"""Índice de busca dos arquivos de log de `log_dir`. Seguro para várias threads."""
+
+	def __init__(self, log_dir: str, index_path: str | None = None):
+		self.log_dir = log_dir
+		self.index_path = index_path or os.path.join(log_dir, INDEX_FILENAME)
+		self._lock = threading.Lock()
+		self.fts = True
+		self.last_refresh: float | None = None
+		self._setup()
+
+	def _connect(self) -> sqlite3.Connection:
+		conn = sqlite3.connect(self.index_path, timeout=30)
+		conn.execute('PRAGMA journal_mode=WAL')
+		conn.execute('PRAGMA synchronous=NORMAL')
+		return conn
+
+	def _setup(self) -> None:
+		os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+		conn = self._connect()
+		try:
+			conn.executescript(SCHEMA)
+			try:
+				conn.executescript(FTS_SCHEMA)
+			except sqlite3.OperationalError as e:
+				self.fts = False
+				logging.warning(f'SQLite FTS5 unavailable, log search uses LIKE: {e}')
+		finally:
+			conn.close()
+
+	# Indexação
+	def refresh(self) -> int:
+		"""Indexa as linhas novas de todos os arquivos. Retorna quantas foram indexadas."""
+		with self._lock:
+			started = time.monotonic()
+			names = sorted(name for name in os.listdir(self.log_dir) if LOG_FILE.match(name))
+			added = 0
+			conn = self._connect()
+			try:
+				known = {
+					row[1]: row for row in conn.execute('SELECT id, name, inode, offset FROM files')
+				}
+				for name in set(known) - set(names):
+					self._drop_file(conn, known[name][0])
+					conn.execute('DELETE FROM files WHERE id = ?', (known[name][0],))
+					conn.commit()
+				for name in names:
+					added += self._index_file(conn, name, known.get(name))
+			finally:
+				conn.close()
+			self.last_refresh = time.time()
+			if added:
+				logging.debug(f'Log index: {added} lines in {time.monotonic() - started:.3f}s')
+			return added
+
+	def _drop_file(self, conn: sqlite3.Connection, file_id: int) -> None:
+		if self.fts:
+			conn.execute(
+				'INSERT INTO entries_fts (entries_fts, rowid, message) '
+				"SELECT 'delete', id, message FROM entries WHERE file_id = ?",
+				(file_id,),
+			)
+		conn.execute('DELETE FROM entries WHERE file_id = ?', (file_id,))
+
+	def _index_file(self, conn: sqlite3.Connection, name: str, known: tuple | None) -> int:
+		path = os.path.join(self.log_dir, name)
+		try:
+			f = open(path, 'rb')
+		except FileNotFoundError:
+			return 0
+
+		with f:
+			stat = os.fstat(f.fileno())
+			if known is None:
+				file_id = conn.execute(
+					'INSERT INTO files (name, inode, offset) VALUES (?, ?, 0)', (name, stat.st_ino)
+				).lastrowid
+				offset = 0
+			else:
+				file_id, _, inode, offset = known
+				if inode != stat.st_ino or stat.st_size < offset:
+					# Arquivo trocado ou truncado: reindexa do início
+					self._drop_file(conn, file_id)
+					offset = 0
+			if stat.st_size == offset:
+				conn.commit()
+				return 0
+
+			last = conn.execute(
+				'SELECT ts, level FROM entries WHERE file_id = ? ORDER BY id DESC LIMIT 1',
+				(file_id,),
+			).fetchone() or (None, None)
+
+			added = 0
+			while True:
+				f.seek(offset)
+				data = f.read(READ_BLOCK)
+				complete = data[: data.rfind(b'\n') + 1]
+				if not complete and len(data) == READ_BLOCK:
+					complete = data  # linha maior que o bloco
+				if not complete:
+					break
+				rows = parse_lines(complete.split(b'\n'), last)
+				if rows:
+					last = rows[-1][:2]
+					self._insert(conn, file_id, rows)
+				offset += len(complete)
+				added += len(rows)
+				# Offset e linhas na mesma transação
+				conn.execute(
+					'UPDATE files SET inode = ?, offset = ? WHERE id = ?',
+					(stat.st_ino, offset, file_id),
+				)
+				conn.commit()
+			conn.commit()
+			return added
+
+	def _insert(self, conn: sqlite3.Connection, file_id: int, rows: list[tuple]) -> None:
+		first = conn.execute('SELECT COALESCE(MAX(id), 0) FROM entries').fetchone()[0] + 1
+		conn.executemany(
+			'INSERT INTO entries (id, file_id, ts, level, message) VALUES (?, ?, ?, ?, ?)',
+			[(first + i, file_id, *row) for i, row in enumerate(rows)],
+		)
+		if self.fts:
+			conn.execute(
+				'INSERT INTO entries_fts (rowid, message) '
+				'SELECT id, message FROM entries WHERE id >= ?',
+				(first,),
+			)
+
+	# Busca
+	def search(
+		self,
+		q: str | None = None,
+		level: str | None = None,
+		date_from: datetime | None = None,
+		date_to: datetime | None = None,
+		before_id: int | None = None,
+		limit: int = 100,
+	) -> dict:
+		"""
+		Entradas mais recentes primeiro, paginadas por id (`next_cursor`).
+		`q` casa todos os termos; `date_to` é exclusivo.
+		"""
+		where, params = [], []
+		source = 'entries e'
+		if q and q.strip():
+			if self.fts:
+				source = 'entries_fts JOIN entries e ON e.id = entries_fts.rowid'
+				where.append('entries_fts MATCH ?')
+				params.append(fts_query(q))
+			else:
+				for term in q.split():
+					where.append("e.message LIKE ? ESCAPE '\\'")
+					escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+					params.append(f'%{escaped}%')
+		if level:
+			where.append('e.level = ?')
+			params.append(level.upper())
+		if date_from:
+			where.append('e.ts >= ?')
+			params.append(date_from.strftime('%Y-%m-%d %H:%M:%S'))
+		if date_to:
+			where.append('e.ts < ?')
+			params.append(date_to.strftime('%Y-%m-%d %H:%M:%S'))
+		if before_id:
+			where.append('e.id < ?')
+			params.append(before_id)
+
+		sql = (
+			f'SELECT e.id, f.name, e.ts, e.level, e.message FROM {source} '
+			'JOIN files f ON f.id = e.file_id'
+			+ (f' WHERE {" AND ".join(where)}' if where else '')
+			+ ' ORDER BY e.id DESC LIMIT ?'
+		)
+		conn = self._connect()
+		try:
+			rows = conn.execute(sql, [*params, limit + 1]).fetchall()
+		finally:
+			conn.close()
+
+		has_more = len(rows) > limit
+		rows = rows[:limit]
+		return {
+			'items': [
+				{'id': id_, 'file': name, 'ts': ts, 'level': lvl, 'message': message}
+				for id_, name, ts, lvl, message in rows
+			],
+			'next_cursor': rows[-1][0] if has_more else None,
+		}
@@ -2,7 +2,7 @@ import json
 import os
 from pathlib import Path
 
-from app.core import settings
+from app.core import settings, event_bus
 from app.core import EXAMPLE_PATH, FILES_PATH
 import asyncio
 from typing import Any, Dict, Union
@@ -18,6 +18,7 @@ class SettingsService:
 		settings.load(data)
 		settings.save()
 		self.has_changes = True
+		event_bus.publish('has_changes', {'has_changes': True})
 
 	def _get_example_config(self) -> dict:
 		try:
@@ -15,7 +15,7 @@ try:
 except ImportError:
 	TRAY_AVAILABLE = False
 
-from app.core import settings
+from app.core import settings, logging_pipeline
 
 
 class TrayManager:
@@ -94,4 +94,6 @@ class TrayManager:
 	def exit_application(self):
 		if self._icon:
 			self._icon.stop()
+		# os._exit não roda o atexit: grava os logs pendentes antes
+		logging_pipeline.stop()
 		os._exit(0)
@@ -1,4 +1,24 @@
 from ._main import XtackManager
-from app.core import settings
+from ._cache import InfoCache
+from ._sync import stream_objects
+from ._scheduler import SyncScheduler
+from ._history import InvalidCursor, decode_cursor, export_movements
+from app.core import settings, event_bus
 
 xtrack_manager = XtackManager(settings.XTRACK_URL)
+xtrack_scheduler = SyncScheduler(xtrack_manager)
+
+xtrack_info_cache = InfoCache(xtrack_manager.get_info_async, ttl=settings.XTRACK_INFO_CACHE_TTL)
+xtrack_manager.add_listener(xtrack_info_cache.invalidate)
+
+
+async def _produce_xtrack_info():
+	success, body, _ = await xtrack_info_cache.get()
+	if not success:
+		raise RuntimeError(body)
+	return body
+
+
+# Após cada commit: invalida o cache e envia um novo snapshot para as telas conectadas
+event_bus.register_producer('xtrack_info', _produce_xtrack_info)
+xtrack_manager.add_listener(lambda: event_bus.notify('xtrack_info'))
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import random
+import xml.etree.ElementTree as ET
+from typing import AsyncIterator, Hashable, Iterable
+from xml.sax.saxutils import escape
+
+import httpx
+from smartx_rfid.api import ApiXtrack
+
+try:
+	import h2  # noqa: F401
+
+	HTTP2_AVAILABLE = True
+except ImportError:
+	HTTP2_AVAILABLE = False
+
+GET_OBJECT_PAYLOAD = """
+<msg>
+	<command>GetObject</command>
+	<terminal>ERP</terminal>
+</msg>
+"""
+
+GET_OBJECT_FILTERED_PAYLOAD = """
+<msg>
+	<command>GetObject</command>
+	<terminal>ERP</terminal>
+	<{tag}>{value}</{tag}>
+</msg>
+"""
+
+XML_HEADERS = {'Content-Type': 'application/xml'}
+RETRY_STATUS = {429, 502, 503, 504}
+
+OBJECT_FIELDS = {
+	'IDCODE',
+	'ACTIVE',
+	'DESCRIPTION',
+	'LOCATION_ID',
+	'LAST_SEEN',
+	'HOME_LOCATION_ID',
+	'LAST_MODIFIED',
+	'LAST_LOCATION',
+}
+
+
+class XtrackApi(ApiXtrack):
+	"""
+	ApiXtrack com:
+
+	- um único httpx.AsyncClient keep-alive (HTTP/2 quando o pacote h2 está
+	  instalado) compartilhado por todas as requisições
+	- retry com backoff exponencial para falhas de rede e 429/5xx
+	- leitura incremental (streaming) da resposta do GetObject
+	- download concorrente do GetObject por fatias (ex.: por local), limitado
+	  por um semáforo, quando o Xtrack aceita um filtro no payload
+	"""
+
+	def __init__(
+		self,
+		base_url: str,
+		timeout: int = 120,
+		retries: int = 3,
+		backoff: float = 0.5,
+		transport: httpx.AsyncBaseTransport | None = None,
+	):
+		super().__init__(base_url, timeout)
+		self.retries = retries
+		self.backoff = backoff
+		self._transport = transport
+		self._client: httpx.AsyncClient | None = None
+		self._client_loop: asyncio.AbstractEventLoop | None = None
+
+	def client(self) -> httpx.AsyncClient:
+		"""Cliente compartilhado, recriado se o event loop mudou."""
+		loop = asyncio.get_running_loop()
+		if self._client is None or self._client.is_closed or self._client_loop is not loop:
+			self._client = httpx.AsyncClient(
+				timeout=self.timeout,
+				http2=HTTP2_AVAILABLE and self._transport is None,
+				transport=self._transport,
+				limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+			)
+			self._client_loop = loop
+		return self._client
+
+	async def aclose(self) -> None:
+		if self._client is not None and not self._client.is_closed:
+			await self._client.aclose()
+		self._client = None
+
+	async def _retry_delay(self, attempt: int) -> None:
+		await asyncio.sleep(self.backoff * 2**attempt * (0.5 + random.random()))
+
+	async def post_xml(self, payload: str) -> bytes:
+		"""
+		POST de um comando XML com retry. Retorna o corpo da resposta.
+
+		Raises:
+		    httpx.HTTPError: Falha após esgotar as tentativas
+		"""
+		for attempt in range(self.retries + 1):
+			try:
+				response = await self.client().post(
+					self.base_url, content=payload, headers=XML_HEADERS
+				)
+				if response.status_code in RETRY_STATUS and attempt < self.retries:
+					logging.warning(
+						f'[ XTRACK ] HTTP {response.status_code}, retry {attempt + 1}/{self.retries}'
+					)
+					await self._retry_delay(attempt)
+					continue
+				response.raise_for_status()
+				return response.content
+			except httpx.TransportError as e:
+				if attempt >= self.retries:
+					raise
+				logging.warning(f'[ XTRACK ] {e!r}, retry {attempt + 1}/{self.retries}')
+				await self._retry_delay(attempt)
+
+	async def post(
+		self,
+		endpoint: str | None = None,
+		data: dict = None,
+		json: dict = None,
+		headers: dict = None,
+		url: str | None = None,
+	):
+		"""Mesmo contrato do ApiXtrack.post, usando o cliente compartilhado e retry."""
+		url = url or (f'{self.base_url}/{endpoint}' if endpoint else self.base_url)
+		for attempt in range(self.retries + 1):
+			try:
+				response = await self.client().post(url, data=data, json=json, headers=headers)
+				if response.status_code in RETRY_STATUS and attempt < self.retries:
+					await self._retry_delay(attempt)
+					continue
+				response.raise_for_status()
+				try:
+					return True, response.json()
+				except Exception:
+					return True, {'raw_response': response.text}
+			except httpx.HTTPStatusError as e:
+				logging.error(f'[ XTRACK ] POST request failed: {e.response.status_code}')
+				return False, {'error': f'HTTP error: {e.response.status_code}', 'detail': str(e)}
+			except httpx.TransportError as e:
+				if attempt < self.retries:
+					await self._retry_delay(attempt)
+					continue
+				logging.error(f'[ XTRACK ] POST request exception: {e}')
+				return False, {'error': 'Request failed', 'detail': str(e)}
+			except Exception as e:
+				# Ex.: URL inválida, erro de encoding do corpo: sem retry
+				logging.error(f'[ XTRACK ] POST request exception: {e}')
+				return False, {'error': 'Request failed', 'detail': str(e)}
+
+	@staticmethod
+	def parse_objects(content: bytes) -> list[dict]:
+		root = ET.fromstring(content)
+		return [
+			{child.tag: child.text for child in elem if child.tag in OBJECT_FIELDS}
+			for elem in root.iter('data')
+		]
+
+	async def fetch_object_slices(
+		self, filter_tag: str, values: Iterable[Hashable], concurrency: int = 4
+	) -> AsyncIterator[tuple[Hashable, list[dict]]]:
+		"""
+		Faz um GetObject por valor de `filter_tag` (ex.: LOCATION_ID), no máximo
+		`concurrency` ao mesmo tempo, e devolve (valor, objetos) conforme cada
+		fatia termina.
+
+		Raises:
+		    httpx.HTTPError / ET.ParseError: Alguma fatia falhou após as tentativas
+		"""
+		semaphore = asyncio.Semaphore(concurrency)
+
+		async def fetch(value):
+			async with semaphore:
+				payload = GET_OBJECT_FILTERED_PAYLOAD.format(
+					tag=filter_tag, value=escape(str(value))
+				)
+				content = await self.post_xml(payload)
+			return value, await asyncio.to_thread(self.parse_objects, content)
+
+		tasks = [asyncio.ensure_future(fetch(value)) for value in values]
+		try:
+			for next_done in asyncio.as_completed(tasks):
+				yield await next_done
+		finally:
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+
+	async def iter_objects(self, batch_size: int = 5000) -> AsyncIterator[list[dict]]:
+		"""
+		Faz o GetObject e devolve os objetos em lotes de até `batch_size`,
+		conforme o XML vai chegando. Cada <data> é descartado da árvore
+		assim que convertido, mantendo a memória constante.
+
+		Raises:
+		    httpx.HTTPError: Falha na requisição
+		    ET.ParseError: XML inválido
+		"""
+		logging.info(f'[ XTRACK ] Streaming GetObject from {self.base_url}')
+		parser = ET.XMLPullParser(events=('start', 'end'))
+		stack: list[ET.Element] = []
+		batch: list[dict] = []
+		total = 0
+
+		def drain():
+			nonlocal total
+			for event, elem in parser.read_events():
+				if event == 'start':
+					stack.append(elem)
+					continue
+				stack.pop()
+				if elem.tag != 'data':
+					continue
+				batch.append(
+					{child.tag: child.text for child in elem if child.tag in OBJECT_FIELDS}
+				)
+				total += 1
+				# Remove o elemento já processado da árvore
+				if stack:
+					stack[-1].remove(elem)
+
+		async with self.client().stream(
+			'POST', self.base_url, content=GET_OBJECT_PAYLOAD, headers=XML_HEADERS
+		) as response:
+			response.raise_for_status()
+			async for chunk in response.aiter_bytes():
+				parser.feed(chunk)
+				drain()
+				while len(batch) >= batch_size:
+					yield batch[:batch_size]
+					del batch[:batch_size]
+
+		parser.close()
+		drain()
+		while batch:
+			yield batch[:batch_size]
+			del batch[:batch_size]
+		logging.info(f'[ XTRACK ] Streaming GetObject finished: {total} items')
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+
+class InfoCache:
+	"""
+	Cache do payload do get_info.
+
+	- Chave por dia, com TTL configurável
+	- Invalidado quando o save_objects/save_locations commitam alterações
+	- Requisições simultâneas compartilham uma única consulta ao banco
+	- Guarda o corpo JSON serializado e um ETag forte para respostas 304
+	"""
+
+	def __init__(
+		self,
+		compute: Callable[[], tuple[bool, Any] | Awaitable[tuple[bool, Any]]],
+		ttl: float = 30,
+	):
+		self._compute = compute
+		self.ttl = ttl
+		self._generation = 0
+		# (dia, geração, expira_em, corpo, etag)
+		self._entry: tuple[date, int, float, bytes, str] | None = None
+		self._inflight: asyncio.Task | None = None
+
+	def invalidate(self) -> None:
+		"""Descarta o payload atual. Pode ser chamado de qualquer thread."""
+		self._generation += 1
+
+	def _cached(self) -> tuple[bytes, str] | None:
+		if self._entry is None:
+			return None
+		day, generation, expires_at, body, etag = self._entry
+		if day != date.today() or generation != self._generation or time.monotonic() >= expires_at:
+			return None
+		return body, etag
+
+	async def get(self) -> tuple[bool, bytes | str, str | None]:
+		"""
+		Retorna (success, corpo JSON em bytes ou mensagem de erro, etag).
+		"""
+		cached = self._cached()
+		if cached is not None:
+			return True, *cached
+
+		# Uma única consulta em andamento, compartilhada por todos os pedidos
+		if self._inflight is None:
+			self._inflight = asyncio.ensure_future(self._refresh())
+			self._inflight.add_done_callback(self._clear_inflight)
+		return await asyncio.shield(self._inflight)
+
+	def _clear_inflight(self, _task: asyncio.Task) -> None:
+		self._inflight = None
+
+	async def _refresh(self) -> tuple[bool, bytes | str, str | None]:
+		day = date.today()
+		generation = self._generation
+		if inspect.iscoroutinefunction(self._compute):
+			success, info = await self._compute()
+		else:
+			success, info = await asyncio.to_thread(self._compute)
+		if not success:
+			return False, info, None
+
+		body = json.dumps(info, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+		etag = f'"{hashlib.sha1(body).hexdigest()}"'
+		self._entry = (day, generation, time.monotonic() + self.ttl, body, etag)
+		return True, body, etag
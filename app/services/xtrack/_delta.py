@@ -0,0 +1,77 @@
+import hashlib
+import json
+import time
+import zlib
+from typing import Any, Hashable, Iterable
+
+DEFAULT_PARTITIONS = 64
+
+
+class DeltaTracker:
+	"""
+	Detecta partes do feed de objetos que não mudaram desde o último sync.
+
+	Os objetos são distribuídos em partições pelo hash (crc32) do IDCODE e cada
+	partição recebe um digest do seu conteúdo. Partições com o mesmo digest do
+	último sync salvo com sucesso são descartadas antes do save_objects.
+	A cada `full_sync_interval` segundos todas as partições são reprocessadas.
+	"""
+
+	def __init__(self, partitions: int = DEFAULT_PARTITIONS, full_sync_interval: float = 3600):
+		self.partitions = partitions
+		self.full_sync_interval = full_sync_interval
+		self._digests: dict[Hashable, bytes] = {}
+		self._last_full_sync: float | None = None
+
+	def full_sync_due(self) -> bool:
+		return (
+			self._last_full_sync is None
+			or time.monotonic() - self._last_full_sync >= self.full_sync_interval
+		)
+
+	def partition_of(self, idcode: str) -> int:
+		return zlib.crc32(idcode.encode('utf-8')) % self.partitions
+
+	@staticmethod
+	def digest(records: Iterable[dict[str, Any]]) -> bytes:
+		"""Digest estável de um conjunto de registros (independe da ordem)."""
+		h = hashlib.blake2b(digest_size=16)
+		for record in sorted(records, key=lambda r: r.get('IDCODE') or ''):
+			h.update(json.dumps(record, sort_keys=True, default=str).encode('utf-8'))
+		return h.digest()
+
+	def split(
+		self, objects: list[dict], page: Hashable | None = None
+	) -> dict[Hashable, list[dict]]:
+		parts: dict[Hashable, list[dict]] = {}
+		for obj in objects:
+			key = self.partition_of(obj['IDCODE'])
+			parts.setdefault(key if page is None else (page, key), []).append(obj)
+		return parts
+
+	def changed(
+		self, objects: list[dict], full: bool = False, page: Hashable | None = None
+	) -> tuple[list[dict], dict]:
+		"""
+		Retorna (objetos das partições alteradas, digests pendentes).
+
+		`page` identifica o lote quando o feed chega em streaming; as partições
+		passam a ser comparadas por (lote, partição).
+		Os digests pendentes só devem ser confirmados com `commit` depois que
+		o save_objects terminar com sucesso.
+		"""
+		parts = self.split(objects, page)
+		pending = {key: self.digest(records) for key, records in parts.items()}
+		if full:
+			return objects, pending
+
+		changed_keys = [key for key, value in pending.items() if self._digests.get(key) != value]
+		changed_objects = [obj for key in changed_keys for obj in parts[key]]
+		return changed_objects, {key: pending[key] for key in changed_keys}
+
+	def commit(self, pending: dict, full: bool = False) -> None:
+		if full:
+			self._digests = dict(pending)
+			self._last_full_sync = time.monotonic()
+		else:
+			self._digests.update(pending)
@@ -0,0 +1,197 @@
+"""
+Diff dos objetos recebidos do Xtrack contra o estado atual do banco.
+
+Dois motores com o mesmo resultado (to_insert, to_update, movements):
+
+- python: laço por objeto com parse_dt/dt_equal (padrão)
+- numpy: carrega idcode, local e timestamps (segundos desde epoch) em arrays
+  e calcula as máscaras de inseridos/alterados/movimentados de forma
+  vetorizada. Os timestamps do banco são lidos como texto e só os objetos
+  inseridos ou alterados passam pelo normalize_object.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import String, cast
+
+from app.models.xtrack import Objects
+
+from ._records import dt_equal, normalize_object
+
+try:
+	import numpy as np
+
+	NUMPY_AVAILABLE = True
+except ImportError:
+	NUMPY_AVAILABLE = False
+
+DIFF_ENGINES = ('python', 'numpy')
+TIMESTAMP_FIELDS = ('last_modified', 'last_location', 'last_seen')
+TIMESTAMP_KEYS = ('LAST_MODIFIED', 'LAST_LOCATION', 'LAST_SEEN')
+
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+DiffResult = tuple[list[dict], list[dict], list[dict]]
+
+
+def _movement(idcode: str, from_location_id, to_location_id) -> dict:
+	return {
+		'object_idcode': idcode,
+		'from_location_id': from_location_id,
+		'to_location_id': to_location_id,
+		'timestamp': datetime.now(),
+	}
+
+
+def diff_objects_python(objects: list[dict], existing: Sequence[Any]) -> DiffResult:
+	"""`existing`: linhas com idcode, location_id e os campos de timestamp."""
+	existing_map = {row.idcode: row for row in existing}
+
+	to_insert, to_update, movements_to_insert = [], [], []
+
+	for obj in objects:
+		new_data = normalize_object(obj)
+		if new_data is None:
+			continue
+		idcode = new_data['idcode']
+
+		db_obj = existing_map.get(idcode)
+		if not db_obj:
+			to_insert.append(new_data)
+		else:
+			changed = False
+			location_changed = db_obj.location_id != new_data['location_id']
+
+			for field in TIMESTAMP_FIELDS:
+				if not dt_equal(getattr(db_obj, field), new_data[field]):
+					logging.info(
+						f'UPDATE idcode={idcode} campo={field}: db={getattr(db_obj, field)} input={new_data[field]}',
+						extra={'sample': 'object_update'},
+					)
+					changed = True
+					break
+
+			if changed:
+				to_update.append(new_data)
+
+				if location_changed:
+					movements_to_insert.append(
+						_movement(idcode, db_obj.location_id, new_data['location_id'])
+					)
+
+	return to_insert, to_update, movements_to_insert
+
+
+def _seconds(values: list) -> 'np.ndarray':
+	"""
+	Timestamps -> int64 em segundos, ignorando microsegundos e tz como o dt_equal.
+	Aceita strings ISO (feed do Xtrack e colunas lidas como texto) ou datetimes.
+	Ausentes/inválidos viram NaT (menor int64), então dois ausentes são iguais.
+	"""
+	sample = next((value for value in values if value), None)
+	if isinstance(sample, datetime):
+		return _datetime_seconds(values)
+
+	keys = [value[:19] if value else '' for value in values]
+	try:
+		array = np.array(keys, dtype='datetime64[s]')
+	except ValueError:
+		array = np.array([_parse_or_nat(key) for key in keys], dtype='datetime64[s]')
+	return array.view('int64')
+
+
+def _parse_or_nat(key: str) -> 'np.datetime64':
+	try:
+		return np.datetime64(key, 's')
+	except ValueError:
+		return np.datetime64('NaT', 's')
+
+
+def _datetime_seconds(values: list) -> 'np.ndarray':
+	nat = np.datetime64('NaT', 's').view('int64')
+	return np.fromiter(
+		(
+			(value.toordinal() - EPOCH_ORDINAL) * 86400
+			+ value.hour * 3600
+			+ value.minute * 60
+			+ value.second
+			if value
+			else nat
+			for value in values
+		),
+		dtype='int64',
+		count=len(values),
+	)
+
+
+def _int_array(values: list) -> 'np.ndarray':
+	return np.fromiter(map(int, values), dtype='int64', count=len(values))
+
+
+def diff_objects_numpy(objects: list[dict], existing: Sequence[Any]) -> DiffResult:
+	"""Mesmo resultado do diff_objects_python, com as comparações vetorizadas."""
+	objects = [obj for obj in objects if (obj.get('DESCRIPTION') or '').lower().startswith('fb')]
+	if not objects:
+		return [], [], []
+
+	incoming_locations = _int_array([obj.get('LOCATION_ID') or -1 for obj in objects])
+	incoming_ts = np.stack([_seconds([obj.get(key) for obj in objects]) for key in TIMESTAMP_KEYS])
+
+	exists = np.zeros(len(objects), dtype=bool)
+	changed = np.zeros(len(objects), dtype=bool)
+	moved = np.zeros(len(objects), dtype=bool)
+	db_locations = np.full(len(objects), -1, dtype='int64')
+
+	if len(existing):
+		# Posição de cada idcode recebido nas linhas do banco (-1 = novo)
+		positions = {row.idcode: i for i, row in enumerate(existing)}
+		index = np.fromiter(
+			(positions.get(obj['IDCODE'], -1) for obj in objects),
+			dtype='int64',
+			count=len(objects),
+		)
+		exists = index >= 0
+
+		all_db_locations = _int_array(
+			[-1 if row.location_id is None else row.location_id for row in existing]
+		)
+		all_db_ts = np.stack(
+			[_seconds([getattr(row, field) for row in existing]) for field in TIMESTAMP_FIELDS]
+		)
+
+		db_locations = all_db_locations[index]
+		changed = exists & (incoming_ts != all_db_ts[:, index]).any(axis=0)
+		moved = changed & (incoming_locations != db_locations)
+
+	to_insert = [normalize_object(objects[i]) for i in np.flatnonzero(~exists)]
+	to_update = [normalize_object(objects[i]) for i in np.flatnonzero(changed)]
+	movements_to_insert = [
+		_movement(
+			objects[i]['IDCODE'],
+			None if db_locations[i] == -1 else int(db_locations[i]),
+			None if incoming_locations[i] == -1 else int(incoming_locations[i]),
+		)
+		for i in np.flatnonzero(moved)
+	]
+	return to_insert, to_update, movements_to_insert
+
+
+def existing_columns(engine: str) -> list:
+	"""Colunas dos objetos existentes lidas para o diff."""
+	timestamps = [getattr(Objects, field) for field in TIMESTAMP_FIELDS]
+	if engine == 'numpy':
+		# Lidos como texto: evita criar um datetime por valor. Em todos os bancos
+		# suportados o texto começa com 'YYYY-MM-DD HH:MM:SS'.
+		timestamps = [cast(column, String).label(column.key) for column in timestamps]
+	return [Objects.idcode, *timestamps, Objects.location_id]
+
+
+def get_diff_engine(name: str) -> tuple[list, Callable[[list[dict], Sequence[Any]], DiffResult]]:
+	"""Retorna (colunas a buscar, função de diff) do motor configurado."""
+	if name == 'numpy' and not NUMPY_AVAILABLE:
+		logging.warning('XTRACK_DIFF_ENGINE=numpy but numpy is not installed; using python')
+		name = 'python'
+	engine = diff_objects_numpy if name == 'numpy' else diff_objects_python
+	return existing_columns(name), engine
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+from app.models.xtrack import Objects
+
+TIMESTAMP_KEYS = ('LAST_MODIFIED', 'LAST_LOCATION', 'LAST_SEEN')
+
+
+def timestamp_key(value) -> str:
+	"""Timestamp com precisão de segundos, sem tz (mesmo critério do dt_equal)."""
+	if not value:
+		return ''
+	if isinstance(value, datetime):
+		return value.strftime('%Y-%m-%d %H:%M:%S')
+	return value.replace('T', ' ')[:19]
+
+
+def _id_key(value) -> str:
+	return '' if value is None else str(value)
+
+
+def fingerprint(
+	active: bool,
+	location_id,
+	description,
+	home_location_id,
+	last_modified,
+	last_location,
+	last_seen,
+) -> int:
+	"""Hash de 64 bits do registro normalizado."""
+	key = '\x1f'.join(
+		(
+			'1' if active else '0',
+			_id_key(location_id),
+			description or '',
+			_id_key(home_location_id),
+			timestamp_key(last_modified),
+			timestamp_key(last_location),
+			timestamp_key(last_seen),
+		)
+	)
+	return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class ObjectHashIndex:
+	"""
+	Mapa idcode -> hash do último registro salvo.
+
+	Objetos do feed com o mesmo hash são descartados antes de qualquer SQL
+	ou parse de datas. Limitado a `max_size` entradas (LRU): um idcode
+	despejado apenas volta a passar pelo diff no banco.
+	"""
+
+	def __init__(self, max_size: int = 500_000):
+		self.max_size = max_size
+		self._hashes: OrderedDict[str, int] = OrderedDict()
+
+	@property
+	def enabled(self) -> bool:
+		return self.max_size > 0
+
+	def __len__(self) -> int:
+		return len(self._hashes)
+
+	@staticmethod
+	def hash_record(obj: dict) -> int:
+		"""Hash de um objeto no formato do Xtrack (strings cruas)."""
+		return fingerprint(
+			obj.get('ACTIVE') == '1',
+			obj.get('LOCATION_ID') or None,
+			obj.get('DESCRIPTION'),
+			obj.get('HOME_LOCATION_ID') or None,
+			*(obj.get(key) for key in TIMESTAMP_KEYS),
+		)
+
+	def changed(self, objects: list[dict]) -> tuple[list[dict], dict[str, int]]:
+		"""
+		Retorna (objetos com hash diferente ou desconhecido, hashes pendentes).
+		Os hashes só devem ser gravados com `commit` depois do commit no banco.
+		"""
+		if not self.enabled:
+			return objects, {}
+
+		changed, pending = [], {}
+		for obj in objects:
+			idcode = obj['IDCODE']
+			value = self.hash_record(obj)
+			if self._hashes.get(idcode) == value:
+				self._hashes.move_to_end(idcode)
+				continue
+			changed.append(obj)
+			pending[idcode] = value
+		return changed, pending
+
+	def commit(self, objects: list[dict], pending: dict[str, int]) -> None:
+		for obj in objects:
+			value = pending.get(obj['IDCODE'])
+			if value is not None:
+				self._store(obj['IDCODE'], value)
+
+	def _store(self, idcode: str, value: int) -> None:
+		self._hashes[idcode] = value
+		self._hashes.move_to_end(idcode)
+		while len(self._hashes) > self.max_size:
+			self._hashes.popitem(last=False)
+
+	def clear(self) -> None:
+		self._hashes.clear()
+
+	def warm(self, session) -> int:
+		"""Carrega os hashes do estado atual do banco (até `max_size` objetos)."""
+		self.clear()
+		if not self.enabled:
+			return 0
+
+		query = (
+			session.query(
+				Objects.idcode,
+				Objects.active,
+				Objects.location_id,
+				Objects.description,
+				Objects.home_location_id,
+				Objects.last_modified,
+				Objects.last_location,
+				Objects.last_seen,
+			)
+			.order_by(Objects.updated_at)
+			.yield_per(10_000)
+		)
+		for row in query:
+			self._store(row.idcode, fingerprint(*row[1:]))
+		logging.info(f'Object hash index warmed: {len(self._hashes)} objects')
+		return len(self._hashes)
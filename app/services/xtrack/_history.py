@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+
+class InvalidCursor(ValueError):
+	pass
+
+
+def encode_cursor(created_at: datetime, movement_id: int) -> str:
+	raw = f'{created_at.isoformat()}|{movement_id}'.encode('utf-8')
+	return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+	try:
+		raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+		created_at, movement_id = raw.rsplit('|', 1)
+		return datetime.fromisoformat(created_at), int(movement_id)
+	except Exception as e:
+		raise InvalidCursor(f'Invalid cursor: {cursor}') from e
+
+
+async def export_movements(
+	manager, filters: dict, after: tuple[datetime, int] | None, batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+	"""
+	Histórico completo em NDJSON, uma página keyset por vez.
+	Cada página usa uma sessão curta, então a exportação de meses de
+	histórico não segura uma transação nem carrega tudo na memória.
+	"""
+	while True:
+		success, page = await manager.get_movements_async(after=after, limit=batch_size, **filters)
+		if not success:
+			yield json.dumps({'error': page}).encode('utf-8') + b'\n'
+			return
+
+		items = page['items']
+		if items:
+			yield b''.join(
+				json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+				for item in items
+			)
+		if page['next_cursor'] is None:
+			return
+		after = decode_cursor(page['next_cursor'])
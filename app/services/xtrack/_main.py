@@ -1,17 +1,51 @@
 from app.models.xtrack import Locations, Objects, Movements
-from app.db import setup_database
-
-from smartx_rfid.api import ApiXtrack
+from app.db import AsyncDatabase, setup_async_database, setup_database, setup_read_database
+from ._stats import LocationStats
+from ._delta import DeltaTracker
+from ._hashes import ObjectHashIndex
+from ._api import XtrackApi
+from ._diff import get_diff_engine
+from ._history import encode_cursor
+from ._queries import movements_page
+from . import _retention as retention
+from ._records import normalize_object
+from ._writer import DbWriter
+from . import _upsert as upsert
+
+import asyncio
 import logging
+from collections import Counter, defaultdict
+from contextlib import nullcontext
 from app.core import settings
 from smartx_rfid.db import DatabaseManager
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Callable
+import time
+
+# Reconcile descartado por commits concorrentes é refeito algumas vezes
+RECONCILE_ATTEMPTS = 5
+RECONCILE_RETRY_DELAY = 0.05
 
 
 class XtackManager:
 	def __init__(self, url: str):
-		self.api = ApiXtrack(url)
+		self.api = XtrackApi(url, retries=settings.XTRACK_FETCH_RETRIES)
 		self.db_manager: DatabaseManager | None = None
+		# Pool somente leitura para as consultas do dashboard (None = usa o db_manager)
+		self.read_db: DatabaseManager | None = None
+		# AsyncEngine das rotas de leitura (None = pool de leitura em thread)
+		self.async_db: AsyncDatabase | None = None
+		# Todas as escritas dos syncs passam por uma única thread
+		self.writer = DbWriter(settings.DB_WRITE_QUEUE_SIZE, name='xtrack-db-writer')
+		self.stats = LocationStats()
+		self.delta = DeltaTracker(full_sync_interval=settings.XTRACK_FULL_SYNC_INTERVAL)
+		self.hashes = ObjectHashIndex(settings.XTRACK_HASH_INDEX_SIZE)
+		self._existing_columns, self._diff_engine = get_diff_engine(settings.XTRACK_DIFF_ENGINE)
+		self._listeners: list[Callable[[], None]] = []
+		self.sync_metrics: dict[str, dict] = {}
+		# Acumulado desde o início, para medir as alterações de um ciclo inteiro
+		self.sync_totals: defaultdict[str, Counter] = defaultdict(Counter)
+		self._reconcile_task: asyncio.Future | None = None
 		self.load_database()
 
 	def load_database(self):
@@ -22,6 +56,9 @@ class XtackManager:
 				self.db_manager: DatabaseManager = setup_database(
 					database_url=settings.DATABASE_URL
 				)
+				self.load_read_database()
+				self.reconcile_stats()
+				self.warm_hash_index()
 				return True
 			else:
 				logging.warning('DATABASE_URL not set. Skipping Database Integration setup.')
@@ -30,231 +67,608 @@ class XtackManager:
 			logging.error(f'Error setting up Database Integration: {e}')
 			return False
 
-	def save_locations(self, locations: list[dict]) -> tuple[bool, str]:
-		if not self.db_manager:
-			return False, 'Database manager not initialized.'
+	def load_read_database(self) -> None:
+		self.read_db = self.async_db = None
+		if settings.DATABASE_READ_POOL_SIZE <= 0:
+			return
+		try:
+			self.read_db = setup_read_database(
+				settings.DATABASE_URL, pool_size=settings.DATABASE_READ_POOL_SIZE
+			)
+		except Exception as e:
+			logging.warning(f'Read-only pool unavailable, reads use the write pool: {e}')
+		if settings.DATABASE_ASYNC_READS:
+			try:
+				self.async_db = setup_async_database(
+					settings.DATABASE_URL, pool_size=settings.DATABASE_READ_POOL_SIZE
+				)
+			except Exception as e:
+				logging.warning(f'Async read engine unavailable, reads run in threads: {e}')
+
+	def read_session(self):
+		"""Sessão para consultas: pool somente leitura, quando disponível."""
+		return (self.read_db or self.db_manager).get_session()
+
+	async def read_async(self, func: Callable, *args):
+		"""
+		Executa `func(session, *args)` de leitura sem ocupar o executor padrão:
+		no AsyncEngine quando disponível, senão no pool de leitura em thread.
+		"""
+		if self.async_db:
+			async with self.async_db.session() as session:
+				return await session.run_sync(func, *args)
+
+		def call():
+			with self.read_session() as session:
+				return func(session, *args)
+
+		return await asyncio.to_thread(call)
+
+	def close(self) -> None:
+		self.writer.close()
+		if self.async_db and self.async_db.engine is not None:
+			self.async_db.engine.sync_engine.dispose(close=False)
+		if self.read_db:
+			self.read_db.close()
+		if self.db_manager:
+			self.db_manager.close()
+
+	def add_listener(self, callback: Callable[[], None]) -> None:
+		"""Registra um callback chamado após cada commit que altera os dados."""
+		self._listeners.append(callback)
+
+	def _notify_change(self) -> None:
+		for callback in self._listeners:
+			try:
+				callback()
+			except Exception as e:
+				logging.error(f'Error notifying Xtrack change listener: {e}')
+
+	@staticmethod
+	def _today() -> datetime:
+		return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+	def reconcile_stats(self) -> bool:
+		"""Reconstrói os contadores por local a partir de Objects/Movements."""
+		for attempt in range(RECONCILE_ATTEMPTS):
+			if attempt:
+				time.sleep(RECONCILE_RETRY_DELAY)
+			with self.read_session() as session:
+				if self.stats.reconcile(session, self._today()):
+					self._notify_change()
+					logging.info(
+						f'Location stats reconciled: {len(self.stats.location_names)} locations'
+					)
+					return True
+		logging.warning('Location stats reconcile skipped: concurrent writes, will retry')
+		return False
+
+	async def _reconcile_stats_async(self, today: datetime) -> bool:
+		for attempt in range(RECONCILE_ATTEMPTS):
+			if attempt:
+				await asyncio.sleep(RECONCILE_RETRY_DELAY)
+			if await self.read_async(self.stats.reconcile, today):
+				self._notify_change()
+				return True
+		logging.warning('Location stats reconcile skipped: concurrent writes, will retry')
+		return False
 
-		if not locations:
-			return True, 'No locations to process.'
+	async def reconcile_stats_async(self, today: datetime) -> bool:
+		"""Reconcile pelo AsyncEngine; chamadas simultâneas aguardam a mesma execução."""
+		task = self._reconcile_task
+		if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+			task = self._reconcile_task = asyncio.ensure_future(self._reconcile_stats_async(today))
+		return await asyncio.shield(task)
+
+	def warm_hash_index(self) -> None:
+		try:
+			with self.read_session() as session:
+				self.hashes.warm(session)
+		except Exception as e:
+			self.hashes.clear()
+			logging.error(f'Error warming object hash index: {e}')
+
+	@staticmethod
+	def _chunks(items: list, size: int):
+		size = max(int(size or 1), 1)
+		for start in range(0, len(items), size):
+			yield items[start : start + size]
+
+	def _record_metrics(self, name: str, started: float, **counters) -> dict:
+		"""Guarda as métricas da última execução de save_<name>."""
+		elapsed = time.monotonic() - started
+		metrics = {
+			**counters,
+			'elapsed': round(elapsed, 3),
+			'finished_at': datetime.now().isoformat(),
+		}
+		self.sync_metrics[name] = metrics
+		self.sync_totals[name].update(
+			{key: value for key, value in counters.items() if isinstance(value, int)}
+		)
+		return metrics
+
+	@property
+	def dialect(self) -> str:
+		"""Dialeto do banco de escrita (ex.: 'sqlite', 'postgresql'); vazio sem banco."""
+		if self.db_manager is None:
+			return ''
+		return self.db_manager.get_connection_info().get('database_type', '')
+
+	def _use_upsert(self) -> bool:
+		if not settings.XTRACK_UPSERT:
+			return False
+		if upsert.supports_upsert(self.dialect):
+			return True
+		logging.warning(f'XTRACK_UPSERT not supported for {self.dialect}; using diff path')
+		return False
+
+	def _upsert_locations(self, locations: list[dict]) -> tuple[bool, str]:
+		started = time.monotonic()
+		dialect = self.dialect
+		rows = [{'id': int(loc['ID']), 'name': loc.get('NAME')} for loc in locations]
+		chunks = list(self._chunks(rows, settings.DB_CHUNK_SIZE))
+		affected = committed = 0
 
 		with self.db_manager.get_session() as session:
 			try:
-				# Normaliza IDs para int
-				ids = [int(loc['ID']) for loc in locations]
+				for chunk in chunks:
+					affected += upsert.upsert_locations(session, chunk, dialect)
+					session.commit()
+					self.stats.set_locations(chunk)
+					committed += 1
+
+				logging.info(f'Locations upserted: {affected} rows affected')
+				return True, f'{affected} upserted'
 
-				# Busca existentes (id + name)
-				existing = (
-					session.query(Locations.id, Locations.name).filter(Locations.id.in_(ids)).all()
+			except Exception as e:
+				session.rollback()
+				logging.error(
+					f'Error upserting locations (chunk {committed + 1}/{len(chunks)}): {e}'
 				)
+				return False, str(e)
 
-				# Mapeia para dict {id: name}
-				existing_map = {row.id: row.name for row in existing}
+			finally:
+				if affected:
+					self._notify_change()
+				self._record_metrics(
+					'locations',
+					started,
+					received=len(locations),
+					chunks=len(chunks),
+					chunks_committed=committed,
+					upserted=affected,
+				)
 
-				to_insert = []
-				to_update = []
+	def _upsert_objects(
+		self, objects: list[dict], pending_hashes: dict[str, int], received: int
+	) -> tuple[bool, str]:
+		started = time.monotonic()
+		dialect = self.dialect
+		chunks = list(self._chunks(objects, settings.DB_CHUNK_SIZE))
+		affected = moved = committed = 0
 
-				for loc in locations:
-					loc_id = int(loc['ID'])
-					loc_name = loc.get('NAME')
+		with self.db_manager.get_session() as session:
+			try:
+				for index, chunk in enumerate(chunks, start=1):
+					chunk_started = time.monotonic()
+					rows = [row for row in map(normalize_object, chunk) if row is not None]
+					if rows:
+						now = Objects.get_brazil_time()
+						# Movimentações primeiro: comparam com o estado anterior ao upsert
+						moved += upsert.insert_movements(session, rows, dialect, now)
+						affected += upsert.upsert_objects(session, rows, dialect, now)
+						session.commit()
+					self.hashes.commit(chunk, pending_hashes)
+					committed += 1
+					logging.info(
+						f'Objects chunk {index}/{len(chunks)} upserted in '
+						f'{time.monotonic() - chunk_started:.3f}s'
+					)
+
+				logging.info(f'Objects upserted: {affected} rows affected, {moved} movements')
+				return True, f'{affected} upserted, {moved} movements'
+
+			except Exception as e:
+				session.rollback()
+				logging.error(f'Error upserting objects (chunk {committed + 1}/{len(chunks)}): {e}')
+				return False, str(e)
+
+			finally:
+				# Os deltas por local não voltam do banco: recalcula os contadores
+				if affected or moved:
+					self.reconcile_stats()
+				self._record_metrics(
+					'objects',
+					started,
+					received=received,
+					unchanged=received - len(objects),
+					chunks=len(chunks),
+					chunks_committed=committed,
+					upserted=affected,
+					movements=moved,
+				)
 
-					if loc_id not in existing_map:
-						to_insert.append({'id': loc_id, 'name': loc_name})
-					else:
-						db_name = existing_map[loc_id]
+	def _diff_locations(self, session, locations: list[dict]) -> tuple[list[dict], list[dict]]:
+		# Normaliza IDs para int
+		ids = [int(loc['ID']) for loc in locations]
 
-						# evita update desnecessário por None vs ""
-						if (db_name or '') != (loc_name or ''):
-							to_update.append({'id': loc_id, 'name': loc_name})
+		# Busca existentes (id + name)
+		existing = session.query(Locations.id, Locations.name).filter(Locations.id.in_(ids)).all()
 
-				if to_insert:
-					session.bulk_insert_mappings(Locations, to_insert)
+		# Mapeia para dict {id: name}
+		existing_map = {row.id: row.name for row in existing}
 
-				if to_update:
-					session.bulk_update_mappings(Locations, to_update)
+		to_insert = []
+		to_update = []
 
-				session.commit()
+		for loc in locations:
+			loc_id = int(loc['ID'])
+			loc_name = loc.get('NAME')
 
-				logging.info(
-					f'Locations saved: {len(to_insert)} inserted, {len(to_update)} updated'
-				)
-				return True, f'{len(to_insert)} inserted, {len(to_update)} updated'
+			if loc_id not in existing_map:
+				to_insert.append({'id': loc_id, 'name': loc_name})
+			else:
+				db_name = existing_map[loc_id]
+
+				# evita update desnecessário por None vs ""
+				if (db_name or '') != (loc_name or ''):
+					to_update.append({'id': loc_id, 'name': loc_name})
+
+		return to_insert, to_update
+
+	def save_locations(self, locations: list[dict]) -> tuple[bool, str]:
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+
+		if not locations:
+			return True, 'No locations to process.'
+
+		if self._use_upsert():
+			return self._upsert_locations(locations)
+
+		started = time.monotonic()
+		chunks = list(self._chunks(locations, settings.DB_CHUNK_SIZE))
+		inserted = updated = committed = 0
+
+		with self.db_manager.get_session() as session:
+			try:
+				# Um commit por lote: respeita o limite de parâmetros do driver
+				# e não segura uma única transação longa de escrita
+				for index, chunk in enumerate(chunks, start=1):
+					chunk_started = time.monotonic()
+					to_insert, to_update = self._diff_locations(session, chunk)
+
+					if to_insert:
+						session.bulk_insert_mappings(Locations, to_insert)
+
+					if to_update:
+						session.bulk_update_mappings(Locations, to_update)
+
+					session.commit()
+					self.stats.set_locations(to_insert + to_update)
+					committed += 1
+					inserted += len(to_insert)
+					updated += len(to_update)
+					logging.info(
+						f'Locations chunk {index}/{len(chunks)}: {len(to_insert)} inserted, '
+						f'{len(to_update)} updated in {time.monotonic() - chunk_started:.3f}s'
+					)
+
+				logging.info(f'Locations saved: {inserted} inserted, {updated} updated')
+				return True, f'{inserted} inserted, {updated} updated'
 
 			except Exception as e:
 				session.rollback()
-				logging.error(f'Error saving locations: {e}')
+				logging.error(f'Error saving locations (chunk {committed + 1}/{len(chunks)}): {e}')
 				return False, str(e)
 
+			finally:
+				if inserted or updated:
+					self._notify_change()
+				self._record_metrics(
+					'locations',
+					started,
+					received=len(locations),
+					chunks=len(chunks),
+					chunks_committed=committed,
+					inserted=inserted,
+					updated=updated,
+				)
+
+	def _diff_objects(
+		self, session, objects: list[dict]
+	) -> tuple[list[dict], list[dict], list[dict]]:
+		idcodes = [obj['IDCODE'] for obj in objects]
+
+		# Busca existentes de uma vez
+		existing = session.query(*self._existing_columns).filter(Objects.idcode.in_(idcodes)).all()
+
+		return self._diff_engine(objects, existing)
+
 	def save_objects(self, objects: list[dict]) -> tuple[bool, str]:
 		if not self.db_manager:
 			return False, 'Database manager not initialized.'
 		if not objects:
 			return True, 'No objects to process.'
 
-		def parse_dt(val):
-			if not val:
-				return None
-			if isinstance(val, str):
-				try:
-					return datetime.fromisoformat(val)
-				except Exception:
-					return None
-			return val
-
-		def dt_equal(a, b):
-			"""Compara datetimes ignorando microsegundos e tz"""
-			if a is None and b is None:
-				return True
-			if a is None or b is None:
-				return False
-			return a.replace(tzinfo=None, microsecond=0) == b.replace(tzinfo=None, microsecond=0)
+		# Descarta, sem tocar no banco, os objetos idênticos ao último save
+		received = len(objects)
+		objects, pending_hashes = self.hashes.changed(objects)
+		if not objects:
+			self._record_metrics('objects', time.monotonic(), received=received, unchanged=received)
+			return True, 'No objects changed.'
+
+		if self._use_upsert():
+			return self._upsert_objects(objects, pending_hashes, received)
+
+		started = time.monotonic()
+		chunks = list(self._chunks(objects, settings.DB_CHUNK_SIZE))
+		inserted = updated = moved = committed = 0
 
 		with self.db_manager.get_session() as session:
 			try:
-				idcodes = [obj['IDCODE'] for obj in objects]
-
-				# Busca existentes de uma vez
-				existing = (
-					session.query(
-						Objects.idcode,
-						Objects.last_modified,
-						Objects.last_location,
-						Objects.last_seen,
-						Objects.location_id,
+				# Um commit por lote: IN() limitado ao tamanho do lote e transações
+				# curtas, para não bloquear as leituras do dashboard
+				for index, chunk in enumerate(chunks, start=1):
+					chunk_started = time.monotonic()
+					to_insert, to_update, movements_to_insert = self._diff_objects(session, chunk)
+
+					if to_insert:
+						session.bulk_insert_mappings(Objects, to_insert)
+					if to_update:
+						session.bulk_update_mappings(Objects, to_update)
+					if movements_to_insert:
+						session.bulk_insert_mappings(Movements, movements_to_insert)
+
+					# Sem o lock durante o commit: um reconcile concorrente é descartado
+					with self.stats.committing():
+						session.commit()
+						self.stats.apply_objects(to_insert, movements_to_insert)
+					self.hashes.commit(chunk, pending_hashes)
+					committed += 1
+					inserted += len(to_insert)
+					updated += len(to_update)
+					moved += len(movements_to_insert)
+					logging.info(
+						f'Objects chunk {index}/{len(chunks)}: {len(to_insert)} inserted, '
+						f'{len(to_update)} updated in {time.monotonic() - chunk_started:.3f}s'
 					)
-					.filter(Objects.idcode.in_(idcodes))
-					.all()
-				)
 
-				existing_map = {row.idcode: row for row in existing}
-
-				to_insert, to_update, movements_to_insert = [], [], []
-
-				for obj in objects:
-					idcode = obj['IDCODE']
-					new_data = {
-						'idcode': idcode,
-						'active': obj.get('ACTIVE') == '1',
-						'location_id': int(obj['LOCATION_ID']) if obj.get('LOCATION_ID') else None,
-						'description': obj.get('DESCRIPTION'),
-						'last_seen': parse_dt(obj.get('LAST_SEEN')),
-						'home_location_id': int(obj['HOME_LOCATION_ID'])
-						if obj.get('HOME_LOCATION_ID')
-						else None,
-						'last_modified': parse_dt(obj.get('LAST_MODIFIED')),
-						'last_location': parse_dt(obj.get('LAST_LOCATION')),
-					}
-					if not new_data.get('description').lower().startswith('fb'):
-						continue
-
-					db_obj = existing_map.get(idcode)
-					if not db_obj:
-						to_insert.append(new_data)
-					else:
-						changed = False
-						location_changed = db_obj.location_id != new_data['location_id']
-
-						for field in ['last_modified', 'last_location', 'last_seen']:
-							if not dt_equal(getattr(db_obj, field), new_data[field]):
-								logging.info(
-									f'UPDATE idcode={idcode} campo={field}: db={getattr(db_obj, field)} input={new_data[field]}'
-								)
-								changed = True
-								break
-
-						if changed:
-							to_update.append(new_data)
-
-							if location_changed:
-								movements_to_insert.append(
-									{
-										'object_idcode': idcode,
-										'from_location_id': db_obj.location_id,
-										'to_location_id': new_data['location_id'],
-										'timestamp': datetime.now(),
-									}
-								)
-
-				if to_insert:
-					session.bulk_insert_mappings(Objects, to_insert)
-				if to_update:
-					session.bulk_update_mappings(Objects, to_update)
-				if movements_to_insert:
-					session.bulk_insert_mappings(Movements, movements_to_insert)
-
-				session.commit()
-				logging.info(f'Objects saved: {len(to_insert)} inserted, {len(to_update)} updated')
-				return True, f'{len(to_insert)} inserted, {len(to_update)} updated'
+				logging.info(f'Objects saved: {inserted} inserted, {updated} updated')
+				return True, f'{inserted} inserted, {updated} updated'
 
 			except Exception as e:
 				session.rollback()
-				logging.error(f'Error saving objects: {e}')
+				logging.error(f'Error saving objects (chunk {committed + 1}/{len(chunks)}): {e}')
 				return False, str(e)
 
-	def get_info(self):
-		with self.db_manager.get_session() as session:
-			try:
-				locations_count = session.query(Locations).count()
-				objects_in_locations = {
-					loc.name: session.query(Objects).filter(Objects.location_id == loc.id).count()
-					for loc in session.query(Locations).all()
-				}
-				objects_in_locations = {
-					k: v
-					for k, v in objects_in_locations.items()
-					if k is not None and k.startswith('[')
-				}
-				# Ordena por ordem alfabética das chaves
-				objects_in_locations = dict(sorted(objects_in_locations.items()))
-				objects_count = sum(objects_in_locations.values())
-
-				movements_count = session.query(Movements).count()
-				movements_today = (
-					session.query(Movements)
-					.filter(
-						Movements.created_at
-						>= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-					)
-					.count()
+			finally:
+				if inserted or updated:
+					self._notify_change()
+				self._record_metrics(
+					'objects',
+					started,
+					received=received,
+					unchanged=received - len(objects),
+					chunks=len(chunks),
+					chunks_committed=committed,
+					inserted=inserted,
+					updated=updated,
+					movements=moved,
 				)
-				# Movimentos de hoje por local (entradas e saídas)
-				today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-				movements_entries_today = {
-					loc.name: session.query(Movements)
-					.filter(Movements.to_location_id == loc.id, Movements.created_at >= today)
-					.count()
-					for loc in session.query(Locations).all()
-				}
-				movements_entries_today = {k: v for k, v in movements_entries_today.items()}
-
-				movements_exits_today = {
-					loc.name: session.query(Movements)
-					.filter(Movements.from_location_id == loc.id, Movements.created_at >= today)
-					.count()
-					for loc in session.query(Locations).all()
-				}
-				movements_exits_today = {k: v for k, v in movements_exits_today.items() if v > 0}
-				# AVAILABLE
-				available_in_almox = objects_in_locations.get(
-					'[ALMOX] Entrada', 0
-				) + objects_in_locations.get('[ALMOX] Saida', 0)
-
-				available_in_artur_alvin = objects_in_locations.get('[Artur Alvim] Recebimento', 0)
-
-				available_screening = objects_in_locations.get('[GRU] Recebimento', 0)
-
-				return True, {
-					'xtrack_url': self.api.base_url,
-					'locations_count': locations_count,
-					'objects_count': objects_count,
-					'objects_in_locations': objects_in_locations,
-					'movements_count': movements_count,
-					'movements_today': movements_today,
-					'movements_entries_today': movements_entries_today,
-					'movements_exits_today': movements_exits_today,
-					'available_in_almox': available_in_almox,
-					'available_in_artur_alvin': available_in_artur_alvin,
-					'available_screening': available_screening,
-				}
-			except Exception as e:
-				logging.error(f'Error getting Xtrack info: {e}')
-				return False, str(e)
+
+	def get_info(self):
+		try:
+			today = self._today()
+			if not self.stats.is_current(today):
+				self.reconcile_stats()
+			return True, self._info_payload()
+		except Exception as e:
+			logging.error(f'Error getting Xtrack info: {e}')
+			return False, str(e)
+
+	async def get_info_async(self):
+		"""get_info para as rotas: a reconciliação do dia, se houver, vai pelo AsyncEngine."""
+		if not self.async_db:
+			return await asyncio.to_thread(self.get_info)
+		try:
+			today = self._today()
+			if not self.stats.is_current(today):
+				await self.reconcile_stats_async(today)
+			return True, self._info_payload()
+		except Exception as e:
+			logging.error(f'Error getting Xtrack info: {e}')
+			return False, str(e)
+
+	def _info_payload(self) -> dict:
+		stats = self.stats.snapshot()
+
+		locations = stats['location_names']
+		objects_in_locations = {
+			name: stats['objects'].get(loc_id, 0) for loc_id, name in locations.items()
+		}
+		objects_in_locations = {
+			k: v for k, v in objects_in_locations.items() if k is not None and k.startswith('[')
+		}
+		# Ordena por ordem alfabética das chaves
+		objects_in_locations = dict(sorted(objects_in_locations.items()))
+		objects_count = sum(objects_in_locations.values())
+
+		# Movimentos de hoje por local (entradas e saídas)
+		movements_entries_today = {
+			name: stats['entries_today'].get(loc_id, 0) for loc_id, name in locations.items()
+		}
+
+		movements_exits_today = {
+			name: stats['exits_today'].get(loc_id, 0) for loc_id, name in locations.items()
+		}
+		movements_exits_today = {k: v for k, v in movements_exits_today.items() if v > 0}
+		# AVAILABLE
+		available_in_almox = objects_in_locations.get(
+			'[ALMOX] Entrada', 0
+		) + objects_in_locations.get('[ALMOX] Saida', 0)
+
+		available_in_artur_alvin = objects_in_locations.get('[Artur Alvim] Recebimento', 0)
+
+		available_screening = objects_in_locations.get('[GRU] Recebimento', 0)
+
+		return {
+			'xtrack_url': self.api.base_url,
+			'locations_count': len(locations),
+			'objects_count': objects_count,
+			'objects_in_locations': objects_in_locations,
+			'movements_count': stats['movements_count'],
+			'movements_today': stats['movements_today'],
+			'movements_entries_today': movements_entries_today,
+			'movements_exits_today': movements_exits_today,
+			'available_in_almox': available_in_almox,
+			'available_in_artur_alvin': available_in_artur_alvin,
+			'available_screening': available_screening,
+		}
+
+	def get_movements(
+		self,
+		start: datetime | None = None,
+		end: datetime | None = None,
+		location_id: int | None = None,
+		idcode: str | None = None,
+		after: tuple[datetime, int] | None = None,
+		limit: int = 100,
+	) -> tuple[bool, dict | str]:
+		"""Página do histórico de movimentações, com o cursor da próxima página."""
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+		try:
+			stmt = movements_page(start, end, location_id, idcode, after, limit + 1)
+			with self.read_session() as session:
+				rows = self._fetch_all(session, stmt)
+			return True, self._movements_result(rows, limit)
+		except Exception as e:
+			logging.error(f'Error getting movements: {e}')
+			return False, str(e)
+
+	async def get_movements_async(
+		self,
+		start: datetime | None = None,
+		end: datetime | None = None,
+		location_id: int | None = None,
+		idcode: str | None = None,
+		after: tuple[datetime, int] | None = None,
+		limit: int = 100,
+	) -> tuple[bool, dict | str]:
+		"""get_movements para as rotas, pelo AsyncEngine quando disponível."""
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+		try:
+			stmt = movements_page(start, end, location_id, idcode, after, limit + 1)
+			rows = await self.read_async(self._fetch_all, stmt)
+			return True, self._movements_result(rows, limit)
+		except Exception as e:
+			logging.error(f'Error getting movements: {e}')
+			return False, str(e)
+
+	@staticmethod
+	def _fetch_all(session, stmt) -> list:
+		return session.execute(stmt).all()
+
+	def _movements_result(self, rows: list, limit: int) -> dict:
+		has_more = len(rows) > limit
+		rows = rows[:limit]
+		names = self.stats.location_names
+		items = [
+			{
+				'id': row.id,
+				'object_idcode': row.object_idcode,
+				'from_location_id': row.from_location_id,
+				'from_location': names.get(row.from_location_id),
+				'to_location_id': row.to_location_id,
+				'to_location': names.get(row.to_location_id),
+				'created_at': row.created_at.isoformat(),
+			}
+			for row in rows
+		]
+		next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+		return {'items': items, 'next_cursor': next_cursor}
+
+	def apply_retention(
+		self, retention_days: int, archive_dir: str | None = None
+	) -> tuple[bool, str]:
+		"""Agrega em rollups e remove as movimentações mais antigas que `retention_days`."""
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+
+		horizon = self._today() - timedelta(days=retention_days)
+		removed = 0
+		try:
+			with self.db_manager.get_session() as session:
+				day = retention.oldest_day(session)
+
+			# Um dia por transação
+			while day is not None and day < horizon:
+				# Arquivo publicado só depois do commit do dia
+				archive = retention.DayArchive(archive_dir, day) if archive_dir else nullcontext()
+				with archive as day_archive, self.db_manager.get_session() as session:
+					count = retention.rollup_day(session, day, day_archive)
+					session.commit()
+				if count:
+					logging.info(f'Movements of {day:%Y-%m-%d} rolled up: {count} rows')
+				removed += count
+				day += timedelta(days=1)
+
+			return True, f'{removed} movements rolled up'
+		except Exception as e:
+			logging.error(f'Error applying movements retention: {e}')
+			return False, str(e)
+		finally:
+			if removed:
+				self.reconcile_stats()
+
+	def get_rollups(
+		self,
+		period: str = 'day',
+		start: datetime | None = None,
+		end: datetime | None = None,
+		location_id: int | None = None,
+	) -> tuple[bool, list[dict] | str]:
+		"""Entradas/saídas agregadas das movimentações fora da janela de retenção."""
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+		try:
+			stmt = retention.rollups_query(period, start, end, location_id)
+			with self.read_session() as session:
+				rows = self._fetch_all(session, stmt)
+			return True, self._rollups_result(rows)
+		except Exception as e:
+			logging.error(f'Error getting movement rollups: {e}')
+			return False, str(e)
+
+	async def get_rollups_async(
+		self,
+		period: str = 'day',
+		start: datetime | None = None,
+		end: datetime | None = None,
+		location_id: int | None = None,
+	) -> tuple[bool, list[dict] | str]:
+		if not self.db_manager:
+			return False, 'Database manager not initialized.'
+		try:
+			stmt = retention.rollups_query(period, start, end, location_id)
+			rows = await self.read_async(self._fetch_all, stmt)
+			return True, self._rollups_result(rows)
+		except Exception as e:
+			logging.error(f'Error getting movement rollups: {e}')
+			return False, str(e)
+
+	def _rollups_result(self, rows: list) -> list[dict]:
+		names = self.stats.location_names
+		return [
+			{
+				'bucket_start': row.bucket_start.isoformat(),
+				'location_id': row.location_id,
+				'location': names.get(row.location_id),
+				'entries': row.entries,
+				'exits': row.exits,
+			}
+			for row in rows
+		]
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select
+
+from app.models.xtrack import Movements, Objects
+
+
+def objects_per_location():
+	"""Quantidade de objetos agrupada por local."""
+	return select(Objects.location_id, func.count()).group_by(Objects.location_id)
+
+
+def entries_since(since: datetime):
+	"""Entradas (to_location_id) por local a partir de `since`."""
+	return (
+		select(Movements.to_location_id, func.count())
+		.where(Movements.created_at >= since)
+		.group_by(Movements.to_location_id)
+	)
+
+
+def exits_since(since: datetime):
+	"""Saídas (from_location_id) por local a partir de `since`."""
+	return (
+		select(Movements.from_location_id, func.count())
+		.where(Movements.created_at >= since)
+		.group_by(Movements.from_location_id)
+	)
+
+
+def movements_since(since: datetime):
+	"""Total de movimentações a partir de `since`."""
+	return select(func.count()).select_from(Movements).where(Movements.created_at >= since)
+
+
+def movements_page(
+	start: datetime | None = None,
+	end: datetime | None = None,
+	location_id: int | None = None,
+	idcode: str | None = None,
+	after: tuple[datetime, int] | None = None,
+	limit: int = 100,
+):
+	"""
+	Página do histórico de movimentações em ordem (created_at, id).
+	`after` é o último (created_at, id) da página anterior (paginação keyset).
+	"""
+	stmt = select(
+		Movements.id,
+		Movements.object_idcode,
+		Movements.from_location_id,
+		Movements.to_location_id,
+		Movements.created_at,
+	)
+	if start is not None:
+		stmt = stmt.where(Movements.created_at >= start)
+	if end is not None:
+		stmt = stmt.where(Movements.created_at < end)
+	if location_id is not None:
+		stmt = stmt.where(
+			or_(Movements.from_location_id == location_id, Movements.to_location_id == location_id)
+		)
+	if idcode is not None:
+		stmt = stmt.where(Movements.object_idcode == idcode)
+	if after is not None:
+		created_at, last_id = after
+		stmt = stmt.where(
+			or_(
+				Movements.created_at > created_at,
+				and_(Movements.created_at == created_at, Movements.id > last_id),
+			)
+		)
+	return stmt.order_by(Movements.created_at, Movements.id).limit(limit)
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+
+def parse_dt(val):
+	if not val:
+		return None
+	if isinstance(val, str):
+		try:
+			return datetime.fromisoformat(val)
+		except Exception:
+			return None
+	return val
+
+
+def dt_equal(a, b):
+	"""Compara datetimes ignorando microsegundos e tz"""
+	if a is None and b is None:
+		return True
+	if a is None or b is None:
+		return False
+	return a.replace(tzinfo=None, microsecond=0) == b.replace(tzinfo=None, microsecond=0)
+
+
+def normalize_object(obj: dict) -> dict | None:
+	"""
+	Converte um objeto do Xtrack para as colunas de Objects.
+	Retorna None para objetos fora do escopo do dashboard (descrição vazia ou sem prefixo FB).
+	"""
+	new_data = {
+		'idcode': obj['IDCODE'],
+		'active': obj.get('ACTIVE') == '1',
+		'location_id': int(obj['LOCATION_ID']) if obj.get('LOCATION_ID') else None,
+		'description': obj.get('DESCRIPTION'),
+		'last_seen': parse_dt(obj.get('LAST_SEEN')),
+		'home_location_id': int(obj['HOME_LOCATION_ID']) if obj.get('HOME_LOCATION_ID') else None,
+		'last_modified': parse_dt(obj.get('LAST_MODIFIED')),
+		'last_location': parse_dt(obj.get('LAST_LOCATION')),
+	}
+	if not (new_data['description'] or '').lower().startswith('fb'):
+		return None
+	return new_data
@@ -0,0 +1,172 @@
+"""
+Retenção das movimentações brutas.
+
+Movimentações mais antigas que o horizonte configurado são agregadas em
+MovementRollups (entradas/saídas por local, por hora e por dia) e removidas
+de Movements, um dia por transação. Opcionalmente as linhas brutas são
+arquivadas em NDJSON gzip, publicado só após o commit.
+
+Assim Movements fica limitado à janela de retenção e as contagens antigas
+vêm das rollups.
+"""
+
+import gzip
+import json
+import os
+import shutil
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from app.models.xtrack import MovementRollups, Movements
+
+PERIODS = ('hour', 'day')
+
+
+def _naive(value: datetime) -> datetime:
+	return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def _bucket(created_at: datetime, period: str) -> datetime:
+	created_at = _naive(created_at)
+	if period == 'hour':
+		return created_at.replace(minute=0, second=0, microsecond=0)
+	return created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def oldest_day(session) -> datetime | None:
+	oldest = session.execute(select(func.min(Movements.created_at))).scalar_one_or_none()
+	return _bucket(oldest, 'day') if oldest else None
+
+
+class DayArchive:
+	"""
+	Arquivo NDJSON gzip das movimentações de um dia.
+
+	As linhas vão para um `.tmp` (cópia do arquivo já publicado + um novo
+	membro gzip), que só substitui o arquivo ao sair do `with` sem erro.
+	Envolvendo o commit, uma transação desfeita e repetida não arquiva duas vezes.
+	"""
+
+	def __init__(self, archive_dir: str, day: datetime):
+		self.path = os.path.join(archive_dir, f'movements_{day:%Y-%m-%d}.ndjson.gz')
+		self.tmp_path = f'{self.path}.tmp'
+		self._file = None
+
+	def write(self, record: dict) -> None:
+		if self._file is None:
+			os.makedirs(os.path.dirname(self.path), exist_ok=True)
+			mode = 'wt'
+			if os.path.exists(self.path):
+				shutil.copyfile(self.path, self.tmp_path)
+				mode = 'at'
+			self._file = gzip.open(self.tmp_path, mode, encoding='utf-8')
+		self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+	def __enter__(self) -> 'DayArchive':
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		if self._file is None:
+			return
+		self._file.close()
+		self._file = None
+		if exc_type is None:
+			os.replace(self.tmp_path, self.path)
+		else:
+			os.remove(self.tmp_path)
+
+
+def rollup_day(session, day: datetime, archive: DayArchive | None = None) -> int:
+	"""
+	Agrega e remove as movimentações de `day`. Retorna quantas foram removidas.
+	Não faz commit: o chamador confirma rollups e delete juntos, dentro do
+	`with archive`.
+	"""
+	end = day + timedelta(days=1)
+	window = (Movements.created_at >= day, Movements.created_at < end)
+	entries: Counter = Counter()
+	exits: Counter = Counter()
+	count = 0
+
+	rows = session.execute(
+		select(
+			Movements.id,
+			Movements.object_idcode,
+			Movements.from_location_id,
+			Movements.to_location_id,
+			Movements.created_at,
+		).where(*window),
+		execution_options={'yield_per': 5000},
+	)
+	for row in rows:
+		for period in PERIODS:
+			bucket = _bucket(row.created_at, period)
+			entries[(period, bucket, row.to_location_id)] += 1
+			exits[(period, bucket, row.from_location_id)] += 1
+		if archive is not None:
+			archive.write(
+				{
+					'id': row.id,
+					'object_idcode': row.object_idcode,
+					'from_location_id': row.from_location_id,
+					'to_location_id': row.to_location_id,
+					'created_at': row.created_at.isoformat(),
+				}
+			)
+		count += 1
+
+	if not count:
+		return 0
+
+	rollups = []
+	for key in entries.keys() | exits.keys():
+		period, bucket, location_id = key
+		rollups.append(
+			{
+				'period': period,
+				'bucket_start': bucket,
+				'location_id': location_id,
+				'entries': entries[key],
+				'exits': exits[key],
+			}
+		)
+	session.execute(insert(MovementRollups), rollups)
+	session.execute(delete(Movements).where(*window))
+	return count
+
+
+def archived_movements(session) -> int:
+	"""Total de movimentações já agregadas (cada uma conta uma entrada, inclusive local nulo)."""
+	total = session.execute(
+		select(func.coalesce(func.sum(MovementRollups.entries), 0)).where(
+			MovementRollups.period == 'day'
+		)
+	).scalar_one()
+	return int(total)
+
+
+def rollups_query(
+	period: str,
+	start: datetime | None = None,
+	end: datetime | None = None,
+	location_id: int | None = None,
+):
+	# Um mesmo balde pode ter mais de uma linha (ex.: movimentações atrasadas
+	# agregadas depois): soma por (balde, local)
+	stmt = select(
+		MovementRollups.bucket_start,
+		MovementRollups.location_id,
+		func.sum(MovementRollups.entries).label('entries'),
+		func.sum(MovementRollups.exits).label('exits'),
+	).where(MovementRollups.period == period)
+	if start is not None:
+		stmt = stmt.where(MovementRollups.bucket_start >= start)
+	if end is not None:
+		stmt = stmt.where(MovementRollups.bucket_start < end)
+	if location_id is not None:
+		stmt = stmt.where(MovementRollups.location_id == location_id)
+	return stmt.group_by(MovementRollups.bucket_start, MovementRollups.location_id).order_by(
+		MovementRollups.bucket_start, MovementRollups.location_id
+	)
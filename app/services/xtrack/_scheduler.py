@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import aclosing
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Hashable
+
+from prometheus_client import Counter, Gauge
+
+from app.core import settings
+from ._sync import stream_objects
+
+JOBS = ('locations', 'objects')
+
+SYNC_DURATION = Gauge(
+	'xtrack_sync_duration_seconds', 'Duration of the last Xtrack sync run', ['job']
+)
+SYNC_LAG = Gauge(
+	'xtrack_sync_lag_seconds', 'Seconds since the last successful Xtrack sync', ['job']
+)
+SYNC_RUNS = Counter('xtrack_sync_runs_total', 'Xtrack sync runs', ['job', 'result'])
+SYNC_INTERVAL = Gauge('xtrack_sync_interval_seconds', 'Current Xtrack sync interval')
+
+
+class SyncScheduler:
+	"""
+	Agenda o sync do Xtrack: locais e depois objetos, em um único ciclo.
+
+	- Single-flight por job: um trigger manual durante uma execução aguarda a
+	  execução em andamento em vez de iniciar outra
+	- Locais sempre commitados antes dos objetos
+	- Intervalo adaptativo: diminui quando o ciclo trouxe muitas alterações e
+	  aumenta quando não houve nenhuma, com jitter
+	- Prazo máximo por etapa
+	"""
+
+	def __init__(self, manager):
+		self.manager = manager
+		self.interval: float = settings.XTRACK_SYNC_INTERVAL
+		self._inflight: dict[str, asyncio.Task] = {}
+		self._cycle: asyncio.Task | None = None
+		self.status: dict[str, dict] = {job: {} for job in JOBS}
+		self.next_run_at: float | None = None
+		# GetObject por fatias: desligado se o Xtrack ignorar o filtro
+		self.slices_supported = True
+		self._last_unfiltered: float | None = None
+		self._jobs: dict[str, Callable[[], Awaitable[tuple[bool, dict]]]] = {
+			'locations': self._sync_locations,
+			'objects': self._sync_objects,
+		}
+		for job in JOBS:
+			SYNC_LAG.labels(job).set_function(lambda job=job: self.lag(job))
+
+	def lag(self, job: str) -> float:
+		last_success = self.status[job].get('last_success')
+		return round(time.time() - last_success, 3) if last_success else -1
+
+	# Execução
+	async def run(self, job: str) -> tuple[bool, dict]:
+		"""Executa `job` ou, se já estiver rodando, aguarda a execução em andamento."""
+		task = self._inflight.get(job)
+		if task is None or task.done():
+			task = asyncio.ensure_future(self._run_job(job))
+			self._inflight[job] = task
+		return await asyncio.shield(task)
+
+	async def _run_job(self, job: str) -> tuple[bool, dict]:
+		started = time.monotonic()
+		status = self.status[job]
+		status['running'] = True
+		status['started_at'] = datetime.now().isoformat()
+		try:
+			success, summary = await asyncio.wait_for(
+				self._jobs[job](), timeout=settings.XTRACK_STAGE_TIMEOUT
+			)
+		except asyncio.TimeoutError:
+			success, summary = False, {'error': f'timeout after {settings.XTRACK_STAGE_TIMEOUT}s'}
+			logging.error(f'Xtrack {job} sync exceeded its deadline')
+		except Exception as e:
+			success, summary = False, {'error': str(e)}
+			logging.error(f'Xtrack {job} sync failed: {e}')
+
+		duration = time.monotonic() - started
+		status.update(running=False, success=success, duration=round(duration, 3), summary=summary)
+		if success:
+			status['last_success'] = time.time()
+		SYNC_DURATION.labels(job).set(duration)
+		SYNC_RUNS.labels(job, 'success' if success else 'error').inc()
+		return success, summary
+
+	async def run_cycle(self) -> bool:
+		"""Locais e depois objetos. Trigger manual e loop compartilham o mesmo ciclo."""
+		if self._cycle is None or self._cycle.done():
+			self._cycle = asyncio.ensure_future(self._run_cycle())
+		return await asyncio.shield(self._cycle)
+
+	async def _run_cycle(self) -> bool:
+		locations_ok, _ = await self.run('locations')
+		if not locations_ok and not self.manager.stats.snapshot()['location_names']:
+			# Sem nenhum local conhecido os objetos ficariam sem referência
+			return False
+		objects_ok, summary = await self.run('objects')
+		if objects_ok:
+			self._adapt_interval(summary)
+		return locations_ok and objects_ok
+
+	def trigger(self) -> None:
+		"""Trigger manual: inicia um ciclo agora (ou junta-se ao que está rodando)."""
+		asyncio.ensure_future(self.run_cycle())
+
+	# Agenda
+	def _adapt_interval(self, summary: dict) -> None:
+		changes = summary.get('changes', 0)
+		if changes >= settings.XTRACK_SYNC_BUSY_CHANGES:
+			self.interval = max(settings.XTRACK_SYNC_MIN_INTERVAL, self.interval / 2)
+		elif changes == 0:
+			self.interval = min(settings.XTRACK_SYNC_MAX_INTERVAL, self.interval * 1.5)
+		SYNC_INTERVAL.set(self.interval)
+
+	def next_delay(self) -> float:
+		jitter = settings.XTRACK_SYNC_JITTER
+		return self.interval * random.uniform(1 - jitter, 1 + jitter)
+
+	async def run_forever(self) -> None:
+		while True:
+			planned = time.monotonic()
+			await self.run_cycle()
+			delay = max(0.0, self.next_delay() - (time.monotonic() - planned))
+			self.next_run_at = time.time() + delay
+			await asyncio.sleep(delay)
+
+	def metrics(self) -> dict:
+		return {
+			'interval': round(self.interval, 3),
+			'next_run_at': self.next_run_at,
+			'writer': self.manager.writer.metrics(),
+			'jobs': {job: {**status, 'lag': self.lag(job)} for job, status in self.status.items()},
+		}
+
+	# Etapas
+	async def _sync_locations(self) -> tuple[bool, dict]:
+		manager = self.manager
+		logging.info('Fetching locations from Xtrack...')
+		start_time = datetime.now()
+		success, response = await manager.api.get_locations()
+		api_time = datetime.now()
+		if not success:
+			logging.error(f'Failed to fetch locations: {response}')
+			return False, {'error': response}
+
+		logging.info(f'Locations fetched successfully: {len(response)} locations')
+		saved, message = await manager.writer.run(manager.save_locations, response)
+		save_time = datetime.now()
+		logging.info(f"{'='*30} Locations {'='*30}")
+		logging.info(f'Time taken: API: {api_time - start_time}, Save: {save_time - api_time}')
+		return saved, {'received': len(response), 'message': message}
+
+	async def _sync_objects(self) -> tuple[bool, dict]:
+		manager = self.manager
+		totals_before = self._changes_total()
+		location_ids = list(manager.stats.snapshot()['location_names'])
+		filter_tag = settings.XTRACK_OBJECT_FILTER_TAG
+
+		if filter_tag and location_ids and self._slices_due():
+			# Uma fatia do GetObject por local, baixadas em paralelo
+			logging.info(f'Fetching objects from Xtrack in {len(location_ids)} slices...')
+			success, summary = await stream_objects(
+				manager,
+				use_delta=settings.XTRACK_DELTA_SYNC,
+				source=self._checked_slices(filter_tag, location_ids),
+			)
+			if not self.slices_supported:
+				success, summary = await self._sync_unfiltered()
+		else:
+			success, summary = await self._sync_unfiltered()
+
+		summary['changes'] = self._changes_total() - totals_before
+		logging.info(f"{'='*30} Objects {'='*30}")
+		logging.info(f'Objects sync finished (success={success}): {summary}')
+		return success, summary
+
+	def _slices_due(self) -> bool:
+		"""
+		Fatias só trazem objetos de locais conhecidos: os sem LOCATION_ID (ou de
+		um local ainda não sincronizado) dependem de um GetObject sem filtro, feito
+		a cada XTRACK_FULL_SYNC_INTERVAL.
+		"""
+		return (
+			self.slices_supported
+			and self._last_unfiltered is not None
+			and time.monotonic() - self._last_unfiltered < settings.XTRACK_FULL_SYNC_INTERVAL
+		)
+
+	async def _checked_slices(
+		self, filter_tag: str, location_ids: list
+	) -> AsyncIterator[tuple[Hashable, list[dict]]]:
+		"""Repassa as fatias, interrompendo se alguma trouxer objetos de outro local."""
+		source = self.manager.api.fetch_object_slices(
+			filter_tag, location_ids, concurrency=settings.XTRACK_FETCH_CONCURRENCY
+		)
+		async with aclosing(source):
+			async for value, objects in source:
+				foreign = sum(1 for obj in objects if str(obj.get(filter_tag)) != str(value))
+				if foreign:
+					self.slices_supported = False
+					logging.warning(
+						f'Xtrack ignored the {filter_tag} filter ({foreign} of {len(objects)} '
+						f'objects in slice {value} belong elsewhere): falling back to a single GetObject'
+					)
+					raise RuntimeError(f'{filter_tag} filter not supported by Xtrack')
+				yield value, objects
+
+	async def _sync_unfiltered(self) -> tuple[bool, dict]:
+		if settings.XTRACK_STREAMING:
+			# Download, parse e gravação em lotes, sobrepostos
+			logging.info('Streaming objects from Xtrack...')
+			success, summary = await stream_objects(
+				self.manager,
+				batch_size=settings.XTRACK_BATCH_SIZE,
+				use_delta=settings.XTRACK_DELTA_SYNC,
+			)
+		else:
+			success, summary = await self._fetch_and_save_objects()
+		if success:
+			self._last_unfiltered = time.monotonic()
+		return success, summary
+
+	async def _fetch_and_save_objects(self) -> tuple[bool, dict]:
+		manager = self.manager
+		logging.info('Fetching objects from Xtrack...')
+		start_time = datetime.now()
+		success, response = await manager.api.get_objects()
+		api_time = datetime.now()
+		if not success:
+			logging.error(f'Failed to fetch objects: {response}')
+			return False, {'error': response}
+
+		logging.info(f'Objects fetched successfully: {len(response)} objects')
+		objects, pending, full = response, {}, True
+		if settings.XTRACK_DELTA_SYNC:
+			# Descarta partições sem alteração desde o último sync
+			full = manager.delta.full_sync_due()
+			objects, pending = manager.delta.changed(response, full=full)
+			logging.info(
+				f"Delta sync ({'full' if full else 'incremental'}): "
+				f'{len(pending)} partitions, {len(objects)} objects to save'
+			)
+		saved, message = await manager.writer.run(manager.save_objects, objects)
+		if saved and settings.XTRACK_DELTA_SYNC:
+			manager.delta.commit(pending, full=full)
+		save_time = datetime.now()
+		logging.info(f'Time taken: API: {api_time - start_time}, Save: {save_time - api_time}')
+		return saved, {'received': len(response), 'saved': len(objects), 'message': message}
+
+	def _changes_total(self) -> int:
+		totals = self.manager.sync_totals['objects']
+		return totals['inserted'] + totals['updated'] + totals['upserted']
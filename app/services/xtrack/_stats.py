@@ -0,0 +1,110 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from app.models.xtrack import Locations, Movements
+from . import _queries as queries
+from ._retention import archived_movements
+
+
+class LocationStats:
+	"""
+	Contadores por local mantidos em memória.
+
+	Reconstruídos a partir de Objects/Movements por `reconcile` (startup e virada
+	do dia) e atualizados de forma incremental a cada commit do save_objects.
+
+	O lock só protege a troca/atualização dos contadores, nunca I/O. Para um
+	reconcile não contar em dobro (ou perder) um lote commitado durante as
+	consultas, cada commit incrementa `_generation`: o resultado só é aplicado
+	se nenhum commit começou ou está em andamento desde o início da leitura.
+	"""
+
+	def __init__(self):
+		self.lock = threading.RLock()
+		self.day: datetime | None = None
+		self.location_names: dict[int, str | None] = {}
+		self.objects: Counter = Counter()
+		self.entries_today: Counter = Counter()
+		self.exits_today: Counter = Counter()
+		self.movements_count: int = 0
+		self.movements_today: int = 0
+		self._generation = 0
+		self._committing = 0
+
+	def is_current(self, day: datetime) -> bool:
+		return self.day == day
+
+	@staticmethod
+	def load(session, day: datetime) -> dict:
+		"""Consulta os contadores no banco, sem tocar no estado atual."""
+		return {
+			'location_names': dict(session.query(Locations.id, Locations.name).all()),
+			'objects': Counter(dict(session.execute(queries.objects_per_location()).all())),
+			'entries_today': Counter(dict(session.execute(queries.entries_since(day)).all())),
+			'exits_today': Counter(dict(session.execute(queries.exits_since(day)).all())),
+			# Brutas dentro da janela de retenção + já agregadas em rollups
+			'movements_count': session.query(Movements).count() + archived_movements(session),
+			'movements_today': session.execute(queries.movements_since(day)).scalar_one(),
+		}
+
+	def reconcile(self, session, day: datetime) -> bool:
+		"""
+		Recalcula todos os contadores a partir do banco. Retorna False (sem
+		alterar nada) se houve commit do save_objects durante a leitura.
+		"""
+		with self.lock:
+			if self._committing:
+				return False
+			generation = self._generation
+		values = self.load(session, day)
+		with self.lock:
+			if self._committing or self._generation != generation:
+				return False
+			for name, value in values.items():
+				setattr(self, name, value)
+			self.day = day
+		return True
+
+	@contextmanager
+	def committing(self):
+		"""Envolve o commit de um lote e o `apply_objects` correspondente."""
+		with self.lock:
+			self._generation += 1
+			self._committing += 1
+		try:
+			yield
+		finally:
+			with self.lock:
+				self._committing -= 1
+
+	def set_locations(self, locations: list[dict]) -> None:
+		"""Atualiza o nome dos locais inseridos/alterados pelo save_locations."""
+		with self.lock:
+			for loc in locations:
+				self.location_names[loc['id']] = loc['name']
+
+	def apply_objects(self, inserted: list[dict], movements: list[dict]) -> None:
+		"""Aplica os deltas de um lote já commitado pelo save_objects."""
+		with self.lock:
+			for obj in inserted:
+				self.objects[obj['location_id']] += 1
+			for mov in movements:
+				self.objects[mov['from_location_id']] -= 1
+				self.objects[mov['to_location_id']] += 1
+				self.entries_today[mov['to_location_id']] += 1
+				self.exits_today[mov['from_location_id']] += 1
+			self.movements_count += len(movements)
+			self.movements_today += len(movements)
+
+	def snapshot(self) -> dict:
+		with self.lock:
+			return {
+				'location_names': dict(self.location_names),
+				'objects': dict(self.objects),
+				'entries_today': dict(self.entries_today),
+				'exits_today': dict(self.exits_today),
+				'movements_count': self.movements_count,
+				'movements_today': self.movements_today,
+			}
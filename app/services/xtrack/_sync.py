@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Hashable
+
+
+async def _pages(manager, batch_size: int) -> AsyncIterator[tuple[int, list[dict]]]:
+	page = 0
+	async for batch in manager.api.iter_objects(batch_size):
+		yield page, batch
+		page += 1
+
+
+async def stream_objects(
+	manager,
+	batch_size: int = 5000,
+	use_delta: bool = True,
+	source: AsyncIterator[tuple[Hashable, list[dict]]] | None = None,
+) -> tuple[bool, dict]:
+	"""
+	Baixa e salva os objetos do Xtrack em lotes.
+
+	Download e gravação se sobrepõem: enquanto um lote é salvo na thread de
+	escrita, o próximo já está sendo lido da rede. A fila limitada a 2 lotes
+	mantém a memória constante quando o banco é mais lento que a rede.
+
+	`source` produz (chave, lote); por padrão as páginas do GetObject em
+	streaming. A chave identifica o lote no delta sync (ex.: o local de uma
+	fatia baixada por fetch_object_slices).
+
+	Returns:
+	    (success, resumo com received/saved/batches/failed_batches/elapsed)
+	"""
+	started = time.monotonic()
+	queue: asyncio.Queue[tuple[Hashable, list[dict]] | None] = asyncio.Queue(maxsize=2)
+	full = use_delta and manager.delta.full_sync_due()
+	pending_all: dict = {}
+	summary = {'received': 0, 'saved': 0, 'batches': 0, 'failed_batches': 0}
+
+	async def consume():
+		while True:
+			item = await queue.get()
+			if item is None:
+				return
+			page, batch = item
+			if summary['batches'] == 0:
+				logging.info(
+					batch[0] if batch else 'Empty first batch', extra={'sample': 'xtrack_payload'}
+				)
+			summary['batches'] += 1
+			summary['received'] += len(batch)
+			try:
+				objects, pending = batch, {}
+				if use_delta:
+					objects, pending = manager.delta.changed(batch, full=full, page=page)
+				success, message = await manager.writer.run(manager.save_objects, objects)
+				if success:
+					summary['saved'] += len(objects)
+					pending_all.update(pending)
+				else:
+					summary['failed_batches'] += 1
+					logging.error(f'Error saving objects batch {page}: {message}')
+			except Exception as e:
+				summary['failed_batches'] += 1
+				logging.error(f'Error saving objects batch {page}: {e}')
+
+	consumer = asyncio.create_task(consume())
+	error = None
+	try:
+		async for item in source or _pages(manager, batch_size):
+			await queue.put(item)
+	except asyncio.CancelledError:
+		consumer.cancel()
+		raise
+	except Exception as e:
+		error = e
+		logging.error(f'Error streaming objects from Xtrack: {e}')
+	finally:
+		if not consumer.done():
+			await queue.put(None)
+			await consumer
+
+	success = error is None and summary['failed_batches'] == 0
+	if use_delta:
+		# Só reinicia o ciclo de reconciliação completa se todos os lotes foram salvos
+		manager.delta.commit(pending_all, full=full and success)
+
+	summary['elapsed'] = round(time.monotonic() - started, 3)
+	return success, summary
@@ -0,0 +1,168 @@
+"""
+Caminho de gravação via UPSERT nativo do banco.
+
+Em vez de SELECT dos existentes + comparação em Python + bulk update, cada
+lote vira dois comandos executados no próprio banco:
+
+1. INSERT INTO movements ... SELECT: registra a movimentação dos objetos que
+   mudaram de local e tiveram algum timestamp alterado;
+2. INSERT ... ON CONFLICT DO UPDATE ... WHERE (ON DUPLICATE KEY UPDATE no
+   MySQL): insere os novos e atualiza só os que mudaram.
+
+A condição de alteração é a mesma do caminho Python: algum timestamp
+diferente, com precisão de segundos.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, bindparam, cast, func, insert, or_, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.models.xtrack import Locations, Movements, Objects
+
+UPSERT_DIALECTS = ('sqlite', 'postgresql', 'mysql')
+TIMESTAMP_FIELDS = ('last_modified', 'last_location', 'last_seen')
+OBJECT_FIELDS = (
+	'active',
+	'location_id',
+	'description',
+	'home_location_id',
+	*TIMESTAMP_FIELDS,
+)
+
+
+def supports_upsert(dialect: str) -> bool:
+	return dialect in UPSERT_DIALECTS
+
+
+def _dialect_insert(dialect: str, table):
+	return {
+		'sqlite': sqlite.insert,
+		'postgresql': postgresql.insert,
+		'mysql': mysql.insert,
+	}[dialect](table)
+
+
+def _to_second(expr, dialect: str):
+	"""Trunca um timestamp em segundos (ignora microsegundos, como o dt_equal)."""
+	if dialect == 'sqlite':
+		# Armazenado como 'YYYY-MM-DD HH:MM:SS.ffffff'
+		return func.substr(expr, 1, 19)
+	if dialect == 'postgresql':
+		return func.date_trunc('second', cast(expr, DateTime(timezone=True)))
+	return func.date_format(expr, '%Y-%m-%d %H:%i:%s')
+
+
+def _timestamps_changed(incoming: dict[str, Any], dialect: str):
+	return or_(
+		*[
+			_to_second(getattr(Objects, field), dialect).is_distinct_from(
+				_to_second(incoming[field], dialect)
+			)
+			for field in TIMESTAMP_FIELDS
+		]
+	)
+
+
+def _execute(session, stmt, rows: list[dict]) -> int:
+	result = session.connection().execute(stmt, rows)
+	return max(result.rowcount or 0, 0)
+
+
+def insert_movements(session, rows: list[dict], dialect: str, now: datetime) -> int:
+	"""Insere as movimentações do lote, comparando com o estado atual no banco."""
+	params = {
+		field: bindparam(f'in_{field}', type_=getattr(Objects, field).type)
+		for field in TIMESTAMP_FIELDS
+	}
+	new_location = bindparam('in_location_id', type_=Integer)
+	now_param = bindparam('in_now', type_=DateTime(timezone=True))
+
+	stmt = insert(Movements).from_select(
+		['object_idcode', 'from_location_id', 'to_location_id', 'created_at', 'updated_at'],
+		select(Objects.idcode, Objects.location_id, new_location, now_param, now_param).where(
+			Objects.idcode == bindparam('in_idcode', type_=String),
+			Objects.location_id.is_distinct_from(new_location),
+			_timestamps_changed(params, dialect),
+		),
+	)
+	return _execute(
+		session,
+		stmt,
+		[
+			{
+				'in_idcode': row['idcode'],
+				'in_location_id': row['location_id'],
+				'in_now': now,
+				**{f'in_{field}': row[field] for field in TIMESTAMP_FIELDS},
+			}
+			for row in rows
+		],
+	)
+
+
+def upsert_objects(session, rows: list[dict], dialect: str, now: datetime) -> int:
+	"""Insere/atualiza os objetos do lote. Retorna as linhas afetadas (quando o driver informa)."""
+	stmt = _dialect_insert(dialect, Objects)
+	rows = [{**row, 'updated_at': now} for row in rows]
+
+	if dialect == 'mysql':
+		incoming = {field: stmt.inserted[field] for field in (*OBJECT_FIELDS, 'updated_at')}
+		changed = _timestamps_changed(incoming, dialect)
+		# Sem WHERE no ON DUPLICATE KEY: cada coluna só recebe o novo valor se mudou.
+		# Os timestamps vão por último porque o MySQL aplica as atribuições em ordem.
+		stmt = stmt.on_duplicate_key_update(
+			[
+				(
+					getattr(Objects, field),
+					func.if_(changed, incoming[field], getattr(Objects, field)),
+				)
+				for field in (
+					'active',
+					'location_id',
+					'description',
+					'home_location_id',
+					'updated_at',
+				)
+			]
+			+ [
+				(
+					getattr(Objects, field),
+					func.if_(changed, incoming[field], getattr(Objects, field)),
+				)
+				for field in TIMESTAMP_FIELDS
+			]
+		)
+	else:
+		incoming = {field: stmt.excluded[field] for field in (*OBJECT_FIELDS, 'updated_at')}
+		stmt = stmt.on_conflict_do_update(
+			index_elements=[Objects.idcode],
+			set_=incoming,
+			where=_timestamps_changed(incoming, dialect),
+		)
+
+	return _execute(session, stmt, rows)
+
+
+def upsert_locations(session, rows: list[dict], dialect: str) -> int:
+	stmt = _dialect_insert(dialect, Locations)
+
+	if dialect == 'mysql':
+		incoming_name = stmt.inserted.name
+		changed = func.coalesce(Locations.name, '') != func.coalesce(incoming_name, '')
+		stmt = stmt.on_duplicate_key_update(
+			[
+				(Locations.updated_at, func.if_(changed, func.now(), Locations.updated_at)),
+				(Locations.name, incoming_name),
+			]
+		)
+	else:
+		incoming_name = stmt.excluded.name
+		stmt = stmt.on_conflict_do_update(
+			index_elements=[Locations.id],
+			set_={'name': incoming_name, 'updated_at': stmt.excluded.updated_at},
+			where=func.coalesce(Locations.name, '') != func.coalesce(incoming_name, ''),
+		)
+
+	return _execute(session, stmt, rows)
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+_STOP = object()
+
+
+class DbWriter:
+	"""
+	Thread única e de vida longa que executa todas as escritas no banco.
+
+	As escritas chegam por uma fila limitada a `max_pending` itens e são
+	executadas uma de cada vez, na ordem de chegada: com um único escritor o
+	SQLite nunca responde `database is locked` e as escritas não disputam o
+	executor padrão com as leituras da API.
+
+	- `run` (async): aguarda uma vaga na fila sem bloquear o event loop
+	- `submit` (threads): bloqueia enquanto a fila estiver cheia
+	"""
+
+	def __init__(self, max_pending: int = 8, name: str = 'db-writer'):
+		self.max_pending = max(int(max_pending), 1)
+		self.name = name
+		self._queue: queue.Queue = queue.Queue(maxsize=self.max_pending)
+		self._thread: threading.Thread | None = None
+		self._lock = threading.Lock()
+		self._slots: asyncio.Semaphore | None = None
+		self._slots_loop: asyncio.AbstractEventLoop | None = None
+		self.processed = 0
+		self.failed = 0
+
+	def _ensure_started(self) -> None:
+		with self._lock:
+			if self._thread is None or not self._thread.is_alive():
+				self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+				self._thread.start()
+
+	def _worker(self) -> None:
+		while True:
+			item = self._queue.get()
+			try:
+				if item is _STOP:
+					return
+				func, args, kwargs, future = item
+				if not future.set_running_or_notify_cancel():
+					continue
+				try:
+					future.set_result(func(*args, **kwargs))
+					self.processed += 1
+				except BaseException as e:
+					self.failed += 1
+					logging.error(f'DB writer job {getattr(func, "__name__", func)} failed: {e}')
+					future.set_exception(e)
+			finally:
+				self._queue.task_done()
+
+	def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+		"""Enfileira `func` e retorna um Future. Bloqueia enquanto a fila estiver cheia."""
+		self._ensure_started()
+		future: Future = Future()
+		self._queue.put((func, args, kwargs, future))
+		return future
+
+	def _loop_slots(self) -> asyncio.Semaphore:
+		# Um semáforo por event loop (os testes criam um loop por asyncio.run)
+		loop = asyncio.get_running_loop()
+		if self._slots_loop is not loop:
+			self._slots = asyncio.Semaphore(self.max_pending)
+			self._slots_loop = loop
+		return self._slots
+
+	async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+		"""Executa `func` na thread de escrita e aguarda o resultado."""
+		async with self._loop_slots():
+			return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+	def close(self, timeout: float | None = None) -> None:
+		"""Termina a thread depois de executar as escritas já enfileiradas."""
+		with self._lock:
+			thread, self._thread = self._thread, None
+		if thread is not None and thread.is_alive():
+			self._queue.put(_STOP)
+			thread.join(timeout)
+
+	def metrics(self) -> dict:
+		return {
+			'pending': self._queue.qsize(),
+			'max_pending': self.max_pending,
+			'processed': self.processed,
+			'failed': self.failed,
+		}
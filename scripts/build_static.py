@@ -0,0 +1,30 @@
+"""
+Gera app/static/dist (cópias com hash no nome, .gz e .br) antes do build.
+poetry run python scripts/build_static.py
+
+A aplicação faz o mesmo na inicialização (STATIC_PRECOMPRESS); rodar antes do
+build_exe deixa o executável com os arquivos prontos.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# get_frozen_path usa a pasta de sys.argv[0]: resolve a partir da raiz, como o main.py
+sys.argv[0] = os.path.join(ROOT, 'main.py')
+
+from app.core import static_manifest  # noqa: E402
+from app.core.static_assets import brotli  # noqa: E402
+
+
+def main() -> None:
+	manifest = static_manifest.build()
+	for relative, target in manifest.items():
+		print(f'{relative} -> {target} {static_manifest.encodings[target]}')
+	if brotli is None:
+		print('[WARN] brotli not installed: only .gz files were written')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# app.core cria o LoggerManager no import, com LOG_PATH relativo ('Logs' sem
+# config.json): importa a partir de uma pasta temporária para os logs dos
+# testes não irem para o repositório
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix='pytest-logs-'))
+try:
+	from app.core import logger, settings
+finally:
+	os.chdir(_cwd)
+settings.LOG_PATH = logger.log_path
+
+from app.models.xtrack import Locations, Movements, Objects  # noqa: E402
+from app.services.xtrack import XtackManager  # noqa: E402
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+	monkeypatch.setattr(settings, 'DATABASE_URL', f'sqlite:///{tmp_path}/test.db')
+	xm = XtackManager('http://localhost/req')
+	assert xm.db_manager is not None
+	yield xm
+	xm.close()
+
+
+def _seed_dashboard(xm):
+	now = datetime.now()
+	yesterday = now - timedelta(days=1)
+	with xm.db_manager.get_session() as session:
+		session.add_all(
+			[
+				Locations(id=1, name='[ALMOX] Entrada'),
+				Locations(id=2, name='[GRU] Recebimento'),
+				Locations(id=3, name='Sem colchete'),
+				Locations(id=4, name=None),
+			]
+		)
+		session.add_all(
+			[
+				Objects(idcode='A1', location_id=1),
+				Objects(idcode='A2', location_id=1),
+				Objects(idcode='B1', location_id=2),
+				Objects(idcode='C1', location_id=3),
+			]
+		)
+		session.add_all(
+			[
+				Movements(object_idcode='A1', from_location_id=2, to_location_id=1, created_at=now),
+				Movements(object_idcode='A2', from_location_id=2, to_location_id=1, created_at=now),
+				Movements(
+					object_idcode='B1',
+					from_location_id=1,
+					to_location_id=2,
+					created_at=yesterday,
+				),
+			]
+		)
+	# Escrita direta no banco: contadores precisam ser reconstruídos
+	xm.reconcile_stats()
+
+
+@pytest.fixture
+def seeded_manager(manager):
+	"""`manager` com locais, objetos e movimentações de hoje e de ontem."""
+	_seed_dashboard(manager)
+	return manager
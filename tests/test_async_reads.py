@@ -0,0 +1,202 @@
+import asyncio
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import settings
+from app.db import read_only_url
+from app.models.xtrack import Locations, Movements
+from app.services.xtrack import XtackManager
+
+
+def _seed(xm, count=5):
+	with xm.db_manager.get_session() as session:
+		session.add_all([Locations(id=1, name='[ALMOX] Entrada'), Locations(id=2, name='[GRU] X')])
+		session.add_all(
+			[
+				Movements(
+					object_idcode=f'A{i}',
+					from_location_id=2,
+					to_location_id=1,
+					created_at=datetime(2026, 1, 1, 8, i),
+				)
+				for i in range(count)
+			]
+		)
+	xm.reconcile_stats()
+
+
+@pytest.fixture
+def no_threads(monkeypatch):
+	async def fail(*args, **kwargs):
+		raise AssertionError('read went through asyncio.to_thread')
+
+	monkeypatch.setattr(asyncio, 'to_thread', fail)
+
+
+def test_movements_use_the_async_engine(manager, no_threads):
+	pytest.importorskip('aiosqlite')
+	_seed(manager)
+	assert manager.async_db is not None
+
+	async def pages():
+		first = await manager.get_movements_async(limit=3)
+		return first
+
+	success, page = asyncio.run(pages())
+
+	assert success, page
+	assert [item['object_idcode'] for item in page['items']] == ['A0', 'A1', 'A2']
+	assert page['items'][0]['to_location'] == '[ALMOX] Entrada'
+	assert page['next_cursor'] is not None
+
+
+def test_async_and_thread_paths_match(manager):
+	pytest.importorskip('aiosqlite')
+	_seed(manager)
+
+	sync_result = manager.get_movements(limit=2)
+	async_result = asyncio.run(manager.get_movements_async(limit=2))
+
+	assert async_result == sync_result
+
+
+def test_info_reconciles_through_the_async_engine(manager, no_threads):
+	pytest.importorskip('aiosqlite')
+	_seed(manager)
+	manager.stats.day = None  # força a reconciliação do dia
+
+	success, info = asyncio.run(manager.get_info_async())
+
+	assert success, info
+	assert info['movements_count'] == 5
+	assert manager.stats.is_current(manager._today())
+
+
+def test_async_engine_is_read_only(manager):
+	pytest.importorskip('aiosqlite')
+
+	async def write():
+		async with manager.async_db.session() as session:
+			await session.execute(text("UPDATE locations SET name = 'x'"))
+
+	with pytest.raises(Exception, match='readonly'):
+		asyncio.run(write())
+
+
+def test_falls_back_to_threads_without_async_engine(tmp_path, monkeypatch):
+	monkeypatch.setattr(settings, 'DATABASE_URL', f'sqlite:///{tmp_path}/test.db')
+	monkeypatch.setattr(settings, 'DATABASE_ASYNC_READS', False)
+	xm = XtackManager('http://localhost/req')
+	try:
+		assert xm.async_db is None
+		_seed(xm)
+		success, page = asyncio.run(xm.get_movements_async(limit=10))
+		assert success
+		assert len(page['items']) == 5
+	finally:
+		xm.close()
+
+
+def test_concurrent_reconciles_share_one_run(manager, monkeypatch):
+	pytest.importorskip('aiosqlite')
+	_seed(manager)
+	manager.stats.day = None
+	calls = []
+	original = manager.stats.load
+
+	def load(session, day):
+		calls.append(day)
+		return original(session, day)
+
+	monkeypatch.setattr(manager.stats, 'load', load)
+
+	async def run():
+		return await asyncio.gather(*[manager.get_info_async() for _ in range(5)])
+
+	results = asyncio.run(run())
+
+	assert len(calls) == 1
+	assert all(success and info['movements_count'] == 5 for success, info in results)
+
+
+def test_reconcile_during_a_commit_is_discarded(manager):
+	_seed(manager)
+	stats = manager.stats
+
+	with manager.read_session() as session:
+		with stats.committing():
+			# Lote em commit: o resultado da leitura pode não incluí-lo
+			assert not stats.reconcile(session, manager._today())
+			stats.apply_objects([], [])
+		assert stats.reconcile(session, manager._today())
+
+	# Commit que começa no meio da leitura também descarta
+	original = stats.load
+
+	def load_with_commit(session, day):
+		values = original(session, day)
+		with stats.committing():
+			stats.apply_objects([{'location_id': 1}], [])
+		return values
+
+	stats.load = load_with_commit
+	stats.day = None
+	with manager.read_session() as session:
+		assert not stats.reconcile(session, manager._today())
+	assert stats.day is None
+	assert stats.snapshot()['objects'][1] == 1
+
+
+def test_commit_does_not_hold_the_stats_lock(manager, monkeypatch):
+	_seed(manager)
+	free = []
+	original = Session.commit
+
+	def commit(session):
+		# O event loop (outra thread) consegue ler os contadores durante o commit
+		def probe():
+			acquired = manager.stats.lock.acquire(timeout=1)
+			free.append(acquired)
+			if acquired:
+				manager.stats.lock.release()
+
+		thread = threading.Thread(target=probe)
+		thread.start()
+		thread.join()
+		original(session)
+
+	monkeypatch.setattr(Session, 'commit', commit)
+	success, _ = manager.save_objects(
+		[{'IDCODE': 'N1', 'ACTIVE': '1', 'DESCRIPTION': 'FB 1', 'LOCATION_ID': '1'}]
+	)
+
+	assert success
+	assert free and all(free)
+	assert manager.stats.snapshot()['objects'][1] == 1
+
+
+def test_read_only_engines_handle_special_characters_in_path(tmp_path, monkeypatch):
+	folder = tmp_path / 'dir with space#x'
+	folder.mkdir()
+	monkeypatch.setattr(settings, 'DATABASE_URL', f'sqlite:///{folder}/test.db')
+	xm = XtackManager('http://localhost/req')
+	try:
+		_seed(xm)
+		with xm.read_session() as session:
+			assert session.query(Movements).count() == 5
+			with pytest.raises(Exception, match='readonly'):
+				session.execute(text("UPDATE locations SET name = 'x'"))
+		if xm.async_db is not None:
+			success, page = asyncio.run(xm.get_movements_async(limit=10))
+			assert success and len(page['items']) == 5
+	finally:
+		xm.close()
+	# Nenhum arquivo criado a partir de um pedaço do caminho
+	assert sorted(path.name for path in tmp_path.iterdir()) == ['dir with space#x']
+	assert read_only_url(f'sqlite:///{folder}/test.db')[0] == (
+		f'sqlite:///file://{tmp_path}/dir%20with%20space%23x/test.db?mode=ro&uri=true'
+	)
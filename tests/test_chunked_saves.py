@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core import settings
+from app.models.xtrack import Locations, Movements, Objects
+
+CHUNK_SIZE = 3
+
+
+def _objects(count: int, location: int = 1, modified: str | None = None) -> list[dict]:
+	return [
+		{
+			'IDCODE': f'OBJ-{i}',
+			'ACTIVE': '1',
+			'DESCRIPTION': f'FB {i}',
+			'LOCATION_ID': str(location),
+			'LAST_MODIFIED': modified,
+		}
+		for i in range(count)
+	]
+
+
+@pytest.fixture
+def commits(manager, monkeypatch):
+	"""Conta os commits das sessões e usa lotes de CHUNK_SIZE."""
+	monkeypatch.setattr(settings, 'DB_CHUNK_SIZE', CHUNK_SIZE)
+	calls = []
+	original = Session.commit
+
+	def commit(self):
+		calls.append(self)
+		return original(self)
+
+	monkeypatch.setattr(Session, 'commit', commit)
+	return calls
+
+
+def _count(manager, model) -> int:
+	with manager.read_session() as session:
+		return session.query(model).count()
+
+
+def test_save_locations_commits_per_chunk(manager, commits):
+	locations = [{'ID': str(i), 'NAME': f'Local {i}'} for i in range(1, 8)]
+
+	success, message = manager.save_locations(locations)
+
+	assert success, message
+	# Lotes de 3 + 3 + 1, mais o commit vazio do get_session ao sair
+	assert len(commits) == 3 + 1
+	assert _count(manager, Locations) == 7
+	assert manager.sync_metrics['locations']['chunks'] == 3
+	assert manager.sync_metrics['locations']['chunks_committed'] == 3
+	assert manager.sync_metrics['locations']['inserted'] == 7
+
+	renamed = [{'ID': '1', 'NAME': 'Novo'}] + locations[1:]
+	assert manager.save_locations(renamed) == (True, '0 inserted, 1 updated')
+	assert manager.sync_metrics['locations']['updated'] == 1
+	assert manager.sync_totals['locations']['inserted'] == 7
+	assert manager.sync_totals['locations']['updated'] == 1
+
+
+def test_save_objects_commits_per_chunk(manager, commits):
+	manager.save_locations([{'ID': '1', 'NAME': 'A'}, {'ID': '2', 'NAME': 'B'}])
+	commits.clear()
+
+	success, message = manager.save_objects(_objects(8))
+
+	assert success, message
+	assert message == '8 inserted, 0 updated'
+	assert len(commits) == 3 + 1
+	assert _count(manager, Objects) == 8
+	metrics = manager.sync_metrics['objects']
+	assert metrics['received'] == 8
+	assert metrics['chunks'] == metrics['chunks_committed'] == 3
+	assert metrics['inserted'] == 8
+	assert manager.stats.snapshot()['objects'] == {1: 8}
+
+	# Metade muda de local: updates e movimentações, sem reenviar os iguais
+	moved = _objects(4, location=2, modified='2026-10-18T10:00:00') + _objects(8)[4:]
+	success, message = manager.save_objects(moved)
+
+	assert (success, message) == (True, '0 inserted, 4 updated')
+	metrics = manager.sync_metrics['objects']
+	assert metrics['received'] == 8
+	assert metrics['unchanged'] == 4
+	assert metrics['chunks'] == metrics['chunks_committed'] == 2
+	assert metrics['movements'] == 4
+	assert _count(manager, Movements) == 4
+	assert manager.sync_totals['objects']['inserted'] == 8
+	assert manager.sync_totals['objects']['updated'] == 4
+
+
+def test_failure_in_middle_chunk_keeps_earlier_chunks(manager, commits, monkeypatch):
+	manager.save_locations([{'ID': '1', 'NAME': 'A'}])
+	commits.clear()
+	original = manager._diff_objects
+	calls = []
+
+	def diff(session, chunk):
+		calls.append(chunk)
+		if len(calls) == 2:
+			raise RuntimeError('database is locked')
+		return original(session, chunk)
+
+	monkeypatch.setattr(manager, '_diff_objects', diff)
+
+	success, message = manager.save_objects(_objects(8))
+
+	assert (success, message) == (False, 'database is locked')
+	assert len(calls) == 2
+	assert len(commits) == 1 + 1
+	with manager.read_session() as session:
+		saved = sorted(idcode for (idcode,) in session.query(Objects.idcode))
+	assert saved == ['OBJ-0', 'OBJ-1', 'OBJ-2']
+	metrics = manager.sync_metrics['objects']
+	assert metrics['chunks'] == 3
+	assert metrics['chunks_committed'] == 1
+	assert metrics['inserted'] == 3
+	assert manager.stats.snapshot()['objects'] == {1: 3}
+
+	# Só os lotes não gravados voltam a ser enviados na próxima sincronização
+	monkeypatch.setattr(manager, '_diff_objects', original)
+	assert manager.save_objects(_objects(8)) == (True, '5 inserted, 0 updated')
+	assert manager.sync_metrics['objects']['unchanged'] == 3
+	assert _count(manager, Objects) == 8
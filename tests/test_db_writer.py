@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.models.xtrack import Objects
+from app.services.xtrack._writer import DbWriter
+
+
+def test_writes_are_serialized_in_one_thread():
+	writer = DbWriter(max_pending=4)
+	active, overlaps, threads = [0], [0], set()
+
+	def write(i):
+		threads.add(threading.current_thread().name)
+		active[0] += 1
+		overlaps[0] = max(overlaps[0], active[0])
+		time.sleep(0.005)
+		active[0] -= 1
+		return i
+
+	async def run():
+		return await asyncio.gather(*(writer.run(write, i) for i in range(20)))
+
+	assert asyncio.run(run()) == list(range(20))
+	assert overlaps[0] == 1
+	assert threads == {'db-writer'}
+	assert writer.metrics()['processed'] == 20
+	writer.close()
+
+
+def test_submit_blocks_when_queue_is_full():
+	writer = DbWriter(max_pending=1)
+	release = threading.Event()
+	writer.submit(release.wait)
+	time.sleep(0.05)
+	writer.submit(lambda: None)  # ocupa a única vaga da fila
+
+	third = threading.Thread(target=writer.submit, args=(lambda: None,))
+	third.start()
+	third.join(0.1)
+	assert third.is_alive()
+
+	release.set()
+	third.join(1)
+	assert not third.is_alive()
+	writer.close()
+
+
+def test_errors_reach_the_caller():
+	writer = DbWriter()
+
+	def fail():
+		raise ValueError('boom')
+
+	with pytest.raises(ValueError, match='boom'):
+		asyncio.run(writer.run(fail))
+	assert writer.metrics()['failed'] == 1
+	writer.close()
+
+
+def test_read_session_is_read_only(manager):
+	assert manager.read_db is not None
+
+	with manager.db_manager.get_session() as session:
+		session.add(Objects(idcode='A1', location_id=1))
+
+	with manager.read_session() as session:
+		assert session.query(Objects).count() == 1
+
+	with pytest.raises(Exception, match='readonly'):
+		with manager.read_session() as session:
+			session.execute(text("UPDATE objects SET description = 'x'"))
+
+
+def test_reads_run_while_the_writer_saves(manager):
+	objects = [
+		{'IDCODE': f'A{i}', 'ACTIVE': '1', 'DESCRIPTION': f'FB {i}', 'LOCATION_ID': '1'}
+		for i in range(2000)
+	]
+
+	async def run():
+		save = asyncio.ensure_future(manager.writer.run(manager.save_objects, objects))
+		reads = 0
+		while not save.done():
+			success, _ = await asyncio.to_thread(manager.get_movements, limit=10)
+			assert success
+			reads += 1
+		return await save, reads
+
+	(success, message), reads = asyncio.run(run())
+
+	assert success, message
+	assert reads >= 1
+	with manager.read_session() as session:
+		assert session.query(Objects).count() == 2000
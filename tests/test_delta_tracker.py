@@ -0,0 +1,35 @@
+from app.services.xtrack._delta import DeltaTracker
+
+
+def _objects(n):
+	return [
+		{'IDCODE': f'ID{i}', 'LOCATION_ID': '1', 'LAST_MODIFIED': '2025-01-01'} for i in range(n)
+	]
+
+
+def test_delta_tracker_skips_unchanged_partitions():
+	tracker = DeltaTracker(partitions=8)
+	objects = _objects(100)
+
+	assert tracker.full_sync_due()
+	changed, pending = tracker.changed(objects, full=True)
+	assert changed == objects
+	tracker.commit(pending, full=True)
+	assert not tracker.full_sync_due()
+
+	# Nada mudou: nenhum objeto vai para o save_objects
+	changed, pending = tracker.changed(objects)
+	assert changed == [] and pending == {}
+
+	# Só a partição do objeto alterado é reprocessada
+	objects[42] = {**objects[42], 'LOCATION_ID': '2'}
+	changed, pending = tracker.changed(objects)
+	partition = tracker.partition_of('ID42')
+	assert list(pending) == [partition]
+	assert objects[42] in changed
+	assert all(tracker.partition_of(obj['IDCODE']) == partition for obj in changed)
+
+	# Sem commit (save falhou) a partição continua pendente
+	assert tracker.changed(objects)[0] == changed
+	tracker.commit(pending)
+	assert tracker.changed(objects)[0] == []
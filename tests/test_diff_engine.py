@@ -0,0 +1,110 @@
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.xtrack._diff import diff_objects_numpy, diff_objects_python, get_diff_engine
+
+
+pytest.importorskip('numpy')
+
+Row = namedtuple('Row', 'idcode last_modified last_location last_seen location_id')
+FIELDS = ('last_modified', 'last_location', 'last_seen')
+BASE = datetime(2030, 1, 1, 10, 0, 0)
+
+
+def _feed(count: int, seed: int = 7):
+	rng = random.Random(seed)
+	existing, objects = [], []
+	for i in range(count):
+		idcode = f'OBJ{i:06d}'
+		stamps = [BASE + timedelta(seconds=rng.randrange(10_000)) for _ in range(3)]
+		if rng.random() < 0.2:
+			stamps[2] = None
+		location = rng.randrange(1, 6)
+		kind = rng.random()
+		if kind > 0.1:
+			existing.append(Row(idcode, *stamps, location))
+		if kind > 0.7:
+			# Alterado: timestamp novo e, às vezes, outro local
+			stamps[rng.randrange(3)] = BASE + timedelta(days=1)
+			location = rng.randrange(1, 6)
+		objects.append(
+			{
+				'IDCODE': idcode,
+				'ACTIVE': '1',
+				'LOCATION_ID': str(location),
+				# Fora do escopo: outra descrição ou sem descrição
+				'DESCRIPTION': rng.choice(['other', None]) if rng.random() < 0.05 else 'FB item',
+				'HOME_LOCATION_ID': '1',
+				# Microsegundos e 'T' não contam como alteração
+				'LAST_MODIFIED': stamps[0] and f'{stamps[0].isoformat()}.250',
+				'LAST_LOCATION': stamps[1] and stamps[1].isoformat(),
+				'LAST_SEEN': stamps[2] and stamps[2].isoformat(),
+			}
+		)
+	rng.shuffle(existing)
+	return objects, existing
+
+
+def _without_timestamp(movements):
+	return [{k: v for k, v in m.items() if k != 'timestamp'} for m in movements]
+
+
+def test_numpy_engine_matches_python():
+	objects, existing = _feed(2000)
+
+	expected = diff_objects_python(objects, existing)
+	result = diff_objects_numpy(objects, existing)
+
+	assert result[0] == expected[0]
+	assert result[1] == expected[1]
+	assert _without_timestamp(result[2]) == _without_timestamp(expected[2])
+	assert expected[1] and expected[2]
+
+
+def test_engines_skip_objects_without_description():
+	objects, existing = _feed(50)
+	del objects[0]['DESCRIPTION']
+	objects[1]['DESCRIPTION'] = None
+	objects[2]['DESCRIPTION'] = ''
+
+	expected = diff_objects_python(objects, existing)
+	result = diff_objects_numpy(objects, existing)
+
+	assert result[:2] == expected[:2]
+	assert _without_timestamp(result[2]) == _without_timestamp(expected[2])
+	skipped = {obj['IDCODE'] for obj in objects[:3]}
+	assert not skipped & {row['idcode'] for rows in expected[:2] for row in rows}
+
+
+def test_numpy_engine_accepts_text_timestamps():
+	objects, existing = _feed(500, seed=11)
+	as_text = [
+		row._replace(**{f: row[i + 1] and str(row[i + 1]) for i, f in enumerate(FIELDS)})
+		for row in existing
+	]
+
+	assert diff_objects_numpy(objects, as_text)[:2] == diff_objects_python(objects, existing)[:2]
+
+
+def test_manager_with_numpy_engine(manager):
+	manager._existing_columns, manager._diff_engine = get_diff_engine('numpy')
+	objects, _ = _feed(300, seed=3)
+
+	assert manager.save_objects(objects)[0]
+	moved = [
+		{**obj, 'LOCATION_ID': '9', 'LAST_SEEN': '2031-01-01T00:00:00'} for obj in objects[:10]
+	]
+	manager.hashes.clear()
+	success, message = manager.save_objects(moved)
+
+	assert success
+	assert message == f'0 inserted, {sum(o["DESCRIPTION"] != "other" for o in moved)} updated'
+
+
+def test_numpy_engine_without_existing_rows():
+	objects, _ = _feed(50)
+
+	assert diff_objects_numpy(objects, [])[0] == diff_objects_python(objects, [])[0]
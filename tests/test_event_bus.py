@@ -0,0 +1,182 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+
+from app.core.events import EventBus, Subscriber, format_event
+from app.routers.api.v1 import events
+
+
+def test_publish_fans_out_to_every_subscriber():
+	async def run():
+		bus = EventBus()
+		subscribers = [bus.subscribe() for _ in range(3)]
+		bus.publish('alert', {'message': 'hi'})
+		return [subscriber.queue.get_nowait() for subscriber in subscribers]
+
+	assert asyncio.run(run()) == [('alert', {'message': 'hi'})] * 3
+
+
+def test_publish_without_subscribers_is_a_noop():
+	bus = EventBus()
+	bus.publish('alert', {})
+	bus.notify('xtrack_info')
+	assert bus.subscribers_count == 0
+
+
+def test_repeated_notify_is_coalesced():
+	calls = []
+
+	async def run():
+		bus = EventBus()
+
+		async def producer():
+			calls.append(1)
+			return {'version': len(calls)}
+
+		bus.register_producer('xtrack_info', producer)
+		first, second = bus.subscribe(), bus.subscribe()
+		for _ in range(10):
+			bus.notify('xtrack_info')
+		await asyncio.sleep(0.01)
+		# Depois de entregue, uma nova notificação volta a produzir
+		bus.notify('xtrack_info')
+		await asyncio.sleep(0.01)
+		return [first.queue.get_nowait() for _ in range(2)], second.queue.qsize()
+
+	received, second_size = asyncio.run(run())
+
+	assert len(calls) == 2
+	assert received == [('xtrack_info', {'version': 1}), ('xtrack_info', {'version': 2})]
+	assert second_size == 2
+
+
+def test_producer_error_does_not_block_later_notifications():
+	async def run():
+		bus = EventBus()
+		results = iter([RuntimeError('db down'), {'ok': True}])
+
+		async def producer():
+			result = next(results)
+			if isinstance(result, Exception):
+				raise result
+			return result
+
+		bus.register_producer('xtrack_info', producer)
+		subscriber = bus.subscribe()
+		bus.notify('xtrack_info')
+		await asyncio.sleep(0.01)
+		bus.notify('xtrack_info')
+		await asyncio.sleep(0.01)
+		return subscriber.queue.get_nowait(), subscriber.queue.empty()
+
+	assert asyncio.run(run()) == (('xtrack_info', {'ok': True}), True)
+
+
+def test_full_queue_drops_oldest():
+	async def run():
+		subscriber = Subscriber(maxsize=3)
+		for i in range(5):
+			subscriber.put('alert', i)
+		return [subscriber.queue.get_nowait()[1] for _ in range(3)], subscriber.dropped
+
+	assert asyncio.run(run()) == ([2, 3, 4], 2)
+
+
+def test_notify_from_another_thread():
+	async def run():
+		bus = EventBus()
+		loop = asyncio.get_running_loop()
+		producer_threads = []
+
+		async def producer():
+			producer_threads.append(threading.get_ident())
+			return {'ok': True}
+
+		bus.register_producer('xtrack_info', producer)
+		subscriber = bus.subscribe()
+		# Ex.: listener do XtackManager chamado na thread do sync
+		worker = threading.Thread(
+			target=lambda: (bus.notify('xtrack_info'), bus.publish('alert', {'n': 1}))
+		)
+		await loop.run_in_executor(None, lambda: (worker.start(), worker.join()))
+		received = [await asyncio.wait_for(subscriber.queue.get(), 1) for _ in range(2)]
+		return received, producer_threads
+
+	received, producer_threads = asyncio.run(run())
+
+	assert sorted(received, key=lambda item: item[0]) == [
+		('alert', {'n': 1}),
+		('xtrack_info', {'ok': True}),
+	]
+	# O produtor roda no event loop, não na thread que notificou
+	assert producer_threads == [threading.main_thread().ident]
+
+
+def test_format_event():
+	assert format_event('alert', {'message': 'olá'}) == 'event: alert\ndata: {"message":"olá"}\n\n'
+	assert format_event('xtrack_info', b'{"a":1}') == 'event: xtrack_info\ndata: {"a":1}\n\n'
+
+
+def test_stream_endpoint_unsubscribes_on_disconnect(monkeypatch):
+	bus = EventBus()
+	monkeypatch.setattr(events, 'event_bus', bus)
+
+	async def produce_info():
+		return {'objects': 1}
+
+	bus.register_producer('xtrack_info', produce_info)
+	app = FastAPI()
+	app.include_router(events.router)
+
+	async def run():
+		disconnected = asyncio.Event()
+		body = []
+
+		async def receive():
+			await disconnected.wait()
+			return {'type': 'http.disconnect'}
+
+		async def send(message):
+			if message['type'] == 'http.response.start':
+				body.append(dict(message['headers']))
+			elif message.get('body'):
+				body.append(message['body'].decode())
+
+		scope = {
+			'type': 'http',
+			'method': 'GET',
+			'path': f'{events.router_prefix}/stream',
+			'raw_path': f'{events.router_prefix}/stream'.encode(),
+			'query_string': b'',
+			'headers': [],
+			'http_version': '1.1',
+			'scheme': 'http',
+			'server': ('test', 80),
+			'root_path': '',
+		}
+		task = asyncio.create_task(app(scope, receive, send))
+
+		async def wait_for(condition):
+			for _ in range(200):
+				if condition():
+					return
+				await asyncio.sleep(0.005)
+			raise AssertionError('timeout')
+
+		await wait_for(lambda: len(body) >= 3)
+		assert bus.subscribers_count == 1
+		bus.publish('alert', {'message': 'hi'})
+		await wait_for(lambda: len(body) >= 4)
+
+		disconnected.set()
+		await asyncio.wait_for(task, 1)
+		return body
+
+	headers, *chunks = asyncio.run(run())
+
+	assert headers[b'content-type'].startswith(b'text/event-stream')
+	assert chunks[0].startswith('event: has_changes\n')
+	assert chunks[1] == 'event: xtrack_info\ndata: {"objects":1}\n\n'
+	assert chunks[2] == 'event: alert\ndata: {"message":"hi"}\n\n'
+	assert bus.subscribers_count == 0
@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+from app.services.xtrack import InfoCache
+
+
+def test_info_cache_coalesces_and_invalidates():
+	calls = []
+
+	def compute():
+		calls.append(1)
+		time.sleep(0.05)
+		return True, {'objects_count': len(calls)}
+
+	cache = InfoCache(compute, ttl=60)
+
+	async def run():
+		results = await asyncio.gather(*[cache.get() for _ in range(20)])
+		assert len(calls) == 1
+		assert len({etag for _, _, etag in results}) == 1
+
+		_, _, etag = await cache.get()
+		cache.invalidate()
+		_, body, new_etag = await cache.get()
+		assert len(calls) == 2
+		assert new_etag != etag
+		assert body == b'{"objects_count":2}'
+
+	asyncio.run(run())
@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from app.core.log_pipeline import DailyFileHandler, LogPipeline, SampleFilter
+from app.services.logs._search import LINE
+
+
+@pytest.fixture
+def log():
+	log = logging.getLogger('test_log_pipeline')
+	log.setLevel(logging.INFO)
+	log.propagate = False
+	yield log
+	for handler in log.handlers[:]:
+		log.removeHandler(handler)
+
+
+def _today_file(tmp_path, suffix):
+	return tmp_path / f'{datetime.now():%Y-%m-%d}_app{suffix}'
+
+
+def test_writes_text_and_json_lines(tmp_path, log):
+	pipeline = LogPipeline(str(tmp_path), 'app', json_lines=True)
+	pipeline.start(log)
+	log.info('Movement %s', 'ABC123')
+	try:
+		raise ValueError('boom')
+	except ValueError:
+		log.exception('Sync failed')
+	pipeline.stop()
+
+	lines = _today_file(tmp_path, '.log').read_text(encoding='utf-8').splitlines()
+	assert LINE.match(lines[0]).groups()[1:] == ('INFO', 'Movement ABC123')
+	assert LINE.match(lines[1]).groups()[1:] == ('ERROR', 'Sync failed')
+	assert lines[-1] == 'ValueError: boom'
+
+	entries = [
+		json.loads(line) for line in _today_file(tmp_path, '.jsonl').read_text().splitlines()
+	]
+	assert [entry['message'] for entry in entries] == ['Movement ABC123', 'Sync failed']
+	assert entries[1]['level'] == 'ERROR'
+	assert entries[1]['logger'] == 'test_log_pipeline'
+	assert entries[1]['exc'].endswith('ValueError: boom')
+
+
+def test_start_is_idempotent_and_stop_without_start_is_a_noop(tmp_path, log):
+	pipeline = LogPipeline(str(tmp_path), 'app')
+	pipeline.stop()
+
+	pipeline.start(log)
+	pipeline.start(log)
+	log.info('once')
+	pipeline.stop()
+	pipeline.stop()
+
+	assert log.handlers == [pipeline.queue_handler]
+	assert _today_file(tmp_path, '.log').read_text().count('once') == 1
+
+
+def test_file_writes_are_batched(tmp_path, log):
+	pipeline = LogPipeline(str(tmp_path), 'app', batch_size=100)
+	writes = []
+	original = pipeline.file_handler.flush
+	pipeline.file_handler.flush = (
+		lambda: writes.append(len(pipeline.file_handler._pending)) or original()
+	)
+
+	for i in range(250):
+		pipeline.queue.put_nowait(
+			log.makeRecord(log.name, logging.INFO, '', 0, f'line {i}', None, None)
+		)
+	pipeline.start(log)
+	pipeline.stop()
+
+	assert writes[:3] == [100, 100, 50]
+	assert len(_today_file(tmp_path, '.log').read_text().splitlines()) == 250
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, log):
+	pipeline = LogPipeline(str(tmp_path), 'app', queue_size=3)
+	log.addHandler(pipeline.queue_handler)  # listener parado: fila não esvazia
+
+	started = time.monotonic()
+	for i in range(10):
+		log.info(f'line {i}')
+
+	assert time.monotonic() - started < 1
+	assert pipeline.metrics()['dropped'] == 7
+	assert pipeline.metrics()['queued'] == 3
+
+
+def test_sampled_messages_are_rate_limited(log):
+	sampler = SampleFilter(limit=2, window=0.05)
+	records = []
+
+	class Collect(logging.Handler):
+		def emit(self, record):
+			records.append(record.getMessage())
+
+	handler = Collect()
+	handler.addFilter(sampler)
+	log.addHandler(handler)
+
+	for i in range(5):
+		log.info(f'UPDATE idcode=A{i}', extra={'sample': 'object_update'})
+	log.info('not sampled')
+	time.sleep(0.06)
+	log.info('UPDATE idcode=B', extra={'sample': 'object_update'})
+
+	assert records == [
+		'UPDATE idcode=A0',
+		'UPDATE idcode=A1',
+		'not sampled',
+		'UPDATE idcode=B (3 similar messages suppressed)',
+	]
+	assert sampler.suppressed == 3
+
+
+def test_daily_file_cleanup_keeps_storage_days(tmp_path):
+	for day in range(1, 6):
+		(tmp_path / f'2020-01-0{day}_app.log').write_text('x\n')
+	(tmp_path / '2020-01-01_app.jsonl').write_text('{}\n')
+	handler = DailyFileHandler(str(tmp_path), 'app', '.log', storage_days=2)
+	handler.setFormatter(logging.Formatter('%(message)s'))
+	handler.emit(logging.makeLogRecord({'msg': 'today'}))
+	handler.flush()
+
+	assert sorted(os.listdir(tmp_path)) == [
+		'2020-01-01_app.jsonl',
+		'2020-01-04_app.log',
+		'2020-01-05_app.log',
+		_today_file(tmp_path, '.log').name,
+	]
@@ -0,0 +1,84 @@
+import os
+
+from app.services.logs import read_since, read_tail
+
+
+def _write(path, lines, mode='a'):
+	with open(path, mode, encoding='utf-8') as f:
+		f.writelines(f'{line}\n' for line in lines)
+
+
+def test_tail_reads_only_the_end(tmp_path):
+	path = tmp_path / 'app.log'
+	_write(path, [f'2026-01-01 - INFO - line {i} ' + 'x' * 100 for i in range(5000)])
+
+	chunk = read_tail(str(path), 3)
+
+	assert [line.split(' ')[5] for line in chunk.lines] == ['4997', '4998', '4999']
+	assert chunk.offset == os.path.getsize(path)
+	assert chunk.reset
+
+
+def test_tail_of_a_short_file(tmp_path):
+	path = tmp_path / 'app.log'
+	_write(path, ['a', '', 'b <c>'])
+
+	chunk = read_tail(str(path), 100)
+
+	assert chunk.lines == ['a', 'b &lt;c&gt;']
+
+
+def test_since_offset_returns_only_appended_lines(tmp_path):
+	path = tmp_path / 'app.log'
+	_write(path, ['first', 'second'])
+	chunk = read_tail(str(path), 10)
+
+	_write(path, ['third'])
+	with open(path, 'a', encoding='utf-8') as f:
+		f.write('partial')
+	chunk = read_since(str(path), chunk.offset, chunk.inode)
+
+	assert chunk.lines == ['third']
+	assert not chunk.reset
+
+	with open(path, 'a', encoding='utf-8') as f:
+		f.write(' line\n')
+	chunk = read_since(str(path), chunk.offset, chunk.inode)
+
+	assert chunk.lines == ['partial line']
+	assert read_since(str(path), chunk.offset, chunk.inode).lines == []
+
+
+def test_rotation_and_truncation_reset_the_cursor(tmp_path):
+	path = tmp_path / 'app.log'
+	_write(path, ['old 1', 'old 2'])
+	chunk = read_tail(str(path), 10)
+
+	# Rotação: outro arquivo no mesmo caminho
+	rotated = tmp_path / 'new.log'
+	_write(rotated, ['new 1'])
+	os.replace(rotated, path)
+	after_rotation = read_since(str(path), chunk.offset, chunk.inode)
+
+	assert after_rotation.reset
+	assert after_rotation.lines == ['new 1']
+
+	_write(path, ['x'], mode='w')
+	truncated = read_since(str(path), after_rotation.offset + 100, after_rotation.inode)
+	assert truncated.reset
+	assert truncated.lines == ['x']
+
+
+def test_reads_are_bounded(tmp_path):
+	path = tmp_path / 'app.log'
+	_write(path, [f'line {i}' for i in range(1000)])
+
+	chunk = read_since(str(path), 0, max_bytes=100)
+
+	assert chunk.more
+	assert 0 < len(chunk.lines) < 20
+	seen = list(chunk.lines)
+	while chunk.more:
+		chunk = read_since(str(path), chunk.offset, chunk.inode, max_bytes=100)
+		seen += chunk.lines
+	assert seen == [f'line {i}' for i in range(1000)]
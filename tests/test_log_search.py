@@ -0,0 +1,181 @@
+import asyncio
+import os
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import app.services.logs as logs_service
+from app.core import logger, settings
+from app.routers.pages import logs as logs_page
+from app.services.logs import LogIndex
+from app.services.logs._search import INDEX_FILENAME
+
+
+def _write(path, lines, mode='a'):
+	with open(path, mode, encoding='utf-8') as f:
+		f.writelines(f'{line}\n' for line in lines)
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+	_write(
+		tmp_path / '2026-01-01_app.log',
+		[
+			'2026-01-01 08:00:00,001 - INFO - Movement ABC123 to [ALMOX] Entrada',
+			'2026-01-01 09:00:00,001 - ERROR - Sync failed for ABC123',
+			'Traceback (most recent call last):',
+			'  ValueError: boom',
+		],
+	)
+	_write(
+		tmp_path / '2026-01-02_app.log',
+		[
+			'2026-01-02 10:00:00,001 - INFO - Movement ABC123 to [GRU] X',
+			'2026-01-02 11:00:00,001 - WARNING - Slow query 1.2s',
+		],
+	)
+	return tmp_path
+
+
+def _messages(result):
+	return [item['message'] for item in result['items']]
+
+
+def test_search_across_days_newest_first(log_dir):
+	index = LogIndex(str(log_dir))
+	assert index.refresh() == 6
+
+	result = index.search('ABC123')
+
+	assert _messages(result) == [
+		'Movement ABC123 to [GRU] X',
+		'Sync failed for ABC123',
+		'Movement ABC123 to [ALMOX] Entrada',
+	]
+	assert result['items'][0]['file'] == '2026-01-02_app.log'
+	assert result['next_cursor'] is None
+	assert _messages(index.search('movement gru')) == ['Movement ABC123 to [GRU] X']
+
+
+def test_level_and_date_filters(log_dir):
+	index = LogIndex(str(log_dir))
+	index.refresh()
+
+	errors = index.search(level='error')
+	assert _messages(errors) == [
+		'  ValueError: boom',
+		'Traceback (most recent call last):',
+		'Sync failed for ABC123',
+	]
+	assert {item['ts'] for item in errors['items']} == {'2026-01-01 09:00:00'}
+
+	day_two = index.search(
+		'ABC123', date_from=datetime(2026, 1, 2), date_to=datetime(2026, 1, 2, 10)
+	)
+	assert _messages(day_two) == []
+	day_two = index.search('ABC123', date_from=datetime(2026, 1, 2))
+	assert _messages(day_two) == ['Movement ABC123 to [GRU] X']
+
+
+def test_cursor_pagination(log_dir):
+	index = LogIndex(str(log_dir))
+	index.refresh()
+
+	seen = []
+	cursor = None
+	while True:
+		page = index.search(before_id=cursor, limit=4)
+		seen += _messages(page)
+		cursor = page['next_cursor']
+		if cursor is None:
+			break
+
+	assert len(seen) == 6
+	assert seen == _messages(index.search(limit=100))
+
+
+def test_refresh_indexes_only_appended_lines(log_dir):
+	index = LogIndex(str(log_dir))
+	index.refresh()
+	path = log_dir / '2026-01-02_app.log'
+
+	with open(path, 'a', encoding='utf-8') as f:
+		f.write('2026-01-02 12:00:00,001 - INFO - Movement XYZ9')
+	assert index.refresh() == 0  # linha parcial fica para depois
+
+	_write(path, [' done'])
+	assert index.refresh() == 1
+	assert index.refresh() == 0
+	assert _messages(index.search('XYZ9')) == ['Movement XYZ9 done']
+	assert len(index.search(limit=100)['items']) == 7
+
+
+def test_rotated_and_removed_files(log_dir):
+	index = LogIndex(str(log_dir))
+	index.refresh()
+
+	# Arquivo trocado no mesmo caminho é reindexado
+	replacement = log_dir / 'replacement.tmp'
+	_write(replacement, ['2026-01-02 10:00:00,001 - INFO - Rewritten'])
+	os.replace(replacement, log_dir / '2026-01-02_app.log')
+	index.refresh()
+	assert _messages(index.search('Movement')) == ['Movement ABC123 to [ALMOX] Entrada']
+	assert _messages(index.search('Rewritten')) == ['Rewritten']
+
+	# Limpeza do LoggerManager remove o arquivo: sai do índice
+	os.remove(log_dir / '2026-01-01_app.log')
+	index.refresh()
+	assert _messages(index.search(limit=100)) == ['Rewritten']
+	assert _messages(index.search('ABC123')) == []
+
+
+def test_like_fallback_matches_fts(log_dir):
+	index = LogIndex(str(log_dir))
+	index.refresh()
+	expected = index.search('abc123 movement')
+
+	index.fts = False
+	assert index.search('abc123 movement') == expected
+	assert _messages(index.search('50%')) == []
+
+
+@pytest.fixture
+def lazy_index(log_dir, monkeypatch):
+	"""get_log_index apontando para `log_dir`, sem índice criado ainda."""
+	monkeypatch.setattr(logs_service, '_log_index', None)
+	monkeypatch.setattr(logger, 'log_path', str(log_dir))
+	monkeypatch.setattr(settings, 'LOG_INDEX_ENABLED', True)
+	return log_dir
+
+
+def test_log_index_is_created_on_first_use(lazy_index, monkeypatch):
+	assert not (lazy_index / INDEX_FILENAME).exists()
+
+	index = logs_service.get_log_index()
+
+	assert index is logs_service.get_log_index()
+	assert index.index_path == str(lazy_index / INDEX_FILENAME)
+	assert (lazy_index / INDEX_FILENAME).exists()
+
+	monkeypatch.setattr(settings, 'LOG_INDEX_ENABLED', False)
+	assert logs_service.get_log_index() is None
+
+
+def test_search_route(lazy_index, monkeypatch):
+	app = FastAPI()
+	app.include_router(logs_page.router)
+
+	async def search(**params):
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+			return await client.get('/logs/search', params=params)
+
+	response = asyncio.run(search(q='ABC123', level='ERROR'))
+
+	assert response.status_code == 200
+	assert _messages(response.json()) == ['Sync failed for ABC123']
+
+	monkeypatch.setattr(settings, 'LOG_INDEX_ENABLED', False)
+	assert asyncio.run(search(q='ABC123')).status_code == 404
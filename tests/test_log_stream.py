@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import re
+import threading
+
+import pytest
+
+from app.core import logger
+from app.core.log_pipeline import LogPipeline
+from app.core.log_stream import LogStreamHandler
+from app.routers.pages import logs as logs_page
+
+
+@pytest.fixture
+def handler():
+	log_stream = LogStreamHandler(capacity=50, queue_size=5)
+	log = logging.getLogger('test_log_stream')
+	log.setLevel(logging.DEBUG)
+	log.addHandler(log_stream)
+	yield log_stream
+	log.removeHandler(log_stream)
+
+
+def _drain(subscriber):
+	entries = []
+	while not subscriber.queue.empty():
+		entries.append(subscriber.queue.get_nowait()[1])
+	return entries
+
+
+def test_buffer_keeps_the_last_records(handler):
+	log = logging.getLogger('test_log_stream')
+	for i in range(60):
+		log.info(f'line {i} <b>')
+
+	assert len(handler.buffer) == 50
+	assert handler.buffer[0]['message'] == 'line 10 <b>'
+	assert handler.buffer[-1]['line'].endswith(' - INFO - line 59 &lt;b&gt;')
+
+
+def test_subscribers_receive_filtered_records(handler):
+	log = logging.getLogger('test_log_stream')
+
+	async def run():
+		everything = handler.subscribe()
+		errors = handler.subscribe(level=logging.ERROR)
+		child = handler.subscribe(logger='test_log_stream.sync', pattern=re.compile('ABC'))
+
+		log.info('Movement ABC1')
+		log.error('Sync failed')
+		logging.getLogger('test_log_stream.sync').info('ABC2 updated')
+		logging.getLogger('test_log_stream.sync').info('XYZ updated')
+		await asyncio.sleep(0)
+
+		return [[entry['message'] for entry in _drain(s)] for s in (everything, errors, child)]
+
+	everything, errors, child = asyncio.run(run())
+
+	assert everything == ['Movement ABC1', 'Sync failed', 'ABC2 updated', 'XYZ updated']
+	assert errors == ['Sync failed']
+	assert child == ['ABC2 updated']
+
+
+def test_backlog_is_filtered(handler):
+	log = logging.getLogger('test_log_stream')
+	for i in range(10):
+		if i % 2:
+			log.warning(f'warn {i}')
+		else:
+			log.info(f'info {i}')
+
+	async def run():
+		subscriber = handler.subscribe(level=logging.WARNING, backlog=2)
+		return [entry['message'] for entry in _drain(subscriber)]
+
+	assert asyncio.run(run()) == ['warn 7', 'warn 9']
+
+
+def test_slow_client_drops_instead_of_blocking(handler):
+	log = logging.getLogger('test_log_stream')
+
+	async def run():
+		slow = handler.subscribe()
+		# Logs vindos de outra thread (ex.: sync) nunca esperam pelo cliente
+		thread = threading.Thread(target=lambda: [log.info(f'line {i}') for i in range(20)])
+		thread.start()
+		thread.join(timeout=1)
+		assert not thread.is_alive()
+		await asyncio.sleep(0.05)
+		return slow
+
+	slow = asyncio.run(run())
+
+	assert slow.dropped == 15
+	assert [entry['message'] for entry in _drain(slow)] == [f'line {i}' for i in range(15, 20)]
+	assert handler.metrics() == {'buffered': 20, 'subscribers': 1, 'dropped': 15}
+
+
+def test_emit_without_a_running_loop(handler):
+	async def run():
+		handler.subscribe()
+
+	asyncio.run(run())
+	# O loop do assinante já fechou: o registro fica só no buffer
+	logging.getLogger('test_log_stream').info('after close')
+
+	assert handler.buffer[-1]['message'] == 'after close'
+
+
+def test_subscribe_since_resumes_after_seq(handler):
+	log = logging.getLogger('test_log_stream')
+	for i in range(5):
+		log.info(f'line {i}')
+
+	async def run():
+		resumed = handler.subscribe(since=3)
+		ahead = handler.subscribe(since=100, backlog=10)
+		log.info('live')
+		await asyncio.sleep(0)
+		return [[entry['message'] for entry in _drain(s)] for s in (resumed, ahead)]
+
+	resumed, ahead = asyncio.run(run())
+
+	assert handler.seq == 6
+	assert resumed == ['line 3', 'line 4', 'live']
+	# `since` substitui o backlog
+	assert ahead == ['live']
+
+
+def test_tail_seq_covers_lines_not_yet_flushed(tmp_path, monkeypatch, handler):
+	pipeline = LogPipeline(str(tmp_path), logger.base_filename, batch_size=100)
+	monkeypatch.setattr(logger, 'log_path', str(tmp_path))
+	monkeypatch.setattr(logs_page, 'logging_pipeline', pipeline)
+	monkeypatch.setattr(logs_page, 'log_stream_handler', handler)
+	log = logging.getLogger('test_log_stream')
+
+	def emit(message):
+		# Mesma ordem do listener: arquivo (agrupado) antes do stream
+		record = log.makeRecord(log.name, logging.INFO, '', 0, message, None, None)
+		pipeline.file_handler.handle(record)
+		handler.handle(record)
+
+	emit('before tail 1')
+	emit('before tail 2')
+	assert pipeline.file_handler._pending
+
+	data = logs_page.get_log_content(tail=10)
+
+	assert [line.split(' - ')[-1] for line in data['content']] == [
+		'before tail 1',
+		'before tail 2',
+	]
+	assert data['info']['seq'] == handler.seq
+
+	async def run():
+		subscriber = handler.subscribe(since=data['info']['seq'])
+		emit('after tail')
+		await asyncio.sleep(0)
+		return [entry['message'] for entry in _drain(subscriber)]
+
+	assert asyncio.run(run()) == ['after tail']
+
+
+def test_tail_and_resumed_stream_have_no_gaps_or_duplicates(tmp_path, monkeypatch):
+	total = 3000
+	stream_handler = LogStreamHandler(capacity=total, queue_size=total)
+	pipeline = LogPipeline(
+		str(tmp_path), logger.base_filename, handlers=[stream_handler], batch_size=50
+	)
+	monkeypatch.setattr(logger, 'log_path', str(tmp_path))
+	monkeypatch.setattr(logs_page, 'logging_pipeline', pipeline)
+	monkeypatch.setattr(logs_page, 'log_stream_handler', stream_handler)
+	log = logging.getLogger('test_log_stream.concurrent')
+	log.propagate = False
+	log.setLevel(logging.INFO)
+	pipeline.start(log)
+
+	async def run():
+		started = threading.Event()
+
+		def produce():
+			for i in range(total):
+				log.info(f'n {i}')
+				if i == total // 3:
+					started.set()
+
+		producer = threading.Thread(target=produce)
+		producer.start()
+		await asyncio.to_thread(started.wait)
+		# Tail e stream lidos com o listener ainda gravando
+		data = await asyncio.to_thread(logs_page.get_log_content, None, None, total)
+		subscriber = stream_handler.subscribe(since=data['info']['seq'])
+		await asyncio.to_thread(producer.join)
+		while stream_handler.seq < total or pipeline.queue.qsize():
+			await asyncio.sleep(0.01)
+		await asyncio.sleep(0.05)
+		return data, [entry['message'] for entry in _drain(subscriber)]
+
+	try:
+		data, streamed = asyncio.run(run())
+	finally:
+		pipeline.stop()
+		for handler in log.handlers[:]:
+			log.removeHandler(handler)
+
+	tail = [line.split(' - ')[-1] for line in data['content']]
+	assert 0 < len(tail) < total
+	assert tail + streamed == [f'n {i}' for i in range(total)]
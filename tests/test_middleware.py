@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.core.middleware import SafeRequestMiddleware
+
+
+def _app():
+	app = FastAPI()
+
+	@app.get('/ok')
+	async def ok():
+		return {'ok': True}
+
+	@app.get('/boom')
+	async def boom():
+		raise ValueError('boom')
+
+	@app.get('/stream')
+	async def stream():
+		async def chunks():
+			yield 'first\n'
+			await asyncio.sleep(0.2)
+			yield 'second\n'
+
+		return StreamingResponse(chunks(), media_type='text/plain')
+
+	@app.get('/broken_stream')
+	async def broken_stream():
+		async def chunks():
+			yield 'partial\n'
+			raise RuntimeError('stream failed')
+
+		return StreamingResponse(chunks(), media_type='text/plain')
+
+	app.add_middleware(SafeRequestMiddleware)
+	return app
+
+
+def _client(app, **kwargs):
+	return httpx.AsyncClient(
+		transport=httpx.ASGITransport(app=app, **kwargs), base_url='http://test'
+	)
+
+
+def test_unhandled_errors_become_json():
+	async def run():
+		async with _client(_app()) as client:
+			return await client.get('/ok'), await client.get('/boom')
+
+	ok, boom = asyncio.run(run())
+
+	assert ok.json() == {'ok': True}
+	assert boom.status_code == 500
+	assert boom.json() == {'message': 'boom', 'error_type': 'ValueError', 'path': '/boom'}
+
+
+def test_streaming_responses_are_not_buffered():
+	sent = []
+
+	async def run():
+		app = _app()
+		loop = asyncio.get_running_loop()
+		started = loop.time()
+
+		async def send(message):
+			if message['type'] == 'http.response.body' and message.get('body'):
+				sent.append((message['body'], loop.time() - started))
+
+		async def receive():
+			await asyncio.sleep(1)
+			return {'type': 'http.disconnect'}
+
+		scope = {
+			'type': 'http',
+			'method': 'GET',
+			'path': '/stream',
+			'raw_path': b'/stream',
+			'query_string': b'',
+			'headers': [],
+			'http_version': '1.1',
+			'scheme': 'http',
+			'server': ('test', 80),
+			'root_path': '',
+		}
+		await app(scope, receive, send)
+
+	asyncio.run(run())
+
+	assert [body for body, _ in sent] == [b'first\n', b'second\n']
+	# O primeiro pedaço sai antes do gerador terminar
+	assert sent[0][1] < 0.1 <= sent[1][1]
+
+
+def test_error_after_response_started_is_reraised():
+	async def run():
+		async with _client(_app(), raise_app_exceptions=True) as client:
+			await client.get('/broken_stream')
+
+	with pytest.raises(RuntimeError, match='stream failed'):
+		asyncio.run(run())
@@ -0,0 +1,117 @@
+"""
+Benchmark da pilha de middlewares nas rotas de polling do dashboard.
+
+Compara o SafeRequestMiddleware antigo (BaseHTTPMiddleware) com o ASGI puro,
+com o resto da pilha igual (CORS, GZip, Prometheus). Só roda com
+BENCHMARK_REQUESTS (requisições por rota) definido; mostra requisições/s e p99:
+`BENCHMARK_REQUESTS=300 pytest -s tests/test_middleware_benchmark.py`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_fastapi_instrumentator import Instrumentator
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import SafeRequestMiddleware, StreamAwareGZipMiddleware
+from app.routers.api.v1 import application, xtrack
+from app.services.xtrack import InfoCache
+
+
+ROUTES = ['/api/v1/xtrack/xtrack_info', '/api/v1/application/get_alerts']
+REQUESTS = int(os.environ.get('BENCHMARK_REQUESTS') or 300)
+
+
+class BaseHTTPSafeRequestMiddleware(BaseHTTPMiddleware):
+	"""Implementação anterior, mantida aqui como referência do benchmark."""
+
+	async def dispatch(self, request, call_next):
+		try:
+			return await call_next(request)
+		except Exception as e:
+			logging.error(f'[Middleware Error] {type(e).__name__}: {e}', exc_info=True)
+			return JSONResponse(
+				status_code=500,
+				content={
+					'message': str(e),
+					'error_type': type(e).__name__,
+					'path': request.url.path,
+				},
+			)
+
+
+def _build(safe_middleware) -> FastAPI:
+	# Mesma ordem do setup_middlewares
+	app = FastAPI()
+	app.add_middleware(
+		CORSMiddleware,
+		allow_origins=['*'],
+		allow_credentials=True,
+		allow_methods=['GET', 'POST', 'PUT', 'DELETE'],
+		allow_headers=['*'],
+	)
+	app.add_middleware(safe_middleware)
+	app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1000)
+	Instrumentator().instrument(app)
+	app.include_router(xtrack.router)
+	app.include_router(application.router)
+	return app
+
+
+async def _measure(app: FastAPI, path: str) -> dict:
+	transport = httpx.ASGITransport(app=app)
+	async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+		for _ in range(20):  # aquecimento
+			assert (await client.get(path)).status_code == 200
+		latencies = []
+		started = time.perf_counter()
+		for _ in range(REQUESTS):
+			request_started = time.perf_counter()
+			response = await client.get(path)
+			latencies.append(time.perf_counter() - request_started)
+			assert response.status_code == 200
+		total = time.perf_counter() - started
+	latencies.sort()
+	return {
+		'rps': REQUESTS / total,
+		'p50_ms': latencies[len(latencies) // 2] * 1000,
+		'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+	}
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(
+	'BENCHMARK_REQUESTS' not in os.environ, reason='benchmark: set BENCHMARK_REQUESTS to run'
+)
+def test_middleware_stack_benchmark(seeded_manager, monkeypatch):
+	cache = InfoCache(seeded_manager.get_info_async, ttl=60)
+	monkeypatch.setattr(xtrack, 'xtrack_info_cache', cache)
+
+	stacks = {
+		'BaseHTTPMiddleware': _build(BaseHTTPSafeRequestMiddleware),
+		'pure ASGI': _build(SafeRequestMiddleware),
+	}
+
+	async def run():
+		return {
+			(name, path): await _measure(app, path)
+			for name, app in stacks.items()
+			for path in ROUTES
+		}
+
+	results = asyncio.run(run())
+
+	print(f'\n{"stack":<20} {"route":<36} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8}')
+	for (name, path), result in results.items():
+		print(
+			f'{name:<20} {path:<36} {result["rps"]:>9.0f} '
+			f'{result["p50_ms"]:>8.3f} {result["p99_ms"]:>8.3f}'
+		)
+	assert all(result['rps'] > 0 for result in results.values())
@@ -0,0 +1,141 @@
+import gzip
+import json
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models.xtrack import Movements
+
+
+def _seed(xm, days=5, per_day=6):
+	today = xm._today()
+	with xm.db_manager.get_session() as session:
+		session.add_all(
+			[
+				Movements(
+					object_idcode=f'O{i}',
+					from_location_id=1,
+					to_location_id=2 if i % 3 else None,
+					created_at=today - timedelta(days=day) + timedelta(hours=i),
+				)
+				for day in range(days)
+				for i in range(per_day)
+			]
+		)
+	xm.reconcile_stats()
+
+
+def test_old_movements_are_rolled_up(manager, tmp_path):
+	_seed(manager)
+	count_before = manager.stats.snapshot()['movements_count']
+
+	success, message = manager.apply_retention(2, archive_dir=str(tmp_path / 'archive'))
+
+	assert success, message
+	assert message == '12 movements rolled up'
+	with manager.db_manager.get_session() as session:
+		oldest = session.execute(select(func.min(Movements.created_at))).scalar_one()
+	assert oldest >= manager._today() - timedelta(days=2)
+
+	# Contagem total inalterada: brutas + agregadas
+	assert manager.stats.snapshot()['movements_count'] == count_before == 30
+
+	success, days = manager.get_rollups('day')
+	assert success
+	assert sum(row['entries'] for row in days) == 12
+	assert sum(row['exits'] for row in days if row['location_id'] == 1) == 12
+	assert {row['location_id'] for row in days} == {1, 2, None}
+
+	_, hours = manager.get_rollups('hour', location_id=2)
+	assert sum(row['entries'] for row in hours) == 8
+
+	archived = sorted((tmp_path / 'archive').iterdir())
+	assert len(archived) == 2
+	with gzip.open(archived[0], 'rt') as f:
+		assert len(f.readlines()) == 6
+
+
+def test_retention_is_idempotent(manager):
+	_seed(manager)
+	manager.apply_retention(2)
+
+	assert manager.apply_retention(2) == (True, '0 movements rolled up')
+	assert manager.stats.snapshot()['movements_count'] == 30
+
+
+def _archived_ids(path) -> list[int]:
+	with gzip.open(path, 'rt') as f:
+		return [json.loads(line)['id'] for line in f]
+
+
+def test_failed_commit_does_not_archive_twice(manager, tmp_path, monkeypatch):
+	_seed(manager, days=4)
+	archive_dir = tmp_path / 'archive'
+	original = Session.commit
+	commits = []
+
+	def commit(self):
+		commits.append(self)
+		# 1º commit: busca do dia mais antigo; 2º: rollup + delete do dia
+		if len(commits) == 2:
+			raise OperationalError('COMMIT', {}, Exception('database is locked'))
+		return original(self)
+
+	monkeypatch.setattr(Session, 'commit', commit)
+	success, _ = manager.apply_retention(2, archive_dir=str(archive_dir))
+
+	assert not success
+	assert list(archive_dir.iterdir()) == []
+
+	assert manager.apply_retention(2, archive_dir=str(archive_dir)) == (
+		True,
+		'6 movements rolled up',
+	)
+	(archive,) = archive_dir.iterdir()
+	ids = _archived_ids(archive)
+	assert len(ids) == len(set(ids)) == 6
+	assert manager.stats.snapshot()['movements_count'] == 24
+
+
+def test_late_movements_are_added_to_the_day(manager, tmp_path):
+	_seed(manager, days=4)
+	archive_dir = tmp_path / 'archive'
+	manager.apply_retention(2, archive_dir=str(archive_dir))
+	day = manager._today() - timedelta(days=3)
+
+	# Movimentação atrasada de um dia já agregado
+	with manager.db_manager.get_session() as session:
+		session.add(
+			Movements(
+				object_idcode='LATE',
+				from_location_id=1,
+				to_location_id=2,
+				created_at=day + timedelta(hours=1),
+			)
+		)
+	assert manager.apply_retention(2, archive_dir=str(archive_dir)) == (
+		True,
+		'1 movements rolled up',
+	)
+
+	(archive,) = archive_dir.iterdir()
+	assert len(_archived_ids(archive)) == 7
+	_, days = manager.get_rollups('day', location_id=2)
+	assert days == [
+		{
+			'bucket_start': day.isoformat(),
+			'location_id': 2,
+			'location': None,
+			'entries': 5,
+			'exits': 0,
+		}
+	]
+	_, hours = manager.get_rollups('hour', start=day, end=day + timedelta(hours=2))
+	assert [(row['location_id'], row['entries'], row['exits']) for row in hours] == [
+		(None, 1, 0),
+		(1, 0, 1),
+		(1, 0, 2),
+		(2, 2, 0),
+	]
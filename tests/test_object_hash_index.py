@@ -0,0 +1,46 @@
+from app.services.xtrack._hashes import ObjectHashIndex
+
+
+def _object(idcode, location='1', modified='2030-01-01T10:00:00.123'):
+	return {
+		'IDCODE': idcode,
+		'ACTIVE': '1',
+		'LOCATION_ID': location,
+		'DESCRIPTION': f'FB {idcode}',
+		'HOME_LOCATION_ID': '1',
+		'LAST_MODIFIED': modified,
+		'LAST_LOCATION': None,
+		'LAST_SEEN': '2030-01-01T09:00:00',
+	}
+
+
+def test_unchanged_objects_are_skipped(manager):
+	objects = [_object('A1'), _object('A2')]
+	assert manager.save_objects(objects) == (True, '2 inserted, 0 updated')
+	assert manager.save_objects(objects) == (True, 'No objects changed.')
+
+	changed = [_object('A1', location='2', modified='2030-01-02T10:00:00'), _object('A2')]
+	assert manager.save_objects(changed) == (True, '0 inserted, 1 updated')
+	assert manager.sync_metrics['objects']['unchanged'] == 1
+
+
+def test_warm_matches_feed_hashes(manager):
+	objects = [_object('A1'), {**_object('A2'), 'HOME_LOCATION_ID': ''}]
+	assert manager.save_objects(objects)[0]
+
+	manager.hashes.clear()
+	manager.warm_hash_index()
+
+	assert len(manager.hashes) == 2
+	assert manager.hashes.changed(objects)[0] == []
+
+
+def test_lru_eviction():
+	index = ObjectHashIndex(max_size=2)
+	objects = [_object('A1'), _object('A2'), _object('A3')]
+	_, pending = index.changed(objects)
+	index.commit(objects, pending)
+
+	assert len(index) == 2
+	changed, _ = index.changed(objects)
+	assert [obj['IDCODE'] for obj in changed] == ['A1']
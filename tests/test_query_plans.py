@@ -0,0 +1,78 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.models.xtrack import Locations, Movements, Objects
+from app.services.xtrack import _queries as queries
+
+
+NOW = datetime(2030, 1, 1, 12, 0, 0)
+
+
+def _populate(session):
+	rng = random.Random(1)
+	session.execute(insert(Locations), [{'id': i, 'name': f'[L{i}]'} for i in range(1, 21)])
+	session.execute(
+		insert(Objects),
+		[{'idcode': f'O{i}', 'location_id': rng.randrange(1, 21)} for i in range(2000)],
+	)
+	session.execute(
+		insert(Movements),
+		[
+			{
+				'object_idcode': f'O{rng.randrange(2000)}',
+				'from_location_id': rng.randrange(1, 21),
+				'to_location_id': rng.randrange(1, 21),
+				'created_at': NOW - timedelta(minutes=i),
+			}
+			for i in range(5000)
+		],
+	)
+	session.commit()
+	# Estatísticas para o planner (mantidas em produção pelo PRAGMA optimize)
+	session.connection().exec_driver_sql('ANALYZE')
+
+
+def _plan(session, stmt) -> list[str]:
+	compiled = stmt.compile(dialect=session.get_bind().dialect)
+	params = tuple(
+		value.isoformat(' ') if isinstance(value, datetime) else value
+		for value in (compiled.params[key] for key in compiled.positiontup)
+	)
+	rows = session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()
+	return [row[-1] for row in rows]
+
+
+@pytest.fixture
+def session(manager):
+	if manager.db_manager.get_connection_info()['database_type'] != 'sqlite':
+		pytest.skip('EXPLAIN QUERY PLAN é específico do SQLite')
+	with manager.db_manager.get_session() as session:
+		_populate(session)
+		yield session
+
+
+@pytest.mark.parametrize(
+	'build',
+	[queries.entries_since, queries.exits_since, queries.movements_since],
+)
+def test_window_queries_use_index_search(session, build):
+	today = NOW.replace(hour=0, minute=0)
+	plan = _plan(session, build(today))
+
+	assert plan and all(step.startswith('SEARCH') for step in plan if 'movements' in step), plan
+
+
+@pytest.mark.parametrize(
+	'stmt',
+	[
+		queries.objects_per_location(),
+		select(func.count()).select_from(Movements),
+	],
+)
+def test_full_aggregates_avoid_table_scans(session, stmt):
+	plan = _plan(session, stmt)
+
+	assert all('INDEX' in step for step in plan if step.startswith('SCAN')), plan
@@ -0,0 +1,47 @@
+from app.db import SlowQueryLog, fingerprint, normalize_statement
+
+
+def test_fingerprint_ignores_literals_and_list_sizes():
+	a = 'SELECT * FROM objects WHERE idcode IN (?, ?, ?) AND location_id = 1'
+	b = 'SELECT *  FROM objects\nWHERE idcode IN (?, ?) AND location_id = 27'
+
+	assert (
+		normalize_statement(a) == 'SELECT * FROM objects WHERE idcode IN (?...) AND location_id = ?'
+	)
+	assert fingerprint(a) == fingerprint(b)
+	assert fingerprint(a) != fingerprint('SELECT * FROM movements')
+
+
+def test_multi_row_values_collapse():
+	sql = 'INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)'
+
+	assert normalize_statement(sql) == 'INSERT INTO t (a, b) VALUES (?...)...'
+
+
+def test_top_keeps_the_most_expensive():
+	log = SlowQueryLog(threshold_ms=0, top_n=2)
+	log.max_entries = 3
+	for i, duration in enumerate([5, 50, 20, 1, 30]):
+		log.record(f'SELECT * FROM t{"x" * i}', duration)
+	log.record('SELECT * FROM txx', 20)
+
+	top = log.top()
+	assert [q['total_ms'] for q in top] == [50, 40]
+	assert top[1]['count'] == 2
+	assert top[1]['avg_ms'] == 20
+	assert len(log.top(10)) == 3
+
+
+def test_records_the_calling_function(manager):
+	log = SlowQueryLog(threshold_ms=0)
+	log.attach(manager.read_db._engine)
+
+	success, _ = manager.get_movements(limit=10)
+
+	assert success
+	callers = [q['last_caller'] for q in log.top(50)]
+	assert any('get_movements' in caller for caller in callers), callers
+
+
+def test_echo_is_off_by_default(manager):
+	assert not manager.db_manager._engine.echo
@@ -0,0 +1,48 @@
+from sqlalchemy import text
+
+from app.db import optimize_sqlite
+from app.models.xtrack import Objects
+
+
+def _pragma(session, name):
+	return session.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_write_connection_profile(manager):
+	assert manager.dialect == 'sqlite'
+	with manager.db_manager.get_session() as session:
+		assert _pragma(session, 'journal_mode') == 'wal'
+		assert _pragma(session, 'synchronous') == 1  # NORMAL
+		assert _pragma(session, 'busy_timeout') == 5000
+		assert _pragma(session, 'cache_size') == -65536
+		assert _pragma(session, 'temp_store') == 2  # MEMORY
+
+
+def test_read_connection_profile(manager):
+	with manager.read_session() as session:
+		assert _pragma(session, 'journal_mode') == 'wal'
+		assert _pragma(session, 'mmap_size') == 268_435_456
+		assert _pragma(session, 'busy_timeout') == 5000
+
+
+def test_reads_do_not_wait_for_an_open_write(manager):
+	with manager.db_manager.get_session() as writer:
+		writer.add(Objects(idcode='A1', location_id=1))
+		writer.flush()
+
+		# Transação de escrita aberta: no WAL o leitor vê o último commit sem esperar
+		with manager.read_session() as reader:
+			assert reader.query(Objects).count() == 0
+
+	with manager.read_session() as reader:
+		assert reader.query(Objects).count() == 1
+
+
+def test_optimize_and_checkpoint(manager):
+	with manager.db_manager.get_session() as session:
+		session.add(Objects(idcode='A1', location_id=1))
+
+	result = optimize_sqlite(manager.db_manager)
+
+	assert result['busy'] == 0
+	assert result['log_frames'] == 0
@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+import json
+import os
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.static_assets import PrecompressedStaticFiles, StaticAssets, accepted_encodings
+
+SCRIPT = b'console.log("hello");\n' * 200
+
+
+def _static(tmp_path):
+	static_dir = tmp_path / 'static'
+	(static_dir / 'js').mkdir(parents=True)
+	(static_dir / 'images').mkdir()
+	(static_dir / 'js' / 'app.js').write_bytes(SCRIPT)
+	(static_dir / 'images' / 'logo.png').write_bytes(b'\x89PNG' + b'\x00' * 2000)
+	return static_dir
+
+
+def _get(assets, path, headers=None):
+	app = FastAPI()
+	app.mount('/static', PrecompressedStaticFiles(assets), name='static')
+
+	async def run():
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+			return await client.get(path, headers=headers or {})
+
+	return asyncio.run(run())
+
+
+def test_build_writes_hashed_and_compressed_copies(tmp_path):
+	static_dir = _static(tmp_path)
+	assets = StaticAssets(str(static_dir))
+
+	manifest = assets.build()
+
+	script = manifest['js/app.js']
+	assert script.startswith('js/app.') and script.endswith('.js') and script != 'js/app.js'
+	assert gzip.decompress((static_dir / 'dist' / f'{script}.gz').read_bytes()) == SCRIPT
+	# Imagem não é comprimida
+	assert assets.encodings[manifest['images/logo.png']] == []
+	assert json.loads((static_dir / 'dist' / 'manifest.json').read_text()) == manifest
+	assert assets.url('js/app.js') == f'/static/{script}'
+	assert assets.url('/js/unknown.js') == '/static/js/unknown.js'
+
+
+def test_rebuild_only_touches_changed_files(tmp_path):
+	static_dir = _static(tmp_path)
+	assets = StaticAssets(str(static_dir))
+	first = assets.build()
+	logo = static_dir / 'dist' / first['images/logo.png']
+	mtime = os.stat(logo).st_mtime_ns
+
+	(static_dir / 'js' / 'app.js').write_bytes(SCRIPT + b'// v2\n')
+	second = assets.build()
+
+	assert second['js/app.js'] != first['js/app.js']
+	assert second['images/logo.png'] == first['images/logo.png']
+	assert os.stat(logo).st_mtime_ns == mtime
+	# Versão antiga removida
+	assert not (static_dir / 'dist' / first['js/app.js']).exists()
+	assert not (static_dir / 'dist' / f'{first["js/app.js"]}.gz').exists()
+
+	reloaded = StaticAssets(str(static_dir))
+	assert reloaded.load() == second
+	assert reloaded.encodings == assets.encodings
+
+
+def test_serves_precompressed_by_accept_encoding(tmp_path):
+	assets = StaticAssets(str(_static(tmp_path)))
+	assets.build()
+	url = assets.url('js/app.js')
+
+	gzipped = _get(assets, url, {'Accept-Encoding': 'gzip, deflate'})
+	assert gzipped.headers['content-encoding'] == 'gzip'
+	assert gzipped.headers['cache-control'] == 'public, max-age=31536000, immutable'
+	assert gzipped.headers['vary'] == 'Accept-Encoding'
+	assert 'javascript' in gzipped.headers['content-type']
+	assert gzipped.content == SCRIPT  # httpx descomprime
+
+	plain = _get(assets, url, {'Accept-Encoding': 'gzip;q=0, identity'})
+	assert 'content-encoding' not in plain.headers
+	assert plain.content == SCRIPT
+
+
+def test_unhashed_paths_revalidate(tmp_path):
+	assets = StaticAssets(str(_static(tmp_path)))
+	assets.build()
+
+	response = _get(assets, '/static/js/app.js')
+
+	assert response.status_code == 200
+	assert response.headers['cache-control'] == 'no-cache'
+	assert response.content == SCRIPT
+	assert _get(assets, '/static/js/missing.js').status_code == 404
+
+
+def test_accepted_encodings():
+	assert accepted_encodings('gzip, deflate, br;q=0.8') == {'gzip', 'deflate', 'br'}
+	assert accepted_encodings('br;q=0, gzip') == {'gzip'}
+	assert accepted_encodings('') == set()
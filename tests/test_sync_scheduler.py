@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from app.core import settings
+from app.services.xtrack import SyncScheduler
+
+
+@pytest.fixture
+def scheduler(manager, monkeypatch):
+	monkeypatch.setattr(settings, 'XTRACK_SYNC_INTERVAL', 100)
+	monkeypatch.setattr(settings, 'XTRACK_SYNC_MIN_INTERVAL', 30)
+	monkeypatch.setattr(settings, 'XTRACK_SYNC_MAX_INTERVAL', 200)
+	monkeypatch.setattr(settings, 'XTRACK_SYNC_BUSY_CHANGES', 10)
+	return SyncScheduler(manager)
+
+
+def _stub_jobs(scheduler, changes: int = 0, delay: float = 0.01):
+	calls = []
+
+	async def locations():
+		calls.append('locations')
+		await asyncio.sleep(delay)
+		return True, {}
+
+	async def objects():
+		calls.append('objects')
+		await asyncio.sleep(delay)
+		return True, {'changes': changes}
+
+	scheduler._jobs = {'locations': locations, 'objects': objects}
+	return calls
+
+
+def test_concurrent_triggers_share_one_cycle(scheduler):
+	calls = _stub_jobs(scheduler)
+
+	async def run():
+		return await asyncio.gather(scheduler.run_cycle(), scheduler.run_cycle())
+
+	assert asyncio.run(run()) == [True, True]
+	assert calls == ['locations', 'objects']
+	assert scheduler.status['objects']['success']
+	assert scheduler.lag('objects') >= 0
+
+
+def test_locations_run_before_objects(scheduler):
+	order = []
+
+	async def locations():
+		await asyncio.sleep(0.02)
+		order.append('locations committed')
+		return True, {}
+
+	async def objects():
+		order.append('objects started')
+		return True, {'changes': 0}
+
+	scheduler._jobs = {'locations': locations, 'objects': objects}
+	asyncio.run(scheduler.run_cycle())
+
+	assert order == ['locations committed', 'objects started']
+
+
+def test_interval_adapts_to_changes(scheduler):
+	_stub_jobs(scheduler, changes=50)
+	asyncio.run(scheduler.run_cycle())
+	assert scheduler.interval == 50
+
+	asyncio.run(scheduler.run_cycle())
+	asyncio.run(scheduler.run_cycle())
+	assert scheduler.interval == 30
+
+	_stub_jobs(scheduler, changes=0)
+	for _ in range(5):
+		asyncio.run(scheduler.run_cycle())
+	assert scheduler.interval == 200
+
+
+def test_jitter_stays_within_bounds(scheduler, monkeypatch):
+	monkeypatch.setattr(settings, 'XTRACK_SYNC_JITTER', 0.1)
+	delays = [scheduler.next_delay() for _ in range(200)]
+
+	assert all(90 <= delay <= 110 for delay in delays)
+	assert len(set(delays)) > 1
+
+
+def test_stage_deadline(scheduler, monkeypatch):
+	monkeypatch.setattr(settings, 'XTRACK_STAGE_TIMEOUT', 0.05)
+	_stub_jobs(scheduler, delay=1)
+
+	success, summary = asyncio.run(scheduler.run('objects'))
+
+	assert not success
+	assert 'timeout' in summary['error']
+	assert not scheduler.status['objects']['running']
+
+
+def test_cycle_counts_changes_from_the_feed(scheduler):
+	xm = scheduler.manager
+	locations = [{'ID': '1', 'NAME': '[ALMOX] Entrada'}]
+	objects = [
+		{'IDCODE': f'A{i}', 'ACTIVE': '1', 'DESCRIPTION': f'FB {i}', 'LOCATION_ID': '1'}
+		for i in range(20)
+	]
+
+	async def get_locations():
+		return True, locations
+
+	async def get_objects():
+		return True, objects
+
+	xm.api.get_locations = get_locations
+	xm.api.get_objects = get_objects
+
+	assert asyncio.run(scheduler.run_cycle())
+	assert scheduler.status['objects']['summary']['changes'] == 20
+	assert scheduler.interval == 50
+
+	assert asyncio.run(scheduler.run_cycle())
+	assert scheduler.status['objects']['summary']['changes'] == 0
+	assert scheduler.interval == 75
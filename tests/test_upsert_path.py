@@ -0,0 +1,76 @@
+import pytest
+
+from app.core import settings
+from app.models.xtrack import Locations, Movements, Objects
+
+
+@pytest.fixture
+def upsert_manager(manager, monkeypatch):
+	monkeypatch.setattr(settings, 'XTRACK_UPSERT', True)
+	assert manager._use_upsert()
+	manager.changes = []
+	manager.add_listener(lambda: manager.changes.append(1))
+	return manager
+
+
+def _objects(location: int = 1, modified: str = '2026-10-18T08:00:00') -> list[dict]:
+	return [
+		{
+			'IDCODE': f'OBJ-{i}',
+			'ACTIVE': '1',
+			'DESCRIPTION': f'FB {i}',
+			'LOCATION_ID': str(location if i == 0 else 1),
+			'LAST_MODIFIED': modified if i == 0 else '2026-10-18T08:00:00',
+		}
+		for i in range(3)
+	]
+
+
+def _count(manager, model) -> int:
+	with manager.read_session() as session:
+		return session.query(model).count()
+
+
+def test_upsert_locations_only_notifies_on_changes(upsert_manager):
+	locations = [{'ID': '1', 'NAME': 'A'}, {'ID': '2', 'NAME': 'B'}]
+
+	assert upsert_manager.save_locations(locations) == (True, '2 upserted')
+	assert len(upsert_manager.changes) == 1
+
+	# Re-sync sem mudanças: nenhuma linha escrita, nenhuma notificação
+	assert upsert_manager.save_locations(locations) == (True, '0 upserted')
+	assert upsert_manager.sync_metrics['locations']['upserted'] == 0
+	assert len(upsert_manager.changes) == 1
+
+	renamed = [{'ID': '1', 'NAME': 'A2'}, {'ID': '2', 'NAME': 'B'}]
+	assert upsert_manager.save_locations(renamed) == (True, '1 upserted')
+	assert len(upsert_manager.changes) == 2
+	with upsert_manager.read_session() as session:
+		assert session.get(Locations, 1).name == 'A2'
+
+
+def test_upsert_objects_unchanged_and_moved(upsert_manager):
+	upsert_manager.save_locations([{'ID': '1', 'NAME': 'A'}, {'ID': '2', 'NAME': 'B'}])
+
+	assert upsert_manager.save_objects(_objects()) == (True, '3 upserted, 0 movements')
+	assert _count(upsert_manager, Objects) == 3
+	changes = len(upsert_manager.changes)
+
+	# Mesmo conteúdo, sem o filtro de hashes: o banco não escreve nada
+	upsert_manager.hashes.clear()
+	assert upsert_manager.save_objects(_objects()) == (True, '0 upserted, 0 movements')
+	assert _count(upsert_manager, Movements) == 0
+	assert len(upsert_manager.changes) == changes
+
+	# Um objeto muda de local (com timestamp novo): 1 update e 1 movimentação
+	moved = _objects(location=2, modified='2026-10-18T09:00:00')
+	assert upsert_manager.save_objects(moved) == (True, '1 upserted, 1 movements')
+	with upsert_manager.read_session() as session:
+		(movement,) = session.query(Movements).all()
+		assert (movement.object_idcode, movement.from_location_id, movement.to_location_id) == (
+			'OBJ-0',
+			1,
+			2,
+		)
+	assert len(upsert_manager.changes) > changes
+	assert upsert_manager.stats.snapshot()['objects'] == {1: 2, 2: 1}
@@ -0,0 +1,270 @@
+import asyncio
+import re
+import time
+import xml.etree.ElementTree as ET
+
+import httpx
+import pytest
+
+from app.core import settings
+from app.services.xtrack import SyncScheduler, stream_objects
+from app.services.xtrack._api import XtrackApi
+
+
+LOCATIONS = list(range(1, 9))
+PER_LOCATION = 50
+LATENCY = 0.05
+
+
+class XtrackStub:
+	"""Servidor Xtrack falso: GetObject filtrado por LOCATION_ID, com latência fixa."""
+
+	def __init__(self, fail_first: int = 0, ignore_filter: bool = False):
+		self.fail_first = fail_first
+		self.ignore_filter = ignore_filter
+		self.requests = 0
+		self.in_flight = 0
+		self.max_in_flight = 0
+
+	async def handler(self, request: httpx.Request) -> httpx.Response:
+		self.requests += 1
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			await asyncio.sleep(LATENCY)
+			if self.fail_first:
+				self.fail_first -= 1
+				return httpx.Response(503)
+			match = re.search(rb'<LOCATION_ID>(\d+)</LOCATION_ID>', request.content)
+			# Sem filtro (ou filtro ignorado): o catálogo inteiro
+			locations = LOCATIONS if match is None or self.ignore_filter else [int(match.group(1))]
+			rows = ''.join(
+				f'<data><IDCODE>L{location}-{i}</IDCODE><ACTIVE>1</ACTIVE>'
+				f'<DESCRIPTION>FB {i}</DESCRIPTION><LOCATION_ID>{location}</LOCATION_ID></data>'
+				for location in locations
+				for i in range(PER_LOCATION)
+			)
+			return httpx.Response(200, content=f'<msg>{rows}</msg>'.encode())
+		finally:
+			self.in_flight -= 1
+
+
+@pytest.fixture
+def stub():
+	return XtrackStub()
+
+
+def _api(stub, **kwargs):
+	return XtrackApi(
+		'http://xtrack.local/req', transport=httpx.MockTransport(stub.handler), **kwargs
+	)
+
+
+async def _fetch_all(api, concurrency):
+	slices = {}
+	async for location, objects in api.fetch_object_slices(
+		'LOCATION_ID', LOCATIONS, concurrency=concurrency
+	):
+		slices[location] = objects
+	await api.aclose()
+	return slices
+
+
+def test_slices_are_fetched_concurrently(stub):
+	slices = asyncio.run(_fetch_all(_api(stub), concurrency=4))
+
+	assert sorted(slices) == LOCATIONS
+	assert all(len(objects) == PER_LOCATION for objects in slices.values())
+	assert stub.max_in_flight == 4
+
+
+def test_concurrency_beats_sequential_fetch(stub):
+	started = time.perf_counter()
+	asyncio.run(_fetch_all(_api(stub), concurrency=1))
+	sequential = time.perf_counter() - started
+
+	started = time.perf_counter()
+	asyncio.run(_fetch_all(_api(stub), concurrency=8))
+	concurrent = time.perf_counter() - started
+
+	assert concurrent < sequential / 2
+
+
+def test_retries_with_backoff():
+	stub = XtrackStub(fail_first=2)
+	slices = asyncio.run(_fetch_all(_api(stub, retries=3, backoff=0.001), concurrency=1))
+
+	assert len(slices) == len(LOCATIONS)
+	assert stub.requests == len(LOCATIONS) + 2
+
+
+def test_gives_up_after_retries():
+	stub = XtrackStub(fail_first=100)
+	with pytest.raises(httpx.HTTPStatusError):
+		asyncio.run(_fetch_all(_api(stub, retries=1, backoff=0.001), concurrency=2))
+
+
+def test_slices_feed_the_db_writer(manager, stub):
+	manager.api = _api(stub)
+
+	async def sync():
+		source = manager.api.fetch_object_slices('LOCATION_ID', LOCATIONS, concurrency=4)
+		return await stream_objects(manager, use_delta=True, source=source)
+
+	success, summary = asyncio.run(sync())
+
+	assert success, summary
+	assert summary['saved'] == len(LOCATIONS) * PER_LOCATION
+	assert manager.stats.snapshot()['objects'] == {loc: PER_LOCATION for loc in LOCATIONS}
+
+
+@pytest.fixture
+def sliced_scheduler(manager, monkeypatch):
+	monkeypatch.setattr(settings, 'XTRACK_OBJECT_FILTER_TAG', 'LOCATION_ID')
+	monkeypatch.setattr(settings, 'XTRACK_STREAMING', False)
+	manager.save_locations([{'ID': str(loc), 'NAME': f'Local {loc}'} for loc in LOCATIONS])
+	return SyncScheduler(manager)
+
+
+def test_scheduler_runs_unfiltered_pass_per_full_sync(sliced_scheduler, stub):
+	sliced_scheduler.manager.api = _api(stub)
+	run = sliced_scheduler.run
+
+	assert asyncio.run(run('objects'))[0]
+	# Primeira execução sem filtro: pega também objetos sem local conhecido
+	assert stub.requests == 1
+
+	assert asyncio.run(run('objects'))[0]
+	assert stub.requests == 1 + len(LOCATIONS)
+
+	sliced_scheduler._last_unfiltered -= settings.XTRACK_FULL_SYNC_INTERVAL
+	assert asyncio.run(run('objects'))[0]
+	assert stub.requests == 2 + len(LOCATIONS)
+
+
+def test_scheduler_falls_back_when_filter_is_ignored(sliced_scheduler):
+	stub = XtrackStub(ignore_filter=True)
+	manager = sliced_scheduler.manager
+	manager.api = _api(stub)
+	sliced_scheduler._last_unfiltered = time.monotonic()
+
+	success, summary = asyncio.run(sliced_scheduler.run('objects'))
+
+	assert success, summary
+	assert not sliced_scheduler.slices_supported
+	# Resumo do GetObject sem filtro, feito no mesmo ciclo
+	assert summary['received'] == len(LOCATIONS) * PER_LOCATION
+	assert manager.stats.snapshot()['objects'] == {loc: PER_LOCATION for loc in LOCATIONS}
+
+	requests = stub.requests
+	assert asyncio.run(sliced_scheduler.run('objects'))[0]
+	assert stub.requests == requests + 1
+
+
+def _rows(count: int) -> bytes:
+	rows = ''.join(
+		f'<data><IDCODE>OBJ-{i}</IDCODE><ACTIVE>1</ACTIVE><DESCRIPTION>FB {i}</DESCRIPTION>'
+		f'<LOCATION_ID>1</LOCATION_ID><EXTRA>x</EXTRA></data>'
+		for i in range(count)
+	)
+	return f'<msg><command>GetObject</command>{rows}</msg>'.encode()
+
+
+def _chunked_api(body: bytes, chunk_size: int) -> tuple[XtrackApi, list[bytes]]:
+	"""Xtrack falso que envia o corpo em pedaços de `chunk_size` bytes."""
+	chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+	async def handler(request: httpx.Request) -> httpx.Response:
+		async def stream():
+			for chunk in chunks:
+				await asyncio.sleep(0)
+				yield chunk
+
+		return httpx.Response(200, content=stream())
+
+	return XtrackApi('http://xtrack.local/req', transport=httpx.MockTransport(handler)), chunks
+
+
+async def _collect(api, batch_size):
+	try:
+		return [batch async for batch in api.iter_objects(batch_size)]
+	finally:
+		await api.aclose()
+
+
+@pytest.mark.parametrize('count, batch_size, sizes', [(12, 4, [4, 4, 4]), (10, 4, [4, 4, 2])])
+def test_iter_objects_streams_in_batches(count, batch_size, sizes):
+	body = _rows(count)
+	# Pedaços de 37 bytes: vários <data> ficam partidos entre dois pedaços
+	api, chunks = _chunked_api(body, 37)
+	assert len(chunks) > count
+	assert any(b'<data>' not in chunk and b'</data>' not in chunk for chunk in chunks)
+
+	batches = asyncio.run(_collect(api, batch_size))
+
+	assert [len(batch) for batch in batches] == sizes
+	objects = [obj for batch in batches for obj in batch]
+	assert [obj['IDCODE'] for obj in objects] == [f'OBJ-{i}' for i in range(count)]
+	assert objects[3] == {
+		'IDCODE': 'OBJ-3',
+		'ACTIVE': '1',
+		'DESCRIPTION': 'FB 3',
+		'LOCATION_ID': '1',
+	}
+
+
+def test_iter_objects_element_across_chunk_boundary():
+	body = _rows(1)
+	split = body.index(b'OBJ-0') + 2
+	api, _ = _chunked_api(body, split)
+
+	batches = asyncio.run(_collect(api, 10))
+
+	assert [[obj['IDCODE'] for obj in batch] for batch in batches] == [['OBJ-0']]
+
+
+def test_iter_objects_without_data_yields_nothing():
+	api, _ = _chunked_api(b'<msg><command>GetObject</command></msg>', 8)
+
+	assert asyncio.run(_collect(api, 10)) == []
+
+
+@pytest.mark.parametrize('body', [b'', b'<msg><data><IDCODE>1</IDCODE></msg>'])
+def test_iter_objects_invalid_body_raises(body):
+	api, _ = _chunked_api(body, 8)
+
+	with pytest.raises(ET.ParseError):
+		asyncio.run(_collect(api, 10))
+
+
+def test_post_returns_failure_tuple():
+	calls = []
+
+	async def handler(request: httpx.Request) -> httpx.Response:
+		calls.append(request.url.path)
+		if request.url.path.endswith('/broken'):
+			raise ValueError('unexpected')
+		if request.url.path.endswith('/missing'):
+			return httpx.Response(404)
+		return httpx.Response(200, json={'ok': True})
+
+	async def run():
+		api = XtrackApi(
+			'http://xtrack.local/req', transport=httpx.MockTransport(handler), retries=2
+		)
+		try:
+			return [
+				await api.post('ok', json={}),
+				await api.post('missing', json={}),
+				await api.post('broken', json={}),
+			]
+		finally:
+			await api.aclose()
+
+	ok, missing, broken = asyncio.run(run())
+
+	assert ok == (True, {'ok': True})
+	assert missing[0] is False and missing[1]['error'] == 'HTTP error: 404'
+	assert broken == (False, {'error': 'Request failed', 'detail': 'unexpected'})
+	# Erros que não são de rede não são repetidos
+	assert calls.count('/req/broken') == 1
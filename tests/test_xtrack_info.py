@@ -0,0 +1,57 @@
+import pytest
+
+from app.core import settings
+
+
+def test_get_info_payload(seeded_manager):
+	success, info = seeded_manager.get_info()
+
+	assert success, info
+	assert info['locations_count'] == 4
+	assert info['objects_in_locations'] == {'[ALMOX] Entrada': 2, '[GRU] Recebimento': 1}
+	assert list(info['objects_in_locations']) == sorted(info['objects_in_locations'])
+	assert info['objects_count'] == 3
+	assert info['movements_count'] == 3
+	assert info['movements_today'] == 2
+	assert info['movements_entries_today'] == {
+		'[ALMOX] Entrada': 2,
+		'[GRU] Recebimento': 0,
+		'Sem colchete': 0,
+		None: 0,
+	}
+	assert info['movements_exits_today'] == {'[GRU] Recebimento': 2}
+	assert info['available_in_almox'] == 2
+	assert info['available_screening'] == 1
+	assert info['available_in_artur_alvin'] == 0
+
+
+@pytest.mark.parametrize('upsert', [False, True])
+def test_save_objects_updates_location_stats(seeded_manager, monkeypatch, upsert):
+	manager = seeded_manager
+	monkeypatch.setattr(settings, 'XTRACK_UPSERT', upsert)
+	objects = [
+		# A1 muda de local (timestamps alterados), D1 é novo
+		{
+			'IDCODE': 'A1',
+			'ACTIVE': '1',
+			'LOCATION_ID': '2',
+			'DESCRIPTION': 'FB A1',
+			'LAST_MODIFIED': '2030-01-01T10:00:00',
+		},
+		{'IDCODE': 'D1', 'ACTIVE': '1', 'LOCATION_ID': '2', 'DESCRIPTION': 'FB D1'},
+	]
+
+	success, _ = manager.save_objects(objects)
+	assert success
+	_, info = manager.get_info()
+
+	assert info['objects_in_locations'] == {'[ALMOX] Entrada': 1, '[GRU] Recebimento': 3}
+	assert info['movements_count'] == 4
+	assert info['movements_exits_today'] == {'[ALMOX] Entrada': 1, '[GRU] Recebimento': 2}
+
+	# Contadores incrementais batem com uma reconstrução completa
+	incremental = manager.stats.snapshot()
+	manager.reconcile_stats()
+	assert manager.stats.snapshot()['objects'] == {
+		k: v for k, v in incremental['objects'].items() if v
+	}